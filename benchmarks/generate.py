@@ -0,0 +1,75 @@
+'''Generates synthetic html pages for benchmarks.
+
+Pages are deterministic for same arguments so that results can be
+compared across commits.'''
+import random
+
+
+# Map containing tags with links and weights for choosing them.
+TAG_MIX = {
+    "a": 60,
+    "img": 20,
+    "script": 5,
+    "link": 5,
+    "iframe": 2,
+    "video": 2,
+    "audio": 2,
+    "source": 4
+}
+
+# Urls used by links(relative, absolute and those with extensions).
+URLS_PATTERNS = (
+    "/pages/{0}",
+    "https://example.com/articles/{0}.html",
+    "../images/{0}.png",
+    "https://cdn.example.com/assets/{0}.js",
+    "/styles/{0}.css",
+    "https://media.example.com/{0}.mp4",
+    "audio/{0}.mp3",
+    "?page={0}",
+    "#section-{0}",
+    "//static.example.com/{0}.jpg"
+)
+
+
+def create_element(rng, tag_name, index):
+    # Creates html for element with link.
+    url = rng.choice(URLS_PATTERNS).format(index)
+    if tag_name == "a":
+        return "<a href='{}' class='link'>Link {} text</a>".format(url, index)
+    elif tag_name == "link":
+        return "<link rel='stylesheet' href='{}'>".format(url)
+    elif tag_name == "img":
+        return "<img src='{}' alt='image {}'>".format(url, index)
+    elif tag_name == "script":
+        return "<script src='{}'></script>".format(url)
+    elif tag_name == "source":
+        return "<source src='{}' type='video/mp4'>".format(url)
+    return "<{0} src='{1}'></{0}>".format(tag_name, url)
+
+def generate_page(links_count=1000, depth=5, tag_mix=None, seed=0):
+    # Generates html page with links within nested elements.
+    # depth: nesting depth of elements containing links.
+    # tag_mix: map of tag names and weights(see TAG_MIX).
+    if tag_mix == None:
+        tag_mix = TAG_MIX
+    rng = random.Random(seed)
+    tag_names = list(tag_mix)
+    weights = [tag_mix[tag_name] for tag_name in tag_names]
+    parts = ["<!DOCTYPE html><html><head><title>Generated page</title>",
+        "<base href='https://example.com/section/page.html'></head><body>"]
+    for index in range(links_count):
+        if index % 10 == 0:
+            parts.append("<div class='level'>" * depth)
+            parts.append("<p>Paragraph {} with <b>some</b> text.</p>".format(
+                index))
+        tag_name = rng.choices(tag_names, weights)[0]
+        parts.append(create_element(rng, tag_name, index))
+        if index % 10 == 9 or index == links_count - 1:
+            parts.append("</div>" * depth)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+if __name__ == "__main__":
+    print(generate_page(20, 2))
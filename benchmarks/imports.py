@@ -0,0 +1,71 @@
+'''Measures time taken to import surflink in fresh interpreter.
+
+Usage: python benchmarks/imports.py [--repeat N] [--max-ms MS]
+
+Exits with status 1 if import takes longer than --max-ms or if modules
+that should be imported lazily(bs4, resid, asyncio, ...) got imported,
+which guards against regressions of startup time.'''
+import argparse
+import json
+import subprocess
+import sys
+
+
+# Modules that importing surflink should not import.
+LAZY_MODULES = ("bs4", "resid", "asyncio", "sqlite3", "concurrent.futures",
+    "selectolax", "lxml", "html5lib")
+# Statements timed in fresh interpreter as name and statement.
+STATEMENTS = (
+    ("import surflink", "import surflink"),
+    ("url helpers", "import surflink; " +
+        "surflink.make_urls_absoulute('https://example.com/', ['/a'])"),
+    ("extract urls", "import surflink; " +
+        "surflink.extract_image_urls('<img src=\"/a.png\">')")
+)
+# Code run in fresh interpreter printing time and imported lazy modules.
+SCRIPT = '''import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+lazy = [name for name in {lazy_modules!r} if name in sys.modules]
+print(__import__("json").dumps({{"seconds": elapsed, "lazy": lazy}}))'''
+
+
+def measure(statement):
+    # Runs statement in fresh interpreter returning time and lazy modules.
+    script = SCRIPT.format(statement=statement, lazy_modules=LAZY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return json.loads(output)
+
+def measure_best(statement, repeat):
+    # Gets fastest of repeated measurements.
+    results = [measure(statement) for _ in range(repeat)]
+    return min(results, key=lambda result: result["seconds"])
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--repeat", type=int, default=5,
+        help="times to import surflink(fastest is reported)")
+    arg_parser.add_argument("--max-ms", type=float, default=None,
+        help="fail if 'import surflink' takes longer(milliseconds)")
+    args = arg_parser.parse_args()
+    failed = False
+    print("| statement | time (ms) | lazy modules imported |")
+    print("|---|---|---|")
+    for name, statement in STATEMENTS:
+        result = measure_best(statement, args.repeat)
+        print("| {} | {:.1f} | {} |".format(name, result["seconds"] * 1000,
+            ", ".join(result["lazy"]) or "-"))
+        if name == "import surflink":
+            if result["lazy"]:
+                failed = True
+            if args.max_ms != None and result["seconds"] * 1000 > \
+            args.max_ms:
+                failed = True
+    if failed:
+        print("import of surflink regressed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
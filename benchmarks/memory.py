@@ -0,0 +1,40 @@
+'''Measures memory used per link by Document links.
+
+Usage: python benchmarks/memory.py [links count]
+
+Memory is measured with tracemalloc for links kept after document was
+created(Link objects or columns) excluding memory for parsing.'''
+import sys
+import tracemalloc
+
+from surflink import document
+
+import generate
+
+
+def measure_links_memory(markup, **kwargs):
+    # Returns memory used by links of document in bytes and links count.
+    doc = document.Document(markup, engine="stream", **kwargs)
+    links = doc.get_links()
+    # Links are copied to measure them without parser and markup.
+    tracemalloc.start()
+    if kwargs.get("columnar"):
+        copied = document.ColumnarLinks(links)
+    else:
+        copied = [document.Link(link.link, link._tag_name, link._tag_attr,
+            link._base_link, link._type, link._rel_attr) for link in links]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(copied)
+
+def main(links_count=10000):
+    markup = generate.generate_page(links_count)
+    print("| storage | bytes per link |")
+    print("|---|---|")
+    for name, kwargs in (("Link list", {}), ("columnar", {"columnar": True})):
+        size, count = measure_links_memory(markup, **kwargs)
+        print("| {} | {:.1f} |".format(name, size / count))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
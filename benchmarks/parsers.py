@@ -0,0 +1,60 @@
+'''Compares time taken by parsers to find elements with links.
+
+Usage: python benchmarks/parsers.py [html files...]
+
+Synthetic page is used when no html files are provided. Time covers
+building tree and finding elements with links but not creating Link
+objects as that does not depend on parser.'''
+import sys
+import time
+
+from surflink import extract
+from surflink import scan
+from surflink import stream
+
+import generate
+
+
+def time_parser(markup, parser, repeat=3):
+    # Returns best time taken to find elements with links.
+    if parser == "scan" and isinstance(markup, str):
+        # Scanner works on bytes(strings are parsed by 'stream' engine).
+        markup = markup.encode("utf-8")
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if parser == "stream":
+            stream.parse(markup).elements
+        elif parser == "scan":
+            scan.parse(markup).elements
+        else:
+            soup = extract.create_soup(markup, parser)
+            extract.get_elements_with_links(soup)
+        elapsed = time.perf_counter() - start
+        if best == None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(paths):
+    if paths:
+        markups = []
+        for path in paths:
+            with open(path, "rb") as file:
+                markups.append(file.read())
+    else:
+        markups = [generate.generate_page(2000)]
+    parsers = extract.get_available_parsers() + ["stream", "scan"]
+    timings = {}
+    for parser in parsers:
+        timings[parser] = sum(time_parser(markup, parser) 
+            for markup in markups)
+    baseline = timings[extract.DEFAULT_PARSER]
+    print("| parser | time (ms) | speedup |")
+    print("|---|---|---|")
+    for parser in sorted(parsers, key=timings.get):
+        print("| {} | {:.1f} | {:.1f}x |".format(parser, 
+            timings[parser] * 1000, baseline / timings[parser]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
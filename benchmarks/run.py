@@ -0,0 +1,189 @@
+'''Benchmarks parsing, extracting, classifying and making links absolute.
+
+Usage: python benchmarks/run.py [--output FILE] [--compare FILE]
+
+Each stage is timed separately on synthetic pages(see generate.py) and 
+pages of corpus directory. Results can be saved as json and compared with
+results of other commit using --compare.'''
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from surflink import document
+from surflink import extract
+from surflink import scan
+from surflink import stream
+
+import generate
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
+    "corpus")
+# Synthetic pages as (links count, depth).
+SYNTHETIC_PAGES = ((100, 5), (1000, 5), (10000, 5), (1000, 50))
+# Base url for links of pages without base url.
+BASE_URL = "https://example.com/"
+STAGES = ("parse", "extract", "classify", "absolute")
+
+
+def load_workloads():
+    # Loads markups of synthetic pages and corpus pages.
+    workloads = {}
+    for links_count, depth in SYNTHETIC_PAGES:
+        name = "synthetic-{}-links-depth-{}".format(links_count, depth)
+        workloads[name] = generate.generate_page(links_count, depth)
+    for file_name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, file_name), "rb") as file:
+            workloads["corpus-" + file_name] = file.read()
+    return workloads
+
+def parse(markup, engine, parser):
+    # Parses markup returning elements with links and base url.
+    if engine in ("stream", "scan"):
+        if engine == "stream":
+            stream_parser = stream.parse(markup)
+        else:
+            stream_parser = scan.parse(markup)
+        elements = stream_parser.elements
+        base_element = stream_parser.base_element
+    else:
+        soup = extract.create_soup(markup, parser)
+        elements = extract.get_elements_with_links(soup)
+        base_element = extract.find_element(soup, "base")
+        if base_element and not extract.is_soup(base_element):
+            base_element = extract.create_element(base_element)
+    if base_element:
+        base_url = extract.get_element_attr_value(base_element, "href")
+    else:
+        base_url = None
+    return elements, base_url or BASE_URL
+
+def time_stages(markup, engine, parser):
+    # Times each stage once returning map of stages and times.
+    timings = {}
+    document.clear_url_caches()
+    start = time.perf_counter()
+    elements, base_url = parse(markup, engine, parser)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    links = [document.create_link_from_element(element, base_url) 
+        for element in elements]
+    links = [link for link in links if link != None]
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for link in links:
+        link.get_categories()
+    timings["classify"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for link in links:
+        link.get_absolute_link()
+    timings["absolute"] = time.perf_counter() - start
+    return timings, len(links)
+
+def measure_peak_memory(markup, engine, parser):
+    # Measures peak memory of creating document in bytes.
+    tracemalloc.start()
+    document.Document(markup, base_url=BASE_URL, engine=engine, 
+        parser=parser)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def run(repeat, engine, parser):
+    # Runs benchmarks returning results for each workload.
+    results = {}
+    for name, markup in load_workloads().items():
+        if engine == "scan" and isinstance(markup, str):
+            # Scanner works on bytes(strings are parsed by 'stream' engine).
+            markup = markup.encode("utf-8")
+        best = {}
+        for _ in range(repeat):
+            timings, links_count = time_stages(markup, engine, parser)
+            for stage, elapsed in timings.items():
+                best[stage] = min(best.get(stage, elapsed), elapsed)
+        best["total"] = sum(best[stage] for stage in STAGES)
+        best["links"] = links_count
+        best["bytes"] = len(markup)
+        best["peak_memory"] = measure_peak_memory(markup, engine, parser)
+        results[name] = best
+    return results
+
+def get_commit():
+    # Gets git commit of working tree(None if not available).
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "--short", 
+            "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), 
+            stderr=subprocess.DEVNULL)
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results):
+    print("| workload | links | " + " | ".join(STAGES) + 
+        " | total (ms) | peak memory (KB) |")
+    print("|---" * (len(STAGES) + 5) + "|")
+    for name, result in results.items():
+        timings = ["{:.2f}".format(result[stage] * 1000) for stage in STAGES]
+        print("| {} | {} | {} | {:.2f} | {:.0f} |".format(name, 
+            result["links"], " | ".join(timings), result["total"] * 1000,
+            result["peak_memory"] / 1024))
+
+def print_comparison(old_results, results):
+    # Prints ratio of new time to old time(below 1 is faster).
+    columns = STAGES + ("total", "peak_memory")
+    print("| workload | " + " | ".join(columns) + " |")
+    print("|---" * (len(columns) + 1) + "|")
+    for name, result in results.items():
+        if name not in old_results:
+            continue
+        ratios = []
+        for column in columns:
+            old_value = old_results[name].get(column)
+            if old_value:
+                ratios.append("{:.2f}x".format(result[column] / old_value))
+            else:
+                ratios.append("-")
+        print("| {} | {} |".format(name, " | ".join(ratios)))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--repeat", type=int, default=5, 
+        help="times to repeat each workload(best time is used)")
+    arg_parser.add_argument("--engine", default="soup", 
+        choices=document.ENGINES)
+    arg_parser.add_argument("--parser", default=None, 
+        help="parser for soup engine e.g 'lxml' or 'auto'")
+    arg_parser.add_argument("--output", help="file to save results as json")
+    arg_parser.add_argument("--compare", 
+        help="json file with results to compare with")
+    args = arg_parser.parse_args()
+
+    results = run(args.repeat, args.engine, args.parser)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "commit": get_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "engine": args.engine,
+                "parser": extract.get_parser(args.parser),
+                "results": results
+            }, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        print()
+        print("Compared with commit {}:".format(old.get("commit")))
+        print_comparison(old["results"], results)
+
+
+if __name__ == "__main__":
+    main()
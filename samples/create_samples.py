@@ -0,0 +1,102 @@
+'''Creates sample archives used for trying 'surflink' command offline.
+
+Usage: python samples/create_samples.py
+
+Pages of benchmarks corpus are written as WARC response records(with
+request, non html, chunked and gzip encoded responses) and as gzip'd json
+lines.'''
+import gzip
+import json
+import os
+
+
+SAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(os.path.dirname(SAMPLES_DIR), "benchmarks",
+    "corpus")
+BASE_URL = "https://example.com/"
+# Page without meta charset whose encoding is known only from content type
+# of its response(sent with gzip content encoding).
+ENCODED_PAGE_URL = BASE_URL + "greek.html"
+ENCODED_PAGE_CHARSET = "iso-8859-7"
+ENCODED_PAGE = """<html><head><title>Athens</title></head><body>
+<a href="/\u03b1\u03b8\u03ae\u03bd\u03b1">Athens</a>
+<img src="img/\u03c7\u03ac\u03c1\u03c4\u03b7\u03c2.png">
+</body></html>"""
+
+
+def load_pages():
+    # Loads pages of corpus as (url, markup bytes).
+    pages = []
+    for file_name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, file_name), "rb") as file:
+            pages.append((BASE_URL + file_name, file.read()))
+    return pages
+
+def create_warc_record(warc_type, url, block, record_id):
+    # Creates WARC record with block as its content.
+    headers = [
+        "WARC/1.0",
+        "WARC-Type: " + warc_type,
+        "WARC-Target-URI: " + url,
+        "WARC-Date: 2022-01-01T00:00:00Z",
+        "WARC-Record-ID: <urn:uuid:00000000-0000-0000-0000-{:012d}>".format(
+            record_id),
+        "Content-Type: application/http; msgtype=" + warc_type,
+        "Content-Length: {}".format(len(block))
+    ]
+    return "\r\n".join(headers).encode() + b"\r\n\r\n" + block + b"\r\n\r\n"
+
+def create_http_response(body, content_type, chunked=False,
+content_encoding=None):
+    # Creates http response with body.
+    headers = ["HTTP/1.1 200 OK", "Content-Type: " + content_type]
+    if content_encoding == "gzip":
+        headers.append("Content-Encoding: gzip")
+        body = gzip.compress(body, mtime=0)
+    if chunked:
+        headers.append("Transfer-Encoding: chunked")
+        middle = len(body) // 2
+        body = b"".join(b"%x\r\n%s\r\n" % (len(part), part)
+            for part in (body[:middle], body[middle:])) + b"0\r\n\r\n"
+    else:
+        headers.append("Content-Length: {}".format(len(body)))
+    return "\r\n".join(headers).encode() + b"\r\n\r\n" + body
+
+def create_warc(path, pages):
+    # Writes pages to WARC file with each record gzip'd separately.
+    records = []
+    for index, (url, markup) in enumerate(pages):
+        request = "GET / HTTP/1.1\r\nHost: example.com\r\n\r\n".encode()
+        records.append(create_warc_record("request", url, request,
+            len(records)))
+        response = create_http_response(markup, "text/html; charset=utf-8",
+            chunked=index % 2 == 1)
+        records.append(create_warc_record("response", url, response,
+            len(records)))
+    response = create_http_response(ENCODED_PAGE.encode(
+        ENCODED_PAGE_CHARSET), "text/html; charset=" + ENCODED_PAGE_CHARSET,
+        content_encoding="gzip")
+    records.append(create_warc_record("response", ENCODED_PAGE_URL,
+        response, len(records)))
+    image = create_http_response(b"\x89PNG\r\n", "image/png")
+    records.append(create_warc_record("response", BASE_URL + "logo.png",
+        image, len(records)))
+    with open(path, "wb") as file:
+        for record in records:
+            file.write(gzip.compress(record, mtime=0))
+
+def create_jsonl(path, pages):
+    # Writes pages to gzip'd json lines.
+    with gzip.GzipFile(path, "wb", mtime=0) as file:
+        for url, markup in pages:
+            line = json.dumps({"url": url, "html": markup.decode("utf-8")})
+            file.write(line.encode("utf-8") + b"\n")
+
+def main():
+    pages = load_pages()
+    create_warc(os.path.join(SAMPLES_DIR, "pages.warc.gz"), pages)
+    create_jsonl(os.path.join(SAMPLES_DIR, "pages.jsonl.gz"), pages)
+
+
+if __name__ == "__main__":
+    main()
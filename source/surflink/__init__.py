@@ -3,6 +3,42 @@ from surflink import highlevel
 
 from surflink.highlevel import *
 
+import importlib
+
+
+# Modules and their objects imported when first accessed.
+# They import modules slow to import(e.g asyncio, sqlite3) which is not
+# needed by most short lived processes(see benchmarks/imports.py).
+LAZY_MODULES = ("batch", "aio", "feeder", "stats", "cache", "graph",
+    "frontier")
+LAZY_OBJECTS = {
+    "extract_batch": "batch",
+    "aextract_urls": "aio",
+    "aextract_categorized_urls": "aio",
+    "AsyncExtractor": "aio",
+    "LinkFeeder": "feeder",
+    "Stats": "stats",
+    "DocumentCache": "cache",
+    "LinkGraph": "graph",
+    "Frontier": "frontier"
+}
+
+
+def __getattr__(name):
+    # Imports lazy module or object on first access.
+    if name in LAZY_MODULES:
+        return importlib.import_module("surflink." + name)
+    elif name in LAZY_OBJECTS:
+        module = importlib.import_module("surflink." + LAZY_OBJECTS[name])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    err_msg = "module 'surflink' has no attribute '{}'"
+    raise AttributeError(err_msg.format(name))
+
+def __dir__():
+    return sorted(set(globals()).union(LAZY_MODULES, LAZY_OBJECTS))
+
 
 __name__ = "surflink"
 ___version__ = "0.0.1"
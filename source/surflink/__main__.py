@@ -0,0 +1,6 @@
+import sys
+
+from surflink import cli
+
+
+sys.exit(cli.main())
@@ -0,0 +1,139 @@
+from surflink import batch
+from surflink import document
+from surflink import highlevel
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import os
+
+
+def _extract_links(markup, kwargs):
+    # Extracts Link objects from markup(runs within executor).
+    # Links are returned instead of document as document is not picklable.
+    return list(document.Document(markup, **kwargs).get_links())
+
+async def _run_in_executor(executor, func, *args, **kwargs):
+    # Runs function within executor without blocking event loop.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, 
+        functools.partial(func, *args, **kwargs))
+
+async def aextract_urls(html_markup, executor=None, **kwargs):
+    '''Extracts all urls within markup without blocking event loop. Default
+    executor of event loop is used if executor is not provided.'''
+    return await _run_in_executor(executor, highlevel.extract_urls, 
+        html_markup, **kwargs)
+
+async def aextract_categorized_urls(html_markup, categories=None, 
+executor=None, **kwargs):
+    '''Extracts urls for multiple categories without blocking event loop'''
+    return await _run_in_executor(executor, 
+        highlevel.extract_categorized_urls, html_markup, categories, **kwargs)
+
+
+class AsyncExtractor():
+    '''Extracts links from markup within executor for asyncio programs'''
+    def __init__(self, executor=None, max_workers=None, max_pending=None, 
+    **kwargs):
+        # executor: executor to use, thread pool is created if not provided.
+        # max_workers: workers of created thread pool.
+        # max_pending: maximum markups being extracted at same time.
+        # kwargs: arguments for creating documents e.g 'make_absolute'.
+        if max_workers == None:
+            max_workers = os.cpu_count() or 1
+        if max_pending == None:
+            max_pending = max_workers * 2
+        self._owns_executor = executor == None
+        if executor == None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._executor = executor
+        self._max_pending = max_pending
+        self._kwargs = kwargs
+        # Semaphore is created within event loop when first needed.
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        # Gets semaphore limiting markups being extracted.
+        if self._semaphore == None:
+            self._semaphore = asyncio.Semaphore(self._max_pending)
+        return self._semaphore
+
+    def _get_kwargs(self, kwargs):
+        # Gets arguments for document overiding those of extractor.
+        document_kwargs = dict(self._kwargs)
+        document_kwargs.update(kwargs)
+        return document_kwargs
+
+    async def _run(self, func, *args, **kwargs):
+        # Runs function within executor waiting if too many are running.
+        async with self._get_semaphore():
+            return await _run_in_executor(self._executor, func, *args, 
+                **kwargs)
+
+    async def create_document(self, markup, **kwargs):
+        # Creates document within executor.
+        # Document cannot be created within process executor.
+        return await self._run(document.Document, markup, 
+            **self._get_kwargs(kwargs))
+
+    async def extract_links(self, markup, **kwargs):
+        # Extracts Link objects from markup.
+        return await self._run(_extract_links, markup, 
+            self._get_kwargs(kwargs))
+
+    async def extract_urls(self, markup, **kwargs):
+        # Extracts all urls within markup.
+        return await self._run(highlevel.extract_urls, markup, 
+            **self._get_kwargs(kwargs))
+
+    async def extract_categorized_urls(self, markup, categories=None, 
+    **kwargs):
+        # Extracts urls for multiple categories within markup.
+        return await self._run(highlevel.extract_categorized_urls, markup,
+            categories, **self._get_kwargs(kwargs))
+
+    async def iter_links(self, pages, **kwargs):
+        # Yields Link objects of pages in order of pages.
+        # pages: iterable or async iterable of markups, tuples of markup
+        # and base url or dicts with markup and arguments of document.
+        # Pages are read only when there is space for extracting them.
+        pending = collections.deque()
+        if hasattr(pages, "__aiter__"):
+            async for page in pages:
+                pending.append(self._schedule_page(page, kwargs))
+                if len(pending) >= self._max_pending:
+                    for link in await pending.popleft():
+                        yield link
+        else:
+            for page in pages:
+                pending.append(self._schedule_page(page, kwargs))
+                if len(pending) >= self._max_pending:
+                    for link in await pending.popleft():
+                        yield link
+        while pending:
+            for link in await pending.popleft():
+                yield link
+
+    def _schedule_page(self, page, kwargs):
+        # Schedules extraction of links from page returning its future.
+        markup, page_kwargs = batch._split_page(page)
+        if page_kwargs:
+            kwargs = dict(kwargs, **page_kwargs)
+        return asyncio.ensure_future(self.extract_links(markup, **kwargs))
+
+    def close(self):
+        # Shuts down executor if it was created by extractor.
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,228 @@
+from surflink import batch
+from surflink import exception
+
+import collections
+import gzip
+import json
+import zlib
+
+
+# Formats of archives with pages.
+# 'warc' is web archive(WARC) file, 'jsonl' has json object per line and
+# 'html' is single page.
+ARCHIVE_FORMATS = ("warc", "jsonl", "html")
+# Formats for writing extracted urls.
+# 'jsonl' writes json object per page and 'tsv' writes row per url with
+# columns for page url, category and url.
+OUTPUT_FORMATS = ("jsonl", "tsv")
+
+# Keys of json objects(jsonl records) with url and markup of page.
+URL_KEY = "url"
+MARKUP_KEY = "html"
+
+# Pages with these content types are extracted from WARC responses.
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Page read from archive(markup is bytes or str).
+# content_type is http content type of page(its charset is encoding of
+# markup), None if not known.
+ArchiveRecord = collections.namedtuple("ArchiveRecord",
+    ["url", "markup", "content_type"], defaults=[None])
+
+
+def open_archive(path):
+    # Opens archive file for reading bytes(gzip files are decompressed).
+    # Gzip is detected from magic bytes rather than file extension.
+    file = open(path, "rb")
+    if file.peek(2)[:2] == b"\x1f\x8b":
+        # GzipFile does not close file it was given.
+        file.close()
+        return gzip.open(path, "rb")
+    return file
+
+def get_archive_format(path):
+    # Guesses format of archive from its file name.
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".warc"):
+        return "warc"
+    elif name.endswith(".jsonl") or name.endswith(".json"):
+        return "jsonl"
+    elif name.endswith(".html") or name.endswith(".htm"):
+        return "html"
+    err_msg = "Format of archive '{}' cannot be guessed, should be one of {}"
+    raise ValueError(err_msg.format(path, ARCHIVE_FORMATS))
+
+def _read_headers(file):
+    # Reads header lines until empty line returning lowercase keys map.
+    headers = {}
+    for line in iter(file.readline, b""):
+        line = line.rstrip(b"\r\n")
+        if not line:
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return headers
+
+def _split_http_response(block):
+    # Splits http response into headers and body.
+    for separator in (b"\r\n\r\n", b"\n\n"):
+        head, found, body = block.partition(separator)
+        if found:
+            break
+    else:
+        return {}, b""
+    headers = {}
+    # First line is status line(e.g HTTP/1.1 200 OK).
+    for line in head.splitlines()[1:]:
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return headers, body
+
+def _decode_chunked(body):
+    # Decodes body sent with chunked transfer encoding.
+    chunks = []
+    position = 0
+    while position < len(body):
+        line_end = body.find(b"\r\n", position)
+        if line_end == -1:
+            break
+        size = int(body[position:line_end].split(b";")[0].strip() or 0, 16)
+        if size == 0:
+            break
+        start = line_end + 2
+        chunks.append(body[start:start + size])
+        position = start + size + 2
+    return b"".join(chunks)
+
+def _decode_content(body, content_encoding):
+    # Decompresses body sent with gzip or deflate content encoding.
+    # Body with other content encoding is returned as it is.
+    content_encoding = content_encoding.strip().lower()
+    try:
+        if content_encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(body)
+        elif content_encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # Some servers send deflate data without zlib header.
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+    except (OSError, EOFError, zlib.error) as error:
+        err_msg = "Body with '{}' content encoding cannot be decoded: {}"
+        raise exception.ArchiveError(err_msg.format(content_encoding, error))
+    return body
+
+def is_html_content_type(content_type):
+    # Checks if content type(may have parameters) is for html.
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type in HTML_CONTENT_TYPES
+
+def iter_warc_records(file):
+    # Yields html pages from WARC response records of file.
+    # Records are read one at a time(whole archive is not read).
+    for line in iter(file.readline, b""):
+        if not line.strip():
+            # Records are separated by empty lines.
+            continue
+        if not line.startswith(b"WARC/"):
+            err_msg = "Expected WARC record header not '{}'"
+            raise exception.ArchiveError(err_msg.format(
+                line[:40].decode("latin-1")))
+        headers = _read_headers(file)
+        block = file.read(int(headers.get("content-length", 0)))
+        if headers.get("warc-type") != "response":
+            continue
+        http_headers, body = _split_http_response(block)
+        content_type = http_headers.get("content-type", "")
+        if not is_html_content_type(content_type):
+            continue
+        if http_headers.get("transfer-encoding", "").lower() == "chunked":
+            body = _decode_chunked(body)
+        if "content-encoding" in http_headers:
+            body = _decode_content(body, http_headers["content-encoding"])
+        yield ArchiveRecord(headers.get("warc-target-uri"), body,
+            content_type)
+
+def iter_jsonl_records(file, url_key=URL_KEY, markup_key=MARKUP_KEY):
+    # Yields pages from lines of json objects.
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            err_msg = "Line {} is not valid json: {}"
+            raise exception.ArchiveError(err_msg.format(line_number, error))
+        if record.get(markup_key) == None:
+            continue
+        yield ArchiveRecord(record.get(url_key), record[markup_key])
+
+def iter_archive_records(path, archive_format=None, **kwargs):
+    # Yields pages of archive file at path.
+    # kwargs: arguments for iter_jsonl_records() e.g 'markup_key'.
+    if archive_format == None:
+        archive_format = get_archive_format(path)
+    if archive_format not in ARCHIVE_FORMATS:
+        err_msg = "archive_format should be one of {} not '{}'"
+        raise ValueError(err_msg.format(ARCHIVE_FORMATS, archive_format))
+    with open_archive(path) as file:
+        if archive_format == "warc":
+            records = iter_warc_records(file)
+        elif archive_format == "html":
+            records = [ArchiveRecord(None, file.read())]
+        else:
+            records = iter_jsonl_records(file, **kwargs)
+        for record in records:
+            yield record
+
+def extract_archive(records, categories=None, executor="process",
+workers=None, chunksize=8, ordered=True, **kwargs):
+    # Extracts urls from archive records in parallel(see extract_batch()).
+    # Url of record is page url of its page(base tag of page is used if it
+    # has one), base_url within kwargs overides both. Content type of record
+    # gives encoding of its markup.
+    pages = ({batch.MARKUP_KEY: record.markup, "page_url": record.url,
+        "content_type": record.content_type} for record in records)
+    return batch.extract_batch(pages, categories, executor, workers,
+        chunksize, ordered, **kwargs)
+
+def write_result(result, file, output_format="jsonl"):
+    # Writes urls of page(BatchResult) to text file.
+    if output_format == "jsonl":
+        data = {"url": batch.get_result_url(result)}
+        if result.error != None:
+            data["error"] = repr(result.error)
+        elif isinstance(result.urls, dict):
+            data["categories"] = result.urls
+        else:
+            data["urls"] = result.urls
+        file.write(json.dumps(data) + "\n")
+    elif output_format == "tsv":
+        if result.error != None:
+            return
+        if isinstance(result.urls, dict):
+            rows = ((category, url) for category, urls in
+                result.urls.items() for url in urls)
+        else:
+            rows = (("", url) for url in result.urls)
+        page_url = batch.get_result_url(result) or ""
+        for category, url in rows:
+            file.write("\t".join((page_url, category,
+                url.replace("\t", "%09"))) + "\n")
+    else:
+        err_msg = "output_format should be one of {} not '{}'"
+        raise ValueError(err_msg.format(OUTPUT_FORMATS, output_format))
+
+def get_urls_count(result):
+    # Gets number of urls extracted from page(BatchResult).
+    if result.urls == None:
+        return 0
+    elif isinstance(result.urls, dict):
+        return sum(len(urls) for urls in result.urls.values())
+    return len(result.urls)
+
+
+if __name__ == "__main__":
+    pass
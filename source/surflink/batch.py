@@ -0,0 +1,147 @@
+from surflink import highlevel
+
+import collections
+import concurrent.futures
+import itertools
+import os
+
+
+# Executors for running extraction in parallel.
+EXECUTORS = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor
+}
+
+# Key of markup within dict of page.
+MARKUP_KEY = "markup"
+
+# Results of extracting urls from one document(page) of batch.
+# urls is list of urls or dict of categories to urls and error is exception
+# raised while extracting urls(urls will be None). page_url is url page
+# was fetched from(see page_url argument of Document).
+BatchResult = collections.namedtuple("BatchResult",
+    ["index", "base_url", "urls", "error", "page_url"], defaults=[None])
+
+
+def _split_page(page):
+    # Gets markup of page and arguments of its document.
+    # Page is markup, tuple of markup and base url or dict with markup and
+    # arguments of its document e.g {'markup': ..., 'page_url': ...}.
+    if isinstance(page, (str, bytes)):
+        return page, {}
+    elif isinstance(page, dict):
+        page_kwargs = dict(page)
+        return page_kwargs.pop(MARKUP_KEY), page_kwargs
+    markup, base_url = page
+    if base_url == None:
+        return markup, {}
+    return markup, {"base_url": base_url}
+
+def get_result_url(result):
+    # Gets url of page of result(page url or base url).
+    if result.page_url != None:
+        return result.page_url
+    return result.base_url
+
+def _extract_page(index, page, categories, kwargs):
+    # Extracts urls from page capturing errors(including invalid page).
+    document_kwargs = kwargs
+    try:
+        markup, page_kwargs = _split_page(page)
+        # Arguments of page overide those of batch.
+        document_kwargs = dict(kwargs, **page_kwargs)
+        if categories == None:
+            urls = highlevel.extract_urls(markup, **document_kwargs)
+        else:
+            urls = highlevel.extract_categorized_urls(markup, categories,
+                **document_kwargs)
+        error = None
+    except Exception as page_error:
+        urls, error = None, page_error
+    return BatchResult(index, document_kwargs.get("base_url"), urls, error,
+        document_kwargs.get("page_url"))
+
+def _extract_chunk(chunk, categories, kwargs):
+    # Extracts urls from pages within chunk(runs within executor).
+    return [_extract_page(index, page, categories, kwargs) 
+        for index, page in chunk]
+
+def _get_chunk_results(future, chunk):
+    # Gets results of chunk from its future.
+    # Failure of whole chunk(e.g result not picklable) fails its pages.
+    # Pages are not split again as invalid page may have failed chunk.
+    try:
+        return future.result()
+    except Exception as error:
+        return [BatchResult(index, None, None, error) for index, _ in chunk]
+
+def _create_chunks(pages, chunksize):
+    # Creates chunks of indexed pages lazily.
+    indexed_pages = enumerate(pages)
+    while True:
+        chunk = list(itertools.islice(indexed_pages, chunksize))
+        if not chunk:
+            break
+        yield chunk
+
+def _iter_results(executor, pages, categories, workers, chunksize, ordered,
+kwargs):
+    # Submits chunks to executor yielding their results.
+    # Number of pending chunks is limited to avoid reading all pages.
+    max_pending = workers * 2
+    pending = collections.OrderedDict()
+    for chunk in _create_chunks(pages, chunksize):
+        future = executor.submit(_extract_chunk, chunk, categories, kwargs)
+        pending[future] = chunk
+        while len(pending) >= max_pending:
+            if ordered:
+                future, chunk = pending.popitem(last=False)
+            else:
+                done, _ = concurrent.futures.wait(pending, 
+                    return_when=concurrent.futures.FIRST_COMPLETED)
+                future = next(iter(done))
+                chunk = pending.pop(future)
+            for result in _get_chunk_results(future, chunk):
+                yield result
+    if ordered:
+        futures = list(pending)
+    else:
+        futures = concurrent.futures.as_completed(list(pending))
+    for future in futures:
+        for result in _get_chunk_results(future, pending[future]):
+            yield result
+
+def _iter_batch(pages, categories, executor, workers, chunksize, ordered,
+kwargs):
+    # Yields results of pages creating executor if not provided.
+    if isinstance(executor, concurrent.futures.Executor):
+        for result in _iter_results(executor, pages, categories, workers, 
+        chunksize, ordered, kwargs):
+            yield result
+    else:
+        with EXECUTORS[executor](workers) as executor_object:
+            for result in _iter_results(executor_object, pages, categories,
+            workers, chunksize, ordered, kwargs):
+                yield result
+
+def extract_batch(pages, categories=None, executor="process", workers=None,
+chunksize=1, ordered=True, **kwargs):
+    '''Extracts urls from many pages(markup, tuple of markup and base url or
+    dict with markup and arguments of its document e.g 'page_url') in
+    parallel yielding BatchResult for each page. Results are in order of 
+    pages unless ordered is False(yielded as completed). Error of page is 
+    stored in its result without stopping other pages.'''
+    # executor: 'process', 'thread' or instance of Executor.
+    # kwargs: arguments for creating documents e.g 'make_absolute'.
+    if workers == None:
+        workers = os.cpu_count() or 1
+    if not isinstance(executor, concurrent.futures.Executor) and \
+    executor not in EXECUTORS:
+        err_msg = "executor should be one of {} not '{}'"
+        raise ValueError(err_msg.format(tuple(EXECUTORS), executor))
+    return _iter_batch(pages, categories, executor, workers, chunksize, 
+        ordered, kwargs)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,274 @@
+from surflink import document
+
+import contextlib
+import hashlib
+import marshal
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# Maximum size of cached links in bytes before old entries are evicted.
+MAX_SIZE = 256 * 2**20
+# Version of format of stored links(entries of other versions are ignored).
+FORMAT_VERSION = 1
+# Arguments of documents that do not affect extracted links.
+IGNORED_OPTIONS = ("stats",)
+# Number of hits whose access times are written at once.
+ACCESS_BATCH_SIZE = 256
+
+
+@contextlib.contextmanager
+def _transaction(connection):
+    # Runs statements within write transaction committing them at end.
+    # Write lock is taken at start so that values read within transaction
+    # (e.g total size) are not changed by other processes.
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+def _normalize_option(value):
+    # Gets value of option that has same repr for equal values.
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return value
+
+def get_cache_key(markup, options):
+    # Gets key of markup and options of document(hash as bytes).
+    # options: arguments for creating document e.g 'base_url'.
+    if isinstance(markup, str):
+        markup = markup.encode("utf-8", errors="surrogatepass")
+    options = sorted((key, _normalize_option(value)) for key, value in
+        options.items() if key not in IGNORED_OPTIONS)
+    hash_object = hashlib.blake2b(markup, digest_size=20)
+    hash_object.update(repr(options).encode("utf-8"))
+    return hash_object.digest()
+
+def dumps_document(doc_object):
+    # Converts links and metadata of document into compressed bytes.
+    links = doc_object.get_links()
+    if not isinstance(links, document.ColumnarLinks):
+        links = document.ColumnarLinks(links)
+    base_link = doc_object.get_base_link()
+    if base_link != None:
+        base = (base_link.get_link(), base_link.get_tag_name())
+    else:
+        base = None
+    data = (FORMAT_VERSION, base, doc_object.get_duplicates_count(),
+        links.get_columns())
+    return zlib.compress(marshal.dumps(data), 1)
+
+def loads_document(data):
+    # Creates document from bytes returned by dumps_document().
+    # None is returned if bytes are of other format version.
+    try:
+        version, base, duplicates_count, columns = marshal.loads(
+            zlib.decompress(data))
+    except (ValueError, EOFError, TypeError, zlib.error):
+        return None
+    if version != FORMAT_VERSION:
+        return None
+    links = document.ColumnarLinks.from_columns(columns)
+    return CachedDocument(links, base, duplicates_count)
+
+
+class CachedDocument(document.Links):
+    '''Document with links restored from cache without parsing markup'''
+    def __init__(self, links, base=None, duplicates_count=0):
+        # links: ColumnarLinks of document.
+        # base: tuple of base url and its tag name(None if no base url).
+        super().__init__(links)
+        self._base = base
+        self._duplicates_count = duplicates_count
+
+    def get_base_link(self):
+        if self._base != None:
+            return document.Link(self._base[0], self._base[1], None)
+
+    def get_duplicates_count(self):
+        return self._duplicates_count
+
+
+class DocumentCache():
+    '''Stores links of documents on disk(sqlite) keyed by markup hash'''
+    # Repeated markup with same options becomes lookup instead of parsing.
+    # Least recently used entries are evicted once size exceeds max_size.
+    # Total size is kept in meta table updated with entries and access
+    # times of hits are written in batches, so lookups do not write.
+    def __init__(self, path, max_size=MAX_SIZE):
+        # path: path of sqlite database file(created if not exists).
+        # max_size: maximum size of stored links in bytes.
+        self._path = path
+        self._max_size = max_size
+        self._connection = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        # Access times of hits not yet written(keys to times).
+        self._accessed = {}
+
+    def _connect(self):
+        # Gets connection to database creating its tables if needed.
+        # Connection is created lazily(e.g after cache is sent to process).
+        if self._connection == None:
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+            # Transactions are started explicitly(see _transaction()).
+            connection = sqlite3.connect(self._path, timeout=30,
+                check_same_thread=False, isolation_level=None)
+            # WAL allows other processes to read while one is writing.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with _transaction(connection):
+                connection.execute("CREATE TABLE IF NOT EXISTS documents ("
+                    "key BLOB PRIMARY KEY, data BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS "
+                    "accessed_index ON documents(accessed)")
+                connection.execute("CREATE TABLE IF NOT EXISTS meta ("
+                    "name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+                # Size of entries stored before meta table existed.
+                connection.execute("INSERT OR IGNORE INTO meta VALUES "
+                    "('size', (SELECT COALESCE(SUM(size), 0) FROM documents))")
+            self._connection = connection
+        return self._connection
+
+    def _add_size(self, connection, size):
+        connection.execute("UPDATE meta SET value = value + ? "
+            "WHERE name = 'size'", (size,))
+
+    def _get_size(self, connection):
+        return connection.execute(
+            "SELECT value FROM meta WHERE name = 'size'").fetchone()[0]
+
+    def _write_accessed(self, connection):
+        # Writes access times of hits not yet written.
+        if self._accessed:
+            connection.executemany("UPDATE documents SET accessed = ? "
+                "WHERE key = ?", [(accessed, key) for key, accessed in
+                self._accessed.items()])
+            self._accessed.clear()
+
+    def _evict(self, connection):
+        # Deletes least recently used entries until size is within limit.
+        size = self._get_size(connection)
+        if size <= self._max_size:
+            return
+        rows = connection.execute(
+            "SELECT key, size FROM documents ORDER BY accessed")
+        keys = []
+        removed_size = 0
+        for key, entry_size in rows:
+            if size - removed_size <= self._max_size:
+                break
+            keys.append((key,))
+            removed_size += entry_size
+        connection.executemany("DELETE FROM documents WHERE key = ?", keys)
+        self._add_size(connection, -removed_size)
+
+    def get(self, key):
+        # Gets document stored with key(None if not stored).
+        # Access time is written with next put or once ACCESS_BATCH_SIZE
+        # hits are waiting.
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT data FROM documents WHERE key = ?", (key,)).fetchone()
+            if row == None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_BATCH_SIZE:
+                with _transaction(connection):
+                    self._write_accessed(connection)
+        return loads_document(row[0])
+
+    def put(self, key, doc_object):
+        # Stores links of document with key.
+        data = dumps_document(doc_object)
+        with self._lock:
+            connection = self._connect()
+            with _transaction(connection):
+                row = connection.execute("SELECT size FROM documents "
+                    "WHERE key = ?", (key,)).fetchone()
+                old_size = row[0] if row != None else 0
+                connection.execute("INSERT OR REPLACE INTO documents "
+                    "(key, data, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()))
+                self._add_size(connection, len(data) - old_size)
+                # Recently hit entries should not be evicted.
+                self._write_accessed(connection)
+                self._evict(connection)
+
+    def create_document(self, markup, **kwargs):
+        # Gets document from cache or creates and stores it.
+        # Markup of files(file-like objects) is not cached.
+        if not isinstance(markup, (str, bytes)):
+            return document.Document(markup, **kwargs)
+        key = get_cache_key(markup, kwargs)
+        doc_object = self.get(key)
+        stats = kwargs.get("stats")
+        if doc_object != None:
+            with self._lock:
+                self._hits += 1
+            if stats != None:
+                stats.increment("cache_hits")
+            return doc_object
+        with self._lock:
+            self._misses += 1
+        if stats != None:
+            stats.increment("cache_misses")
+        doc_object = document.Document(markup, **kwargs)
+        self.put(key, doc_object)
+        return doc_object
+
+    def get_size(self):
+        # Gets size of stored links in bytes.
+        with self._lock:
+            return self._get_size(self._connect())
+
+    def get_hit_rate(self):
+        # Gets rate of lookups that found document(0 if no lookups).
+        with self._lock:
+            lookups = self._hits + self._misses
+            return self._hits / lookups if lookups else 0.0
+
+    def clear(self):
+        # Deletes all stored documents.
+        with self._lock:
+            connection = self._connect()
+            with _transaction(connection):
+                connection.execute("DELETE FROM documents")
+                connection.execute("UPDATE meta SET value = 0 "
+                    "WHERE name = 'size'")
+            self._accessed.clear()
+
+    def close(self):
+        # Writes waiting access times and closes connection.
+        with self._lock:
+            if self._connection != None:
+                with _transaction(self._connection):
+                    self._write_accessed(self._connection)
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __getstate__(self):
+        # Connection and lock cannot be pickled(e.g sent to processes).
+        return {"path": self._path, "max_size": self._max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["max_size"])
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,167 @@
+'''Extracts urls from web archives(WARC), gzip'd json lines or html files.
+
+Usage: surflink [options] FILE [FILE ...]
+
+Urls of each page are written as json line(or tsv rows) to output while
+progress and throughput are reported to stderr.'''
+from surflink import archive
+from surflink import cache
+from surflink import document
+from surflink import exception
+from surflink import extract
+
+import argparse
+import sys
+import time
+
+
+class Progress():
+    '''Reports number of pages and urls extracted along with throughput'''
+    def __init__(self, file=None, interval=2.0, enabled=True):
+        # file: file for writing reports(stderr by default).
+        # interval: seconds between reports.
+        self._file = sys.stderr if file == None else file
+        self._interval = interval
+        self._enabled = enabled
+        self._start_time = time.perf_counter()
+        self._last_report_time = self._start_time
+        self._pages = 0
+        self._urls = 0
+        self._errors = 0
+        self._bytes = 0
+
+    def add_bytes(self, size):
+        self._bytes += size
+
+    def add_result(self, result):
+        # Records result of page(BatchResult) reporting if its time.
+        self._pages += 1
+        self._urls += archive.get_urls_count(result)
+        if result.error != None:
+            self._errors += 1
+        now = time.perf_counter()
+        if now - self._last_report_time >= self._interval:
+            self._last_report_time = now
+            self.report()
+
+    def as_dict(self):
+        # Gets counts and throughput as dict.
+        elapsed = max(time.perf_counter() - self._start_time, 1e-9)
+        return {
+            "pages": self._pages,
+            "urls": self._urls,
+            "errors": self._errors,
+            "bytes": self._bytes,
+            "seconds": elapsed,
+            "pages_per_second": self._pages / elapsed,
+            "megabytes_per_second": self._bytes / elapsed / 2**20
+        }
+
+    def report(self, final=False):
+        # Writes progress line to file.
+        if not self._enabled:
+            return
+        data = self.as_dict()
+        line = "{}pages {} urls {} errors {} | {:.1f} pages/s {:.2f} MB/s" +\
+            " | {:.1f}s"
+        prefix = "done: " if final else ""
+        self._file.write(line.format(prefix, data["pages"], data["urls"],
+            data["errors"], data["pages_per_second"],
+            data["megabytes_per_second"], data["seconds"]) + "\n")
+        self._file.flush()
+
+
+def create_arg_parser():
+    # Creates parser for command-line arguments.
+    arg_parser = argparse.ArgumentParser(prog="surflink",
+        description=__doc__.split("\n")[0])
+    arg_parser.add_argument("files", nargs="+", metavar="FILE",
+        help="archives(.warc, .jsonl, optionaly gzip'd) or html files")
+    arg_parser.add_argument("--input-format", choices=archive.ARCHIVE_FORMATS,
+        help="format of files(guessed from file names by default)")
+    arg_parser.add_argument("--categories", nargs="+", metavar="CATEGORY",
+        choices=document.CATEGORIES, help="categories of urls to extract" +\
+        "(all urls by default)")
+    arg_parser.add_argument("-o", "--output", default="-",
+        help="file to write urls('-' for stdout)")
+    arg_parser.add_argument("--output-format", default="jsonl",
+        choices=archive.OUTPUT_FORMATS)
+    arg_parser.add_argument("--workers", type=int, default=None,
+        help="number of worker processes(cpu count by default)")
+    arg_parser.add_argument("--executor", default="process",
+        choices=("process", "thread"))
+    arg_parser.add_argument("--chunksize", type=int, default=8,
+        help="pages sent to worker at once")
+    arg_parser.add_argument("--unordered", action="store_true",
+        help="write pages as they complete instead of archive order")
+    arg_parser.add_argument("--engine", choices=document.ENGINES)
+    arg_parser.add_argument("--parser", choices=extract.PARSERS + ("auto",))
+    arg_parser.add_argument("--make-absolute", action="store_true")
+    arg_parser.add_argument("--unique", action="store_true")
+    arg_parser.add_argument("--strict", action="store_true")
+    arg_parser.add_argument("--cache", metavar="PATH",
+        help="sqlite file for caching links of repeated pages")
+    arg_parser.add_argument("--markup-key", default=archive.MARKUP_KEY,
+        help="key of json lines with markup of page")
+    arg_parser.add_argument("--url-key", default=archive.URL_KEY,
+        help="key of json lines with url of page")
+    arg_parser.add_argument("--progress-interval", type=float, default=2.0,
+        help="seconds between progress reports")
+    arg_parser.add_argument("-q", "--quiet", action="store_true",
+        help="do not report progress")
+    return arg_parser
+
+def iter_records(args, progress):
+    # Yields records of all files counting their bytes.
+    for path in args.files:
+        kwargs = {}
+        input_format = args.input_format or archive.get_archive_format(path)
+        if input_format == "jsonl":
+            kwargs = {"url_key": args.url_key, "markup_key": args.markup_key}
+        for record in archive.iter_archive_records(path, input_format,
+        **kwargs):
+            progress.add_bytes(len(record.markup))
+            yield record
+
+def get_document_kwargs(args):
+    # Gets arguments for creating documents from command-line arguments.
+    kwargs = {"make_absolute": args.make_absolute, "unique": args.unique,
+        "strict": args.strict}
+    if args.engine != None:
+        kwargs["engine"] = args.engine
+    if args.parser != None:
+        kwargs["parser"] = args.parser
+    if args.cache != None:
+        kwargs["cache"] = cache.DocumentCache(args.cache)
+    return kwargs
+
+def run(args, output):
+    # Extracts urls of files in args writing them to output.
+    progress = Progress(interval=args.progress_interval,
+        enabled=not args.quiet)
+    results = archive.extract_archive(iter_records(args, progress),
+        args.categories, args.executor, args.workers, args.chunksize,
+        not args.unordered, **get_document_kwargs(args))
+    for result in results:
+        archive.write_result(result, output, args.output_format)
+        progress.add_result(result)
+    progress.report(final=True)
+    return progress
+
+def main(argv=None):
+    # Entry point of 'surflink' command.
+    args = create_arg_parser().parse_args(argv)
+    try:
+        if args.output == "-":
+            run(args, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as output:
+                run(args, output)
+    except (OSError, ValueError, exception.ArchiveError) as error:
+        sys.stderr.write("surflink: error: {}\n".format(error))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,30 @@
-from resid import urlmod
-from resid import document
-
+import array
+import collections
+import functools
+import mmap
+import os
+import sys
+
+from surflink import encoding as encodingmodule
 from surflink import exception
 from surflink import extract
+from surflink import scan
+from surflink import stream
+from surflink import url
+
+
+# Map containing tag attributes and possible content types of their links.
+# Its checked before tag names(e.g 'poster' of video tag is image).
+TAG_ATTRS_CONTENT_TYPES = {
+    "srcset": "image/x",
+    "data-srcset": "image/x",
+    "imagesrcset": "image/x",
+    "poster": "image/x"
+}
 
+# Attributes of tags whose links are loaded as resources of page.
+RESOURCE_ATTRS = ("src", "srcset", "data-src", "data-srcset", "imagesrcset",
+    "poster", "style")
 
 # Map containing tag names and possible content types.
 TAG_NAMES_CONTENT_TYPES = {
@@ -14,11 +35,212 @@ TAG_NAMES_CONTENT_TYPES = {
     "script": "application/javascript"
 }
 
+# Map containing category names and Link methods matching them.
+# Names are same as those of Links getters(e.g 'images' for get_images()).
+CATEGORIES = {
+    "resources": "is_resource",
+    "hyperlinks": "is_hyperlink",
+    "weblinks": "is_weblink",
+    "scripts": "is_script",
+    "linked": "is_linked",
+    "images": "is_image",
+    "videos": "is_video",
+    "audios": "is_audio",
+    "stylesheets": "is_stylesheet",
+    "javascripts": "is_javascript",
+    "htmls": "is_html",
+    "webpages": "is_webpage"
+}
+
+# Bit flags for categories of links.
+# Flags can be combined e.g 'IMAGE | VIDEO' for images or videos.
+RESOURCE = 1 << 0
+HYPERLINK = 1 << 1
+WEBLINK = 1 << 2
+SCRIPT = 1 << 3
+LINKED = 1 << 4
+IMAGE = 1 << 5
+VIDEO = 1 << 6
+AUDIO = 1 << 7
+STYLESHEET = 1 << 8
+JAVASCRIPT = 1 << 9
+HTML = 1 << 10
+WEBPAGE = 1 << 11
+
+# Map containing category names and their flags.
+CATEGORIES_FLAGS = {
+    "resources": RESOURCE,
+    "hyperlinks": HYPERLINK,
+    "weblinks": WEBLINK,
+    "scripts": SCRIPT,
+    "linked": LINKED,
+    "images": IMAGE,
+    "videos": VIDEO,
+    "audios": AUDIO,
+    "stylesheets": STYLESHEET,
+    "javascripts": JAVASCRIPT,
+    "htmls": HTML,
+    "webpages": WEBPAGE
+}
+
+# Engines for extracting links from markup.
+# 'soup' builds bs4 tree while 'stream' uses start tags without tree,
+# 'scan' finds start tags within bytes decoding only their attributes.
+ENGINES = ("soup", "stream", "scan")
+
+# Characters that cannot be within valid link.
+INVALID_LINK_CHARACTERS = frozenset("<>^`{|} \n")
+
+# Keys for comparing links when only unique links are allowed.
+# 'raw' compares links as they are, 'absolute' compares absolute links and
+# 'canonical' compares canonical links(see url.canonicalize_url()).
+UNIQUE_KEYS = ("raw", "absolute", "canonical")
+
+# resid(and bs4 within extract module) are imported when first used as 
+# they are slow to import(see benchmarks/imports.py).
+
+# Maximum urls whose guessed information is cached.
+# Cache is shared by all documents within process.
+URL_CACHE_SIZE = 8192
+# Hits and misses of caches about urls.
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses"])
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def guess_url_content_type(url):
+    # Guesses content type of url from its extension.
+    from resid import document
+    return document.URL(url).content_type
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def guess_weburl_content_type(url):
+    # Guesses content type of url considering it html if lacks extension.
+    from resid import document
+    return document.WebURL(url).content_type or ""
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def is_supported_url(url):
+    # Checks if url is valid url(contains scheme and other parts).
+    from resid import document
+    return document.URL(url).supported
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def is_supported_weburl(url):
+    # Checks if url is World Wide Web url(http, https or ftp).
+    from resid import document
+    return document.WebURL(url).supported
+
+def get_categories_flags(categories):
+    # Gets flags for names of categories combined into one.
+    flags = 0
+    for category in categories:
+        if category not in CATEGORIES_FLAGS:
+            err_msg = "Category '{}' is not supported"
+            raise ValueError(err_msg.format(category))
+        flags |= CATEGORIES_FLAGS[category]
+    return flags
+
+def get_url_cache_info():
+    # Gets combined hits and misses of caches about urls.
+    hits = misses = 0
+    for function in (guess_url_content_type, guess_weburl_content_type, 
+    is_supported_url, is_supported_weburl):
+        cache_info = function.cache_info()
+        hits += cache_info.hits
+        misses += cache_info.misses
+    return CacheInfo(hits, misses)
+
+def clear_url_caches():
+    # Clears cached information about urls.
+    guess_url_content_type.cache_clear()
+    guess_weburl_content_type.cache_clear()
+    is_supported_url.cache_clear()
+    is_supported_weburl.cache_clear()
+
+
+def create_link_from_element(element, base_url=None, attrs=None, 
+make_absolute=False, strict=False):
+    # Creates Link object from element(None if element lacks valid link).
+    link, attr_name = extract.get_link_and_attr_from_element(element, attrs)
+    if link:
+        return _create_element_link(element, link, attr_name, base_url, 
+            make_absolute, strict)
+
+def create_links_from_element(element, base_url=None, attrs=None, 
+make_absolute=False, strict=False):
+    # Creates Link objects for all valid links of element.
+    # e.g links of 'src' and each candidate of 'srcset' attribute.
+    links = []
+    for link, attr_name in extract.get_element_links(element, attrs):
+        link_object = _create_element_link(element, link, attr_name, 
+            base_url, make_absolute, strict)
+        if link_object != None:
+            links.append(link_object)
+    return links
+
+def _create_element_link(element, link, attr_name, base_url=None,
+make_absolute=False, strict=False):
+    # Creates Link object for link of element(None if link is not valid).
+    # Link here refers to url not Link instance.
+    tag_type = extract.get_element_attr_value(element, "type")
+    tag_rel = extract.get_element_attr_value(element, "rel")
+    # Creates Link object from collected data.
+    link_object = Link(link, element.name, attr_name, base_url, tag_type, 
+        tag_rel, make_absolute, strict)
+    if link_object.is_valid(False):
+        return link_object
+
+def is_markup(markup):
+    # Checks if markup can be used to create document.
+    return isinstance(markup, (str, bytes, mmap.mmap)) or \
+        hasattr(markup, "read")
+
+def get_tag_names(tag_names=None):
+    # Gets set of lowercase tag names(None means all tag names).
+    if tag_names == None:
+        return None
+    if isinstance(tag_names, str):
+        tag_names = (tag_names,)
+    return frozenset(tag_name.lower() for tag_name in tag_names)
+
+def get_link_key(link, unique_key="raw"):
+    # Gets key for comparing link with other links(see UNIQUE_KEYS).
+    return get_url_key(link.get_link(), link._base_link, unique_key)
+
+def get_url_key(link, base_url=None, unique_key="raw"):
+    # Gets key for comparing link(url) with other links.
+    if unique_key == "raw":
+        return link
+    if base_url != None:
+        absolute_link = url.make_url_absolute(base_url, link)
+    else:
+        absolute_link = link
+    if unique_key == "canonical":
+        return url.canonicalize_url(absolute_link)
+    return absolute_link
+
+def is_valid_link(link):
+    # Checks if link is valid without parsing it(not strict).
+    link = link.lower()
+    if INVALID_LINK_CHARACTERS.intersection(link):
+        return False
+    elif link.startswith("#") or link.startswith("javascript:"):
+        return False
+    else:
+        return True
+
+
 class Link():
     '''Stores link along with other metadata'''
+    # Slots avoid creating dict for each of many Link objects.
+    __slots__ = ("_link", "_raw_link", "_tag_name", "_tag_attr", 
+        "_base_link", "_type", "_rel_attr", "_make_absolute", "_strict",
+        "_content_type", "_valid", "_weblink", "_categories")
+
     def __init__(self, link, tag_name, tag_attr, base_link=None, type=None,
     rel_attr=None, make_absolute=False, strict=False):
         self._link = link
+        self._raw_link = link
         self._tag_name = tag_name
         self._tag_attr = tag_attr
         self._base_link = base_link
@@ -27,30 +249,45 @@ class Link():
         self._make_absolute = make_absolute
         self._strict = strict
 
+        # bs4 returns 'rel' as list since it can contain multiple values.
+        if isinstance(rel_attr, (list, tuple)):
+            self._rel_attr = " ".join(rel_attr)
+
 
         # base_link variable refers to base url of link.
         # link referes to url here not Link instance.
         if self._make_absolute:
             if base_link != None:
-                self._link = urlmod.make_url_absolute(base_link, link)
+                self._link = url.make_url_absolute(base_link, link)
             else:
                 err_msg = "Base url is required to make url absoulute"
                 raise exception.BaseUrlNotExists(err_msg)
 
         
+        # Content type is guessed on first access(see _guess_content_type).
+        self._content_type = None
+        # Results of predicates that are expensive to compute.
+        self._valid = None
+        self._weblink = None
+        self._categories = None
+
+
+    def _guess_content_type(self):
         # Tries to find/guess content type.
         # Content type from html has priority over guessed one.
+        # Raw link is used since link may have been made absolute.
+        link = self._raw_link
         tag_name_lower = self._tag_name.lower()
-        if type:
-            self._content_type = type
-        elif self._rel_attr and self._rel_attr == "stylesheet":
+        if self._type:
+            return self._type
+        elif self._is_rel_stylesheet():
             # Since type not provided then its considered css.
-            self._content_type = "text/css"
-        elif tag_name_lower in TAG_NAMES_CONTENT_TYPES:
+            return "text/css"
+        elif self._get_tag_content_type():
             # Guessed content type is preffered when it follows 
             # content type from tag name.
-            guessed_content_type = document.URL(link).content_type
-            tag_content_type = TAG_NAMES_CONTENT_TYPES[tag_name_lower]
+            guessed_content_type = guess_url_content_type(link)
+            tag_content_type = self._get_tag_content_type()
             if guessed_content_type:
                 if tag_content_type.endswith("/x"):
                     # Checks if first parts of contents are same.
@@ -58,23 +295,38 @@ class Link():
                     guessed_start = guessed_content_type.split("/")[0]
                     tag_start = tag_content_type.split("/")[0]
                     if guessed_start == tag_start:
-                        self._content_type = guessed_content_type
-            # Checks if content type is defined and if not define one.
+                        return guessed_content_type
             # Tag content type is used since guessed did not pass.
-            if not hasattr(self, "_content_type"):
-                self._content_type = tag_content_type
+            return tag_content_type
         elif not self._strict:
             # Content type is now guessed from url since its not strict.
             if self._is_valid(False):
                 # Link without extension will be considered html.
                 # Its important to know if link is valid.
                 #self._content_type = resid.guess_content_type(link)
-                self._content_type = document.WebURL(link).content_type or ""
+                return guess_weburl_content_type(link)
             else:
-                self._content_type = ""
+                return ""
         else:
-            self._content_type = ""
-
+            return ""
+
+    def _get_tag_content_type(self):
+        # Gets content type from tag attribute or tag name of link.
+        if self._tag_attr in TAG_ATTRS_CONTENT_TYPES:
+            return TAG_ATTRS_CONTENT_TYPES[self._tag_attr]
+        return TAG_NAMES_CONTENT_TYPES.get(self._tag_name.lower())
+
+    def _get_content_type(self):
+        # Gets content type guessing it only on first call.
+        if self._content_type == None:
+            self._content_type = self._guess_content_type()
+        return self._content_type
+
+    def _is_rel_stylesheet(self):
+        # Checks if 'rel' attribute contains 'stylesheet'.
+        if self._rel_attr:
+            return "stylesheet" in self._rel_attr.lower().split()
+        return False
 
     def _is_head_resource(self):
         # Checks if link is resource usually loaded in head tag.
@@ -90,10 +342,11 @@ class Link():
 
     def _matches_content_type(self, content_type):
         # Checks if provided content type matches link content type
-        if self._content_type:
+        link_content_type = self._get_content_type()
+        if link_content_type:
             # Content type may be from different places like tag name,
             # tag attributes or guessed from url extension.
-            return self._content_type.startswith(content_type)
+            return link_content_type.startswith(content_type)
         else:
             # Content type is not available(strict may have been enabled)
             return False
@@ -108,25 +361,29 @@ class Link():
 
     def _is_valid(self, strict=True):
         # Checks if link is valid.
-        link = self._link.lower()
         if strict:
             #return resid.is_url(link)
-            return document.URL(link).supported
+            if self._valid == None:
+                self._valid = is_supported_url(self._link.lower())
+            return self._valid
         else:
-            if set("<>^`{|} \n").intersection(link):
-                return False
-            elif link.startswith("#") or link.startswith("javascript:"):
-                return False
-            else:
-                return True
+            return is_valid_link(self._link)
 
     def get_link(self):
         return self._link
 
-    def get_absolute_link():
+    def get_tag_name(self):
+        # Gets name of tag link was found in(e.g 'a', 'img').
+        return self._tag_name
+
+    def get_tag_attr(self):
+        # Gets name of attribute link was found in(e.g 'href', 'srcset').
+        return self._tag_attr
+
+    def get_absolute_link(self):
         # Returns absolute version of link(url).
         if self._base_link != None:
-            return urlmod.make_url_absolute(self._base_link, self._link)
+            return url.make_url_absolute(self._base_link, self._link)
         else:
             err_msg = "Base url is required to make url absoulute"
             raise exception.BaseUrlNotExists(err_msg)
@@ -135,7 +392,9 @@ class Link():
         return self._is_valid(strict)
 
     def is_resource(self):
-        return self._matches_tag_attr("src") or self._is_head_resource()
+        if self._tag_attr and self._tag_attr.lower() in RESOURCE_ATTRS:
+            return True
+        return self._is_head_resource()
 
     def is_hyperlink(self):
         return self._matches_tag_name("a")
@@ -143,13 +402,14 @@ class Link():
     def is_weblink(self):
         # Checks if link is world Wide Web link.
         # Only if link contains http, https or ftp schemes.
-        try:
-            absolute_link = self.get_absolute_link()
-        except exception.BaseUrlNotExists:
-            absolute_link = self._link
-        finally:
+        if self._weblink == None:
+            try:
+                absolute_link = self.get_absolute_link()
+            except exception.BaseUrlNotExists:
+                absolute_link = self._link
             # return resid.is_weburl(self._link)
-            return document.WebURL(absolute_link).supported
+            self._weblink = is_supported_weburl(absolute_link)
+        return self._weblink
 
     def is_script(self):
         if self._matches_tag_name("script"):
@@ -176,8 +436,8 @@ class Link():
     def is_stylesheet(self):
         if self._strict and not self.is_linked():
             return False
-        elif self.self._rel_attr:
-            return self.self._rel_attr.lower() == "stylesheet"
+        elif self._rel_attr:
+            return self._is_rel_stylesheet()
         else:
             return self._matches_content_type("text/css")
 
@@ -197,12 +457,12 @@ class Link():
         if matches_content_type and self._is_head_resource():
             # Avoid matching head resources as html when extension is 
             # missing. This only applies when strict is not enabled.
-            weburl_type = document.URL(self._link).content_type
+            weburl_type = guess_url_content_type(self._link)
             # weburl_type will be html even if it lacks extension.
-            if weburl_type == self._content_type:
+            if weburl_type == self._get_content_type():
                 # Content type may have been guessed from url.
                 # Url may have been made html even if it lacks extension.
-                url_type = document.WebURL(self._link).content_type
+                url_type = guess_weburl_content_type(self._link)
                 # url_type wont be html if it lacks extension.
                 return url_type == "text/html"
         return matches_content_type
@@ -215,10 +475,28 @@ class Link():
         else:
             return self.is_html()
 
+    def get_categories(self):
+        # Gets flags for categories link belongs to(e.g IMAGE | WEBLINK).
+        if self._categories == None:
+            categories = 0
+            for category, method in CATEGORIES.items():
+                if getattr(self, method)():
+                    categories |= CATEGORIES_FLAGS[category]
+            self._categories = categories
+        return self._categories
+
     @property
     def link(self):
         return self._link
 
+    @property
+    def tag_name(self):
+        return self._tag_name
+
+    @property
+    def content_type(self):
+        return self._get_content_type()
+
     @property
     def absolute_link(self):
         return self.get_absolute_link()
@@ -229,20 +507,88 @@ class Link():
     def __repr__(self) -> str:
         output = "surflink.document.Link(link='{}', tag_name='{}', " +\
             "tag_attrs='{}', base_link={})"
-        return output.format(self._link, self._tag_name, self._tag_attrs, 
+        return output.format(self._link, self._tag_name, self._tag_attr, 
         self._base_link)
 
 
 class Links():
     '''Collection of multiple Link objects'''
+    # Stats for recording stages(see stats.Stats), None if disabled.
+    _stats = None
+
     def __init__(self, links) -> None:
         # links: Iterable of links in string or bytes types.
         self._links = links
+        # Flags of categories for each link and indexes of links for each
+        # category flag. Its created when links are first filtered.
+        self._categories_masks = None
+        self._categories_indexes = None
+
+    def _create_categories_index(self):
+        # Classifies each link once storing indexes of links by category.
+        self._categories_masks = array.array("H")
+        self._categories_indexes = {flag: [] for flag in 
+            CATEGORIES_FLAGS.values()}
+        for index, link in enumerate(self._links):
+            categories = link.get_categories()
+            self._categories_masks.append(categories)
+            for flag, indexes in self._categories_indexes.items():
+                if categories & flag:
+                    indexes.append(index)
+
+    def _get_categories_index(self):
+        # Gets masks and indexes of categories creating them if needed.
+        if self._categories_indexes == None or \
+        len(self._categories_masks) != len(self._links):
+            if self._stats != None:
+                cache_info = get_url_cache_info()
+                with self._stats.timer("classify"):
+                    self._create_categories_index()
+                self._stats.add_cache_info("url_cache", cache_info, 
+                    get_url_cache_info())
+                # Links are classified after document reported its stats.
+                self._stats.report()
+            else:
+                self._create_categories_index()
+        return self._categories_masks, self._categories_indexes
+
+    def _get_category_indexes(self, any_of=0, all_of=0, none_of=0):
+        # Gets indexes of links matching category flags.
+        masks, categories_indexes = self._get_categories_index()
+        if any_of in categories_indexes and not (all_of or none_of):
+            # Single category(most common) needs no filtering.
+            return categories_indexes[any_of]
+        if any_of:
+            candidates = set()
+            for flag, indexes in categories_indexes.items():
+                if any_of & flag:
+                    candidates.update(indexes)
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(masks))
+        return [index for index in candidates 
+            if masks[index] & all_of == all_of and not masks[index] & none_of]
+
+    def get_links_by_categories(self, any_of=0, all_of=0, none_of=0):
+        # Gets links matching any of categories, all of categories and 
+        # none of categories(e.g any_of=IMAGE | VIDEO, all_of=WEBLINK).
+        # Names of categories can be converted with get_categories_flags().
+        indexes = self._get_category_indexes(any_of, all_of, none_of)
+        return [self._links[index] for index in indexes]
+
+    def get_categories_masks(self):
+        # Gets categories flags of each link in order of links(classified
+        # once and shared, so should not be modified).
+        masks, _ = self._get_categories_index()
+        return masks
 
     def get_links(self):
         return self._links
 
     def get_raw_links(self):
+        if isinstance(self._links, ColumnarLinks):
+            # Links are already stored as strings(no need for Link).
+            return self._links.get_raw_links()
         return list(map(lambda link:link.get_link(), self._links))
 
     def get_valid_links(self, strict=True):
@@ -252,44 +598,75 @@ class Links():
         return list(map(lambda link:link.absolute_link, self._links))
 
     def get_resources(self):
-        return list(filter(lambda link:link.is_resource(), self._links))
+        return self.get_links_by_categories(RESOURCE)
 
     def get_hyperlinks(self):
-        return list(filter(lambda link:link.is_hyperlink(), self._links))
+        return self.get_links_by_categories(HYPERLINK)
 
     def get_weblinks(self):
-        return list(filter(lambda link:link.is_weblink(), self._links))
+        return self.get_links_by_categories(WEBLINK)
 
     def get_scripts(self):
-        return list(filter(lambda link:link.is_script(), self._links))
+        return self.get_links_by_categories(SCRIPT)
 
     def get_linked(self):
-        return list(filter(lambda link:link.is_linked(), self._links))
+        return self.get_links_by_categories(LINKED)
 
     def get_images(self):
-        return list(filter(lambda link:link.is_image(), self._links))
+        return self.get_links_by_categories(IMAGE)
 
     def get_videos(self):
-        return list(filter(lambda link:link.is_video(), self._links))
+        return self.get_links_by_categories(VIDEO)
 
     def get_audios(self):
-        return list(filter(lambda link:link.is_audio(), self._links))
+        return self.get_links_by_categories(AUDIO)
 
     def get_stylesheets(self):
-        return list(filter(lambda link:link.is_stylesheet(), self._links))
+        return self.get_links_by_categories(STYLESHEET)
 
     def get_javascripts(self):
-        return list(filter(lambda link:link.is_javascript(), self._links))
+        return self.get_links_by_categories(JAVASCRIPT)
 
     def get_htmls(self):
-        return list(filter(lambda link:link.is_html(), self._links))
+        return self.get_links_by_categories(HTML)
 
     def get_webpages(self):
-        return list(filter(lambda link:link.is_webpage(), self._links))
+        return self.get_links_by_categories(WEBPAGE)
+
+    def get_categorized_links(self, categories=None):
+        # Gets links for each of categories classifying links once.
+        # categories: names of categories e.g ['images', 'scripts'].
+        if categories == None:
+            categories = CATEGORIES_FLAGS.keys()
+        # Validates categories before getting their links.
+        get_categories_flags(categories)
+        return {category: self.get_links_by_categories(
+            CATEGORIES_FLAGS[category]) for category in categories}
+
+    def dumps(self):
+        # Converts links into compact bytes(see serialize.dumps_links()).
+        from surflink import serialize
+        return serialize.dumps_links(self)
+
+    @staticmethod
+    def loads(data):
+        # Creates links from bytes of dumps() without copying columns.
+        from surflink import serialize
+        return serialize.loads_links(data)
+
+    def to_arrow(self):
+        # Creates pyarrow table with columns of links(requires pyarrow).
+        from surflink import serialize
+        return serialize.links_to_arrow(self)
+
+    def to_parquet(self, path, **kwargs):
+        # Writes links to parquet file at path(requires pyarrow).
+        from surflink import serialize
+        serialize.write_parquet(self, path, **kwargs)
 
     def __iter__(self):
         return iter(self._links)
-    
+
     def __len__(self):
         return len(self._links)
 
@@ -300,26 +677,212 @@ class Links():
         return str(self.get_raw_links())
 
 
+class ColumnarLinks(Links):
+    '''Collection of links stored in parallel lists(columns)'''
+    # Link objects are created only when accessed(views) and not stored.
+    # Repeating strings like tag names are interned and content types are
+    # stored as codes to content types table.
+    def __init__(self, links=None) -> None:
+        # links: Iterable of Link objects.
+        self._links_column = []
+        self._raw_links = []
+        self._tag_names = []
+        self._tag_attrs = []
+        self._base_links = []
+        self._types = []
+        self._rel_attrs = []
+        # Bits for make_absolute(1) and strict(2) of each link.
+        self._flags = array.array("B")
+        # Codes for content types(-1 if content type was not guessed).
+        self._content_types_codes = array.array("h")
+        self._content_types = []
+        self._content_types_indexes = {}
+        if links != None:
+            for link in links:
+                self.append(link)
+        # Links is iterated through views(Link objects).
+        super().__init__(self)
+
+    @staticmethod
+    def _intern(value):
+        # Interns string to share it with other links.
+        if isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+    def _get_content_type_code(self, content_type):
+        # Gets code for content type adding it to table if not there.
+        if content_type == None:
+            return -1
+        if content_type not in self._content_types_indexes:
+            self._content_types_indexes[content_type] = len(
+                self._content_types)
+            self._content_types.append(content_type)
+        return self._content_types_indexes[content_type]
+
+    def append(self, link):
+        # Adds Link object to columns(Link object is not kept).
+        self._links_column.append(link._link)
+        if link._raw_link is link._link:
+            # Raw link is stored only if link was made absolute.
+            self._raw_links.append(None)
+        else:
+            self._raw_links.append(link._raw_link)
+        self._tag_names.append(self._intern(link._tag_name))
+        self._tag_attrs.append(self._intern(link._tag_attr))
+        self._base_links.append(self._intern(link._base_link))
+        self._types.append(self._intern(link._type))
+        self._rel_attrs.append(self._intern(link._rel_attr))
+        self._flags.append(int(bool(link._make_absolute)) | 
+            (int(bool(link._strict)) << 1))
+        self._content_types_codes.append(
+            self._get_content_type_code(link._content_type))
+
+    def append_raw(self, link, tag_name, tag_attr, base_link=None, type=None,
+    rel_attr=None, raw_link=None, make_absolute=False, strict=False):
+        # Adds link to columns without creating Link object.
+        # raw_link: link before it was made absolute.
+        if isinstance(rel_attr, (list, tuple)):
+            rel_attr = " ".join(rel_attr)
+        self._links_column.append(link)
+        self._raw_links.append(raw_link)
+        self._tag_names.append(self._intern(tag_name))
+        self._tag_attrs.append(self._intern(tag_attr))
+        self._base_links.append(self._intern(base_link))
+        self._types.append(self._intern(type))
+        self._rel_attrs.append(self._intern(rel_attr))
+        self._flags.append(int(bool(make_absolute)) | (int(bool(strict)) << 1))
+        self._content_types_codes.append(-1)
+
+    def _create_link(self, index):
+        # Creates Link object(view) for link at index.
+        flags = self._flags[index]
+        link = Link(self._links_column[index], self._tag_names[index], 
+            self._tag_attrs[index], self._base_links[index], 
+            self._types[index], self._rel_attrs[index], False, 
+            bool(flags & 2))
+        # Link was already made absolute, so its just noted.
+        link._make_absolute = bool(flags & 1)
+        if self._raw_links[index] != None:
+            link._raw_link = self._raw_links[index]
+        code = self._content_types_codes[index]
+        if code != -1:
+            link._content_type = self._content_types[code]
+        return link
+
+    def update_content_types(self):
+        # Guesses content types of links storing them as codes.
+        for index in range(len(self)):
+            if self._content_types_codes[index] == -1:
+                content_type = self._create_link(index)._get_content_type()
+                self._content_types_codes[index] = \
+                    self._get_content_type_code(content_type)
+
+    def get_raw_links(self):
+        return list(self._links_column)
+
+    def get_columns(self):
+        # Gets columns of links as tuple of lists(flags are bytes).
+        # Content types are not included as they are guessed when needed.
+        return (self._links_column, self._raw_links, self._tag_names, 
+            self._tag_attrs, self._base_links, self._types, self._rel_attrs,
+            self._flags.tobytes())
+
+    @classmethod
+    def from_columns(cls, columns):
+        # Creates links from columns returned by get_columns().
+        links = cls()
+        links._links_column = list(columns[0])
+        links._raw_links = list(columns[1])
+        for name, column in zip(("_tag_names", "_tag_attrs", "_base_links",
+        "_types", "_rel_attrs"), columns[2:7]):
+            setattr(links, name, [cls._intern(value) for value in column])
+        links._flags = array.array("B", columns[7])
+        links._content_types_codes = array.array("h", 
+            [-1]) * len(links._links_column)
+        return links
+
+    def get_raw_links_with_tag_names(self):
+        # Gets tuples of links and their tag names.
+        return list(zip(self._links_column, self._tag_names))
+
+    def __iter__(self):
+        return map(self._create_link, range(len(self)))
+
+    def __len__(self):
+        return len(self._links_column)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._create_link(i) for i in range(len(self))[index]]
+        return self._create_link(range(len(self))[index])
+
+
 class Document(Links):
     '''Template for instances containing links from HTML/XML document'''
     def __init__(self, markup, base_url=None, attrs=None, start_tag=None,
-    unique=False, make_absolute=False, strict=False):
+    unique=False, make_absolute=False, strict=False, engine=None,
+    parser=None, columnar=False, unique_key="raw", stats=None, raw=False,
+    tag_names=None, all_links=False, encoding=None, content_type=None,
+    page_url=None):
         # markup: html/xml with links
         # url: url markup originates
         # attr: atributes of elements in markup to extract links.
         # unique: allows only unique links if enabled.
+        # unique_key: key for comparing links('raw', 'absolute', 'canonical').
+        # stats: stats.Stats for recording timings and counts of stages.
+        # engine: engine for extracting links('soup', 'stream', 'scan').
+        # 'stream' is default for raw links while 'soup' for others.
+        # parser: parser for building tree e.g 'lxml' or 'auto'.
+        # columnar: stores links in columns(ColumnarLinks) to save memory.
+        # raw: stores links as found without creating and classifying Link
+        # objects(Link objects are created only if accessed).
+        # tag_names: tag names of elements to extract links from.
+        # all_links: extracts every link of element instead of first one
+        # (attributes default to extract.LINK_ATTRS e.g 'srcset', 'style').
+        # encoding: encoding of bytes markup(sniffed if not provided).
+        # content_type: http content type whose charset is encoding of
+        # bytes markup e.g 'text/html; charset=utf-8'.
+        # page_url: url markup was fetched from, base url if markup has no
+        # base tag(base tag is resolved against it).
         super().__init__(list())
+        if attrs == None and all_links:
+            attrs = extract.LINK_ATTRS
         self._markup = markup # markup containg links(html, xml)
         self._attrs = attrs # attributes to get links
+        self._all_links = all_links
         self._base_url = base_url # url of markup
+        self._page_url = page_url
         self._unique = unique
         self._start_tag = start_tag
         self._make_absolute = make_absolute
         self._strict = strict
+        if engine == None:
+            engine = "stream" if raw else "soup"
+        self._engine = engine
+        self._parser = parser
+        self._columnar = columnar or raw
+        self._raw = raw
+        self._unique_key = unique_key
+        self._tag_names = get_tag_names(tag_names)
+        self._encoding = encoding
+        self._content_type = content_type
+        self._stats = stats
+        # Number of links dropped for being duplicates.
+        self._duplicates_count = 0
+        # Keys of links already added(used if only unique links allowed).
+        self._links_keys = set()
         
-        if not isinstance(markup, (str, bytes)):
-            err_msg = "markup should be 'str' or 'bytes' not '{}'"
-            raise TypeError(err_msg.format(self._markup.__class__.name))
+        if not is_markup(markup):
+            err_msg = "markup should be 'str', 'bytes', 'mmap' or file-like" +\
+                " object not '{}'"
+            raise TypeError(err_msg.format(self._markup.__class__.__name__))
+        if engine not in ENGINES:
+            err_msg = "engine should be one of {} not '{}'"
+            raise ValueError(err_msg.format(ENGINES, engine))
+        if unique_key not in UNIQUE_KEYS:
+            err_msg = "unique_key should be one of {} not '{}'"
+            raise ValueError(err_msg.format(UNIQUE_KEYS, unique_key))
         
         #if url!=None and resid.is_url(url):
         # if url!=None and urlmod.is_url(url):
@@ -329,62 +892,253 @@ class Document(Links):
         # Not recommended to call method within initializer.
         # But promise not to extend these methods.
         # That way there wont be problems unless extended.
-        self._soup = self._create_soup()
-        self._links = self._extract_links()
+        if self._stats == None:
+            self._soup = self._create_soup()
+            self._links = self._extract_links()
+        else:
+            self._extract_links_with_stats()
 
-    def _create_soup(self):
-        # Creates beutufulsoup to parse provided markup
-        return extract.create_soup(self._markup)
+    def _get_parse_only(self):
+        # Gets tag names of elements to build tree for(None for all).
+        # Tree is built for elements of tag names only, base element is
+        # always needed for base url. Scope of start tag needs whole tree
+        # as partial tree ignores end tags of elements outside of it.
+        if self._start_tag == None and self._tag_names != None:
+            return self._tag_names.union(("base",))
 
-    def _extract_links(self):
-        # Creates link object containing links from markup
-        links = []
-        # Setups base url to pass to Link instance
-        base_link = self._get_base_link()
-        if base_link:
-            base_url = base_link.get_link()
-        else:
-            base_url = None
+    def _is_chunked(self):
+        # Checks if markup is parsed in chunks(file-like or buffer markup).
+        return self._engine == "stream" and \
+            stream.is_markup_buffer(self._markup)
+
+    def _create_soup(self):
+        # Creates beutufulsoup to parse provided markup.
+        # Stream engine returns parser with collected elements instead.
+        if self._is_chunked():
+            # Parser is fed with chunks while extracting links.
+            return stream.LinkParser(self._attrs, self._start_tag,
+                self._tag_names)
+        elif self._engine == "stream":
+            return stream.parse(self._markup, self._attrs, self._start_tag,
+                self._tag_names, self._encoding, self._content_type)
+        elif self._engine == "scan":
+            return scan.parse(self._markup, self._attrs, self._start_tag,
+                self._tag_names, self._encoding, self._content_type)
+        markup = self._markup
+        if stream.is_markup_buffer(markup):
+            # Tree cannot be built from chunks, whole markup is read.
+            markup = stream.read_markup(markup)
+        if isinstance(markup, bytes):
+            # Decoding with known or sniffed encoding avoids detecting
+            # encoding by bs4(UnicodeDammit).
+            markup = encodingmodule.decode_markup(markup, self._encoding,
+                self._content_type)
+        return extract.create_soup(markup, self._parser, 
+            self._get_parse_only())
+
+    def _extract_links_with_stats(self):
+        # Extracts links while recording stats of stages.
+        self._stats.increment("documents")
+        if hasattr(self._markup, "__len__"):
+            # Size of file-like markup is not known.
+            self._stats.increment("bytes", len(self._markup))
+        with self._stats.timer("parse"):
+            self._soup = self._create_soup()
+        self._links = self._extract_links()
+        self._stats.increment("links", len(self._links))
+        self._stats.increment("duplicates", self._duplicates_count)
+        self._stats.report()
+
+    def _get_elements(self):
+        # Gets elements containing links from parsed markup.
+        if self._engine != "soup":
+            if self._start_tag != None and not self._soup.start_tag_found:
+                err_msg = "Tag '{}' does not exists"
+                raise exception.TagNotExists(err_msg.format(self._start_tag))
+            # Elements are not kept by parser once links are created.
+            return self._soup.pop_elements()
         # Setups start element to use to get urls from markup
         if self._start_tag != None:
-            start_element = self._soup.find(self._start_tag)
-            if not start_element:
+            start_element = extract.find_element(self._soup, self._start_tag)
+            if start_element == None:
                 err_msg = "Tag '{}' does not exists"
                 raise exception.TagNotExists(err_msg.format(self._start_tag))
         else:
             start_element = self._soup
-        elements = extract.get_elements_with_links(start_element, self._attrs)
-        for element in elements:
-            link = extract.get_link_from_element(element, self._attrs)
-            if link and not (self._unique and link in links):
-                # Duplicate links not allowed if self._unique is True.
-                # Link here refers to url not Link instance.
-                tag_name = element.name
-                attr_name = extract.get_element_attr_by_value(element, link)
-                tag_type = extract.get_element_attr_value(element, "type")
-                tag_rel = extract.get_element_attr_value(element, "rel")
-                # Creates Link object from collected data.
-                link_object = Link(link, tag_name, attr_name, base_url, 
-                tag_type, tag_rel, self._make_absolute, self._strict)
-                if link_object.is_valid(False):
-                    links.append(link_object)
+        return extract.get_elements_with_links(start_element, self._attrs,
+            self._tag_names)
+
+    def _find_base_element(self):
+        # Gets element for base url of markup(base tag).
+        if self._engine != "soup":
+            return self._soup.base_element
+        element = extract.find_element(self._soup, "base")
+        if element and not extract.is_soup(element):
+            # selectolax node is converted for accessing its attributes.
+            return extract.create_element(element)
+        return element
+
+    def _get_base_url(self):
+        # Gets base url to pass to Link instances.
+        base_link = self._get_base_link()
+        if base_link:
+            return base_link.get_link()
+
+    def _is_base_url_known(self):
+        # Checks if base url is known while markup is parsed in chunks.
+        return bool(self._base_url) or self._soup.base_element != None
+
+    def _add_chunked_links(self, links):
+        # Parses markup in chunks adding links after each chunk.
+        # Elements are turned into links as soon as base url is known,
+        # so elements of whole markup are not kept at once.
+        chunks = stream.iter_markup_chunks(self._markup)
+        for chunk in stream.iter_decoded_chunks(chunks, self._encoding,
+        self._content_type):
+            self._soup.feed(chunk)
+            if self._is_base_url_known():
+                self._add_chunk_links(links)
+        self._soup.close()
+        if self._start_tag != None and not self._soup.start_tag_found:
+            err_msg = "Tag '{}' does not exists"
+            raise exception.TagNotExists(err_msg.format(self._start_tag))
+        self._add_chunk_links(links)
+
+    def _add_chunk_links(self, links):
+        # Adds links of elements parsed so far.
+        elements = self._soup.pop_elements()
+        if self._stats != None:
+            self._stats.increment("elements", len(elements))
+        self._add_links(links, elements, self._get_base_url())
+
+    def _extract_links(self):
+        # Creates link object containing links from markup
+        if self._columnar:
+            links = ColumnarLinks()
+        else:
+            links = []
+        if self._is_chunked():
+            if self._stats != None:
+                with self._stats.timer("links"):
+                    self._add_chunked_links(links)
+            else:
+                self._add_chunked_links(links)
+            return links
+        # Setups base url to pass to Link instance
+        base_url = self._get_base_url()
+        if self._stats != None:
+            with self._stats.timer("select"):
+                elements = self._get_elements()
+            self._stats.increment("elements", len(elements))
+            with self._stats.timer("links"):
+                self._add_links(links, elements, base_url)
+        else:
+            self._add_links(links, self._get_elements(), base_url)
         return links
 
+    def _get_element_links(self, element):
+        # Gets links of element along with their attributes names.
+        if self._all_links:
+            return extract.get_element_links(element, self._attrs)
+        link, attr_name = extract.get_link_and_attr_from_element(element, 
+            self._attrs)
+        return [(link, attr_name)] if link else []
+
+    def _create_links(self, element, base_url):
+        # Creates Link objects for links of element.
+        if self._all_links:
+            return create_links_from_element(element, base_url, self._attrs,
+                self._make_absolute, self._strict)
+        link_object = create_link_from_element(element, base_url, 
+            self._attrs, self._make_absolute, self._strict)
+        return [] if link_object == None else [link_object]
+
+    def _add_raw_links(self, links, elements, base_url):
+        # Adds links from elements to columns without Link objects.
+        # Checks are same as of create_link_from_element() but on strings.
+        links_keys = self._links_keys
+        for element in elements:
+            element_links = self._get_element_links(element)
+            if not element_links:
+                continue
+            tag_type = extract.get_element_attr_value(element, "type")
+            tag_rel = extract.get_element_attr_value(element, "rel")
+            for link, attr_name in element_links:
+                raw_link = None
+                if self._make_absolute:
+                    if base_url == None:
+                        err_msg = "Base url is required to make url absoulute"
+                        raise exception.BaseUrlNotExists(err_msg)
+                    raw_link = link
+                    link = url.make_url_absolute(base_url, link)
+                if not is_valid_link(link):
+                    continue
+                if self._unique:
+                    link_key = get_url_key(link, base_url, self._unique_key)
+                    if link_key in links_keys:
+                        self._duplicates_count += 1
+                        continue
+                    links_keys.add(link_key)
+                links.append_raw(link, element.name, attr_name, base_url, 
+                    tag_type, tag_rel, raw_link, self._make_absolute, 
+                    self._strict)
+
+    def _add_links(self, links, elements, base_url):
+        # Adds Link objects created from elements to links.
+        if self._raw:
+            return self._add_raw_links(links, elements, base_url)
+        links_keys = self._links_keys
+        for element in elements:
+            for link_object in self._create_links(element, base_url):
+                if self._unique:
+                    # Duplicate links not allowed if self._unique is True.
+                    link_key = get_link_key(link_object, self._unique_key)
+                    if link_key in links_keys:
+                        self._duplicates_count += 1
+                        continue
+                    links_keys.add(link_key)
+                links.append(link_object)
+
     def _get_base_link(self):
         # Gets base link for markup.
         if self._base_url:
             return Link(self._base_url, "", None)
         else:
-            element = self._soup.find("base")
+            element = self._find_base_element()
             if element:
                 base_url = extract.get_element_attr_value(element, "href")
                 if base_url:
+                    if self._page_url:
+                        base_url = url.make_url_absolute(self._page_url,
+                            base_url)
                     return Link(base_url, "base", None)
+            if self._page_url:
+                return Link(self._page_url, "", None)
 
     def get_base_link(self):
         # Gets base link for document
         return self._get_base_link()
 
+    def get_duplicates_count(self):
+        # Gets number of links dropped for being duplicates.
+        return self._duplicates_count
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        # Creates document from markup in file at path.
+        # File is memory mapped and parsed in chunks by 'stream' engine
+        # (default here) without reading whole file into memory.
+        kwargs.setdefault("engine", "stream")
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty file cannot be memory mapped.
+                return cls(b"", **kwargs)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                doc_object = cls(buf, **kwargs)
+        # Memory map is closed and should not be used by document.
+        doc_object._markup = None
+        return doc_object
+
 
 
 if __name__ == "__main__":
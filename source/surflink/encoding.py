@@ -0,0 +1,131 @@
+import codecs
+import re
+
+
+# Encoding used when markup does not declare one.
+DEFAULT_ENCODING = "utf-8"
+# Encoding of undeclared markup that is not valid utf-8.
+FALLBACK_ENCODING = "windows-1252"
+
+# Number of bytes at start of markup searched for meta charset.
+# Html spec also prescans only first 1024 bytes.
+SNIFF_SIZE = 1024
+
+# Byte order marks and encodings that remove them when decoding.
+# utf-32 marks are checked first as they start with utf-16 marks.
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+)
+
+# Matches charset parameter of http Content-Type header.
+CONTENT_TYPE_CHARSET_PATTERN = re.compile(
+    r"charset\s*=\s*[\"']?\s*([a-zA-Z0-9_:.\-]+)", re.IGNORECASE)
+
+# Encodings whose bytes of markup delimiters('<', '>', quotes) may be part
+# of other characters, their markup cannot be scanned as bytes.
+ASCII_INCOMPATIBLE_PREFIXES = ("utf_16", "utf-16", "utf_32", "utf-32",
+    "utf_7", "utf-7", "iso2022", "iso-2022", "hz")
+
+# Matches charset of meta tag e.g <meta charset="utf-8"> or
+# <meta http-equiv="Content-Type" content="text/html; charset=utf-8">.
+META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]*?charset\s*=\s*[\"']?\s*([a-zA-Z0-9_:.\-]+)", re.IGNORECASE)
+
+
+def lookup_encoding(name):
+    # Gets python name of encoding(None if encoding is not known).
+    if isinstance(name, bytes):
+        name = name.decode("ascii", errors="replace")
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+def normalize_encoding(name):
+    # Gets python name of encoding declared within markup.
+    name = lookup_encoding(name)
+    if name == None:
+        return None
+    # Html spec treats utf-16 declared in meta tag as utf-8 since markup
+    # already read as ascii compatible cannot be utf-16.
+    if name.startswith("utf-16") or name.startswith("utf-32"):
+        return "utf-8"
+    return name
+
+def get_bom_encoding(data):
+    # Gets encoding from byte order mark of data(None if no mark).
+    for bom, name in BOMS:
+        if data.startswith(bom):
+            return name
+
+def get_meta_encoding(data):
+    # Gets encoding declared by meta tag within start of data.
+    match = META_CHARSET_PATTERN.search(data[:SNIFF_SIZE])
+    if match:
+        return normalize_encoding(match.group(1))
+
+def get_content_type_encoding(content_type):
+    # Gets encoding from charset of content type(None if not declared).
+    # e.g 'text/html; charset=ISO-8859-1' gives 'iso8859-1'.
+    if content_type:
+        match = CONTENT_TYPE_CHARSET_PATTERN.search(content_type)
+        if match:
+            return lookup_encoding(match.group(1))
+
+def get_markup_encoding(data, encoding=None, content_type=None):
+    # Gets encoding of markup bytes(None if not known).
+    # Provided encoding is used as it is, otherwise byte order mark, 
+    # charset of content type(http header) and meta tag are checked.
+    # data: start of markup, only first SNIFF_SIZE bytes are needed.
+    if encoding != None:
+        name = lookup_encoding(encoding)
+        if name == None:
+            raise LookupError("unknown encoding: {}".format(encoding))
+        return name
+    return get_bom_encoding(data) or \
+        get_content_type_encoding(content_type) or get_meta_encoding(data)
+
+def sniff_encoding(data, default=DEFAULT_ENCODING):
+    # Gets encoding of markup bytes from byte order mark or meta tag.
+    # data: start of markup, only first SNIFF_SIZE bytes are needed.
+    return get_bom_encoding(data) or get_meta_encoding(data) or default
+
+def is_ascii_compatible(name):
+    # Checks if markup delimiters are same bytes as in ascii and those 
+    # bytes are never part of other characters(e.g not utf-16).
+    name = lookup_encoding(name)
+    if name == None or name.startswith(ASCII_INCOMPATIBLE_PREFIXES):
+        return False
+    return "<a href='/'>".encode(name, "replace") == b"<a href='/'>"
+
+def guess_encoding(data, final=True):
+    # Gets encoding of markup bytes that does not declare one, utf-8 if
+    # data is valid utf-8 otherwise windows-1252.
+    # final: False if data is only start of markup(its last character may
+    # be incomplete).
+    decoder = codecs.getincrementaldecoder(DEFAULT_ENCODING)()
+    try:
+        decoder.decode(data, final)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return DEFAULT_ENCODING
+
+def decode_markup(data, encoding=None, content_type=None):
+    # Decodes markup bytes with encoding of markup.
+    # Markup of unknown encoding is decoded as utf-8 falling back to
+    # windows-1252 if its not valid utf-8.
+    name = get_markup_encoding(data[:SNIFF_SIZE], encoding, content_type)
+    if name != None:
+        return str(data, name, "replace")
+    try:
+        return str(data, DEFAULT_ENCODING)
+    except UnicodeDecodeError:
+        return str(data, FALLBACK_ENCODING, "replace")
+
+
+if __name__ == "__main__":
+    pass
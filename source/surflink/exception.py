@@ -12,4 +12,8 @@ class TagNotExists(NotExistsError):
 
 class BaseUrlNotExists(NotExistsError):
     '''Base url is required but missing'''
-    pass
\ No newline at end of file
+    pass
+
+class ArchiveError(Exception):
+    '''Archive with pages is not in expected format'''
+    pass
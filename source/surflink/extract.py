@@ -1,12 +1,131 @@
-from bs4 import BeautifulSoup
+import importlib.util
+import re
+import sys
 
 
 # Elements attributes to get links
 ATTRS = ("src", "href")
+# Attributes that may contain links, used when all links of elements are
+# extracted(see get_element_links()).
+LINK_ATTRS = ("href", "src", "srcset", "data-src", "data-srcset", 
+    "imagesrcset", "poster", "style")
+# Attributes with comma separated image candidates(url and descriptor).
+SRCSET_ATTRS = ("srcset", "data-srcset", "imagesrcset")
+# Attributes with inline css whose url() functions contain links.
+STYLE_ATTRS = ("style",)
 
-def create_soup(markup):
-    # Creates beutufulsoup to parse provided markup
-    return BeautifulSoup(markup, 'html.parser')
+# Matches url of css url() function(url may be quoted).
+CSS_URL_PATTERN = re.compile(
+    r"""url\(\s*(?:"([^"]*)"|'([^']*)'|([^)"'\s]*))\s*\)""", re.IGNORECASE)
+
+# Parsers for building tree ordered from fastest to slowest.
+# 'selectolax' is C-based(lexbor) parser, others are used through bs4.
+PARSERS = ("selectolax", "lxml", "html.parser", "html5lib")
+# Parsers considered by 'auto' parser(html5lib is slower than others).
+AUTO_PARSERS = ("selectolax", "lxml", "html.parser")
+# Parser used when none is provided, its always available.
+DEFAULT_PARSER = "html.parser"
+
+# Parsers of bs4 that support building tree from part of markup
+# (parse_only argument of BeautifulSoup).
+STRAINER_PARSERS = ("lxml", "html.parser")
+
+# Map containing parsers and modules required by them.
+PARSERS_MODULES = {
+    "selectolax": "selectolax.lexbor",
+    "lxml": "lxml",
+    "html.parser": "html.parser",
+    "html5lib": "html5lib"
+}
+
+
+class Element():
+    '''Lightweight element made of tag name and attributes only'''
+    # Used by engines that do not build tree(e.g stream engine).
+    # It supports bs4 element methods used by functions in this module.
+    __slots__ = ("name", "attrs")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def has_attr(self, attr):
+        return attr in self.attrs
+
+    def __getitem__(self, attr):
+        return self.attrs[attr]
+
+    def __repr__(self):
+        return "surflink.extract.Element(name='{}', attrs={})".format(
+            self.name, self.attrs)
+
+
+def is_parser_available(parser):
+    # Checks if parser is installed and can be used.
+    try:
+        return importlib.util.find_spec(PARSERS_MODULES[parser]) != None
+    except ImportError:
+        return False
+
+def get_available_parsers():
+    # Gets parsers that are installed ordered from fastest.
+    return [parser for parser in PARSERS if is_parser_available(parser)]
+
+def get_parser(parser=None):
+    # Gets name of parser to use for building tree.
+    # 'auto' picks fastest installed parser while missing parser falls
+    # back to default parser.
+    if parser == None:
+        return DEFAULT_PARSER
+    elif parser == "auto":
+        candidates = AUTO_PARSERS
+    elif parser in PARSERS:
+        candidates = (parser, DEFAULT_PARSER)
+    else:
+        err_msg = "parser should be one of {} or 'auto' not '{}'"
+        raise ValueError(err_msg.format(PARSERS, parser))
+    for candidate in candidates:
+        if is_parser_available(candidate):
+            return candidate
+    return DEFAULT_PARSER
+
+def create_soup(markup, parser=None, parse_only=None):
+    # Creates beutufulsoup to parse provided markup.
+    # selectolax parser returns its own tree instead of beutufulsoup.
+    # parse_only: tag names of elements to build tree for(with their
+    # descendants), ignored by parsers that cannot build part of tree.
+    parser = get_parser(parser)
+    if parser == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser(markup)
+    # bs4 is imported when first used as its slow to import.
+    from bs4 import BeautifulSoup, SoupStrainer
+    if parse_only != None and parser in STRAINER_PARSERS:
+        strainer = SoupStrainer(list(parse_only))
+        return BeautifulSoup(markup, parser, parse_only=strainer)
+    return BeautifulSoup(markup, parser)
+
+def is_soup(soup):
+    # Checks if soup(or element) was created by bs4.
+    # Soup cannot exist if bs4 was not yet imported.
+    if "bs4" not in sys.modules:
+        return False
+    from bs4.element import Tag
+    return isinstance(soup, Tag)
+
+def create_element(node):
+    # Creates Element from selectolax node.
+    attrs_dict = {}
+    for key, value in node.attributes.items():
+        # Attributes without values are empty strings like in bs4.
+        attrs_dict[key] = "" if value == None else value
+    return Element(node.tag, attrs_dict)
+
+def find_element(soup, name):
+    # Finds first element with tag name within soup
+    if is_soup(soup):
+        return soup.find(name)
+    return soup.css_first(name)
 
 def get_element_attrs_values(element, attrs):
     # Gets attributes values from bs4 element
@@ -17,16 +136,46 @@ def get_elements_by_name(soup, name):
     return soup.find_all(name)
 
 
-def get_elements_with_links(soup, attrs=None):
+def get_elements_with_links(soup, attrs=None, tag_names=None):
     # Gets elements containing links in their attributes
+    # tag_names: tag names of elements to consider(others are ignored).
     if attrs == None:
         attrs = ATTRS
+    if not is_soup(soup):
+        return get_nodes_with_links(soup, attrs, tag_names)
+    if tag_names != None:
+        # Elements are found by names before their attributes are checked.
+        return [element for element in soup.find_all(list(tag_names))
+            if any(element.has_attr(attr) for attr in attrs)]
     # Creates css pattern to match elements with provided attributes
     # Output: '[href], [src]
     css_pattern = ["[" + attr + "]" for attr in attrs]
     css_pattern = ", ".join(css_pattern)
     return soup.select(css_pattern)
 
+def get_nodes_with_links(tree, attrs=None, tag_names=None):
+    # Gets elements containing links from selectolax tree or node.
+    # Nodes are traversed since selectolax css matches node itself.
+    if attrs == None:
+        attrs = ATTRS
+    if hasattr(tree, "root"):
+        # Tree was provided(whole document is searched).
+        nodes = tree.root.traverse() if tree.root else []
+    else:
+        nodes = tree.traverse()
+        # First node is the one provided which is not its descendant.
+        next(nodes, None)
+    elements = []
+    for node in nodes:
+        if tag_names != None and node.tag not in tag_names:
+            continue
+        node_attrs = node.attributes
+        for attr in attrs:
+            if attr in node_attrs:
+                elements.append(create_element(node))
+                break
+    return elements
+
 def get_links_from_element(element, attrs=None):
     # Gets links from attributes of element.
     # src and href are ones likely to contain links.
@@ -36,11 +185,73 @@ def get_links_from_element(element, attrs=None):
 
 def get_link_from_element(element, attrs=None):
     # gets link from attributes of element
+    return get_link_and_attr_from_element(element, attrs)[0]
+
+def get_link_and_attr_from_element(element, attrs=None):
+    # Gets link from first of attributes element has and name of attribute.
+    # (None, None) is returned if element lacks the attributes.
     if attrs == None:
         attrs = ATTRS
-    links = get_element_attrs_values(element, attrs)
-    if links:
-        return links[0]
+    for attr in attrs:
+        if element.has_attr(attr):
+            return element[attr], attr
+    return None, None
+
+def parse_srcset(value):
+    # Gets urls of image candidates from value of srcset attribute.
+    # e.g 'small.png 1x, large.png 2x' -> ['small.png', 'large.png']
+    # Url ends at whitespace and may contain commas unlike descriptors.
+    urls = []
+    position = 0
+    length = len(value)
+    while position < length:
+        # Skips whitespace and commas before url.
+        while position < length and (value[position].isspace() or 
+        value[position] == ","):
+            position += 1
+        start = position
+        while position < length and not value[position].isspace():
+            position += 1
+        url = value[start:position]
+        if url.endswith(","):
+            # Candidate without descriptors.
+            url = url.rstrip(",")
+        else:
+            # Descriptors of candidate are skipped until next comma.
+            comma_position = value.find(",", position)
+            position = length if comma_position == -1 else comma_position + 1
+        if url:
+            urls.append(url)
+    return urls
+
+def parse_style_urls(value):
+    # Gets urls of url() functions within inline css.
+    urls = []
+    for match in CSS_URL_PATTERN.finditer(value):
+        url = next((group for group in match.groups() if group != None), "")
+        if url.strip():
+            urls.append(url.strip())
+    return urls
+
+def get_element_links(element, attrs=None):
+    # Gets all links of element along with their attributes names.
+    # Srcset attributes give url of each candidate and style attributes
+    # give urls of their url() functions.
+    if attrs == None:
+        attrs = LINK_ATTRS
+    element_attrs = element.attrs
+    links = []
+    for attr in attrs:
+        value = element_attrs.get(attr)
+        if not value:
+            continue
+        if attr in SRCSET_ATTRS:
+            links.extend((url, attr) for url in parse_srcset(value))
+        elif attr in STYLE_ATTRS:
+            links.extend((url, attr) for url in parse_style_urls(value))
+        else:
+            links.append((value, attr))
+    return links
 
 def get_links_from_elements(elements, attrs=None):
     # Gets links from collection of bs4 elements
@@ -0,0 +1,151 @@
+from surflink import document
+from surflink import exception
+from surflink import extract
+from surflink import stream
+from surflink import url
+
+import codecs
+
+
+class LinkFeeder():
+    '''Extracts links from markup fed in chunks(e.g streamed http body)'''
+    # Links are returned as soon as their start tags are complete without
+    # keeping markup or links already returned. Links made absolute are
+    # returned once base url is known(base tag, end of head or start of
+    # body, otherwise end of markup). Base tag after head is ignored as
+    # links before it were already made absolute.
+    def __init__(self, base_url=None, attrs=None, start_tag=None, 
+    unique=False, make_absolute=False, strict=False, unique_key="raw", 
+    encoding="utf-8", tag_names=None, page_url=None):
+        # base_url: url markup originates(overides base tag of markup).
+        # encoding: encoding for decoding bytes chunks.
+        # tag_names: tag names of elements to extract links from.
+        # page_url: url markup was fetched from, base url if markup has no
+        # base tag and base tag is resolved against it(see Document).
+        if unique_key not in document.UNIQUE_KEYS:
+            err_msg = "unique_key should be one of {} not '{}'"
+            raise ValueError(err_msg.format(document.UNIQUE_KEYS, unique_key))
+        self._base_url = base_url
+        self._page_url = page_url
+        self._attrs = attrs
+        self._start_tag = start_tag
+        self._unique = unique
+        self._make_absolute = make_absolute
+        self._strict = strict
+        self._unique_key = unique_key
+        self._parser = stream.LinkParser(attrs, start_tag, 
+            document.get_tag_names(tag_names))
+        # Decoder keeps bytes of characters split across chunks.
+        self._decoder = codecs.getincrementaldecoder(encoding)("replace")
+        self._links_keys = set()
+        self._duplicates_count = 0
+        # Elements waiting for base url to make their links absolute.
+        self._pending_elements = []
+        # Base link once base url is known(later base tag is ignored).
+        self._base_link = None
+        self._base_link_fixed = False
+        self._closed = False
+
+    def _find_base_link(self):
+        # Gets base link from argument, base tag seen so far or page url.
+        if self._base_url:
+            return document.Link(self._base_url, "", None)
+        element = self._parser.base_element
+        if element != None:
+            base_url = extract.get_element_attr_value(element, "href")
+            if base_url:
+                if self._page_url:
+                    base_url = url.make_url_absolute(self._page_url,
+                        base_url)
+                return document.Link(base_url, "base", None)
+        if self._page_url:
+            return document.Link(self._page_url, "", None)
+
+    def _is_base_url_known(self):
+        # Checks if base url is known(base tag may be in later chunk).
+        # Base tag is not expected once head ended or body started.
+        return bool(self._base_url) or self._parser.base_element != None \
+            or self._parser.head_ended or self._closed
+
+    def _get_base_link(self):
+        # Gets base link fixing it once base url is known.
+        if self._base_link_fixed:
+            return self._base_link
+        base_link = self._find_base_link()
+        if self._is_base_url_known():
+            self._base_link = base_link
+            self._base_link_fixed = True
+        return base_link
+
+    def _create_links(self, final=False):
+        # Creates Link objects from elements parsed so far.
+        # Links made absolute wait for base url until markup is closed.
+        elements = self._parser.pop_elements()
+        if self._make_absolute and not final and \
+        not self._is_base_url_known():
+            self._pending_elements.extend(elements)
+            return []
+        if self._pending_elements:
+            elements = self._pending_elements + elements
+            self._pending_elements = []
+        links = []
+        base_link = self._get_base_link()
+        base_url = base_link.get_link() if base_link != None else None
+        for element in elements:
+            link = document.create_link_from_element(element, base_url, 
+                self._attrs, self._make_absolute, self._strict)
+            if link == None:
+                continue
+            if self._unique:
+                link_key = document.get_link_key(link, self._unique_key)
+                if link_key in self._links_keys:
+                    self._duplicates_count += 1
+                    continue
+                self._links_keys.add(link_key)
+            links.append(link)
+        return links
+
+    def feed(self, chunk):
+        # Feeds chunk of markup returning links completed by it.
+        # chunk: part of markup in str or bytes.
+        if self._closed:
+            raise ValueError("Cannot feed closed LinkFeeder")
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._decoder.decode(chunk)
+        self._parser.feed(chunk)
+        return self._create_links()
+
+    def close(self):
+        # Parses remaining markup returning its links.
+        if self._closed:
+            return []
+        self._closed = True
+        self._parser.feed(self._decoder.decode(b"", final=True))
+        self._parser.close()
+        if self._start_tag != None and not self._parser.start_tag_found:
+            err_msg = "Tag '{}' does not exists"
+            raise exception.TagNotExists(err_msg.format(self._start_tag))
+        return self._create_links(final=True)
+
+    def get_base_link(self):
+        # Gets base link seen so far(None if not yet known).
+        return self._get_base_link()
+
+    def get_duplicates_count(self):
+        # Gets number of links dropped for being duplicates.
+        return self._duplicates_count
+
+
+def iter_links(chunks, **kwargs):
+    # Yields links from chunks of markup using LinkFeeder.
+    # kwargs: arguments for creating LinkFeeder.
+    feeder = LinkFeeder(**kwargs)
+    for chunk in chunks:
+        for link in feeder.feed(chunk):
+            yield link
+    for link in feeder.close():
+        yield link
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,220 @@
+from surflink import document
+from surflink import table
+from surflink import url
+
+import collections
+import hashlib
+import math
+import struct
+
+
+# Number of urls expected to be seen and rate of urls wrongly taken as
+# seen, they set size of bloom filter of frontier(about 1.8MB by default,
+# larger crawls should pass BloomFilter with their capacity).
+CAPACITY = 10**6
+ERROR_RATE = 0.001
+# Header of saved bloom filter(magic, bits, hashes and items count).
+BLOOM_HEADER = struct.Struct("<4sQQQ")
+BLOOM_MAGIC = b"SLBF"
+# Arguments of filter_urls() applied as scope of frontier.
+SCOPE_FILTERS = ("schemes", "hostnames", "host_suffixes", "ports",
+    "path_prefixes", "extensions")
+
+
+class BloomFilter():
+    '''Set of strings with fixed memory which may give false positives'''
+    # Items are not stored, only bits at positions of their hashes. Memory
+    # stays the same no matter number of items added but rate of items
+    # wrongly considered added grows beyond error rate after capacity.
+    def __init__(self, capacity=CAPACITY, error_rate=ERROR_RATE):
+        # capacity: number of items expected to be added.
+        # error_rate: rate of false positives once capacity is reached.
+        if capacity <= 0 or not 0 < error_rate < 1:
+            err_msg = "capacity should be positive and error_rate " + \
+                "between 0 and 1 not {} and {}"
+            raise ValueError(err_msg.format(capacity, error_rate))
+        bits_count = math.ceil(-capacity * math.log(error_rate) /
+            math.log(2) ** 2)
+        hashes_count = max(1, round(bits_count / capacity * math.log(2)))
+        self._setup(bits_count, hashes_count)
+
+    def _setup(self, bits_count, hashes_count, bits=None, count=0):
+        self._bits_count = bits_count
+        self._hashes_count = hashes_count
+        if bits == None:
+            bits = bytearray((bits_count + 7) // 8)
+        self._bits = bits
+        self._count = count
+
+    def _get_positions(self, item):
+        # Gets positions of bits for item(double hashing of one digest).
+        digest = hashlib.blake2b(item.encode("utf-8", "surrogatepass"),
+            digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self._bits_count
+            for index in range(self._hashes_count)]
+
+    def add(self, item):
+        # Adds item returning True if it was not added before.
+        bits = self._bits
+        added = False
+        for position in self._get_positions(item):
+            byte_index = position >> 3
+            mask = 1 << (position & 7)
+            if not bits[byte_index] & mask:
+                bits[byte_index] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def get_size(self):
+        # Gets size of bits in bytes.
+        return len(self._bits)
+
+    def save(self, path):
+        # Writes bits and parameters of filter to file at path.
+        with open(path, "wb") as file:
+            file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self._bits_count,
+                self._hashes_count, self._count))
+            file.write(self._bits)
+
+    @classmethod
+    def load(cls, path):
+        # Creates filter from file written by save().
+        with open(path, "rb") as file:
+            header = file.read(BLOOM_HEADER.size)
+            bits = bytearray(file.read())
+        if len(header) != BLOOM_HEADER.size or \
+        header[:len(BLOOM_MAGIC)] != BLOOM_MAGIC:
+            err_msg = "'{}' is not file of saved bloom filter"
+            raise ValueError(err_msg.format(path))
+        _, bits_count, hashes_count, count = BLOOM_HEADER.unpack(header)
+        if len(bits) != (bits_count + 7) // 8:
+            err_msg = "Bits of bloom filter at '{}' are truncated"
+            raise ValueError(err_msg.format(path))
+        bloom_filter = cls.__new__(cls)
+        bloom_filter._setup(bits_count, hashes_count, bits, count)
+        return bloom_filter
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(item))
+
+    def __len__(self):
+        # Gets number of items added(approximate due to false positives).
+        return self._count
+
+
+class Frontier():
+    '''Queues of urls to crawl for each host with urls seen only once'''
+    # Seen urls are kept in bloom filter so its memory does not grow with
+    # urls discovered. Urls out of scope are dropped using same filters as
+    # filter_urls() e.g schemes, host_suffixes.
+    def __init__(self, seen=None, canonical=True, **scope):
+        # seen: BloomFilter of seen urls(e.g BloomFilter.load(path)).
+        # canonical: compares canonical urls(see url.canonicalize_url()).
+        # scope: filters of urls e.g schemes=['https'], host_suffixes.
+        for name in scope:
+            if name not in SCOPE_FILTERS:
+                err_msg = "scope filter should be one of {} not '{}'"
+                raise ValueError(err_msg.format(SCOPE_FILTERS, name))
+        if seen == None:
+            seen = BloomFilter()
+        self._seen = seen
+        self._canonical = canonical
+        self._scope = scope
+        # Queues of hosts with queued urls in order they get urls popped.
+        self._queues = collections.OrderedDict()
+        self._queued_count = 0
+
+    def _get_key(self, url_string):
+        if self._canonical:
+            return url.canonicalize_url(url_string)
+        return url_string
+
+    def _enqueue(self, hostname, url_string):
+        queue = self._queues.get(hostname)
+        if queue == None:
+            queue = self._queues[hostname] = collections.deque()
+        queue.append(url_string)
+        self._queued_count += 1
+
+    def add_urls(self, urls):
+        # Queues urls within scope that were not seen before.
+        # Returns number of urls queued.
+        url_table = table.URLTable(urls)
+        hostnames = url_table.get_column("hostname")
+        queued_count = 0
+        for index in url_table.get_indexes(**self._scope):
+            url_string = url_table[index]
+            if self._seen.add(self._get_key(url_string)):
+                self._enqueue(hostnames[index], url_string)
+                queued_count += 1
+        return queued_count
+
+    def add_links(self, links):
+        # Queues weblinks of Links or Document(links should be absolute).
+        return self.add_urls(link.get_link() for link in links.get_weblinks())
+
+    def add_page(self, page_url, markup, **kwargs):
+        # Extracts weblinks of markup queueing them.
+        # kwargs: arguments for creating document e.g 'attrs'.
+        # Links are based on base tag of page or page url if it has none.
+        kwargs.setdefault("page_url", page_url)
+        kwargs.setdefault("make_absolute", True)
+        kwargs.setdefault("raw", True)
+        return self.add_links(document.Document(markup, **kwargs))
+
+    def mark_seen(self, url_string):
+        # Marks url as seen without queueing it(e.g seed urls crawled).
+        return self._seen.add(self._get_key(url_string))
+
+    def is_seen(self, url_string):
+        return self._get_key(url_string) in self._seen
+
+    def pop(self, hostname=None):
+        # Pops next url taking hosts in turns(or url of hostname).
+        # Raises IndexError if no url is queued.
+        if hostname == None:
+            if not self._queues:
+                raise IndexError("pop from empty frontier")
+            hostname = next(iter(self._queues))
+            # Host goes to end so that other hosts are crawled meanwhile.
+            self._queues.move_to_end(hostname)
+        queue = self._queues.get(hostname)
+        if not queue:
+            err_msg = "No url of host '{}' is queued"
+            raise IndexError(err_msg.format(hostname))
+        url_string = queue.popleft()
+        self._queued_count -= 1
+        if not queue:
+            del self._queues[hostname]
+        return url_string
+
+    def get_hosts(self):
+        # Gets hostnames with queued urls.
+        return list(self._queues)
+
+    def get_host_size(self, hostname):
+        # Gets number of urls queued for hostname.
+        return len(self._queues.get(hostname, ()))
+
+    def get_seen(self):
+        return self._seen
+
+    def save_seen(self, path):
+        # Saves seen urls to load them with BloomFilter.load(path).
+        self._seen.save(path)
+
+    def __len__(self):
+        return self._queued_count
+
+    def __bool__(self):
+        return self._queued_count > 0
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,249 @@
+from surflink import document
+from surflink import url
+
+import array
+import itertools
+
+
+# Keys of urls as nodes of graph(see document.UNIQUE_KEYS).
+NODE_KEYS = ("absolute", "canonical")
+# Edges kept outside of adjacency arrays before they are compacted.
+# Bounds memory of edges added since last query.
+MAX_PENDING_EDGES = 2**20
+
+
+class LinkGraph():
+    '''Graph of links between pages with urls interned to integer ids'''
+    # Edges are stored in compressed sparse rows(CSR), offsets of rows of
+    # pages into arrays of targets and labels(categories flags of links).
+    # Added pages are kept aside and merged into arrays when graph is
+    # queried or pending edges exceed MAX_PENDING_EDGES.
+    def __init__(self, node_key="absolute", any_of=0, **kwargs):
+        # node_key: key of urls as nodes('absolute' or 'canonical').
+        # any_of: adds only links matching any of categories flags
+        # (e.g document.WEBPAGE, 0 adds all links).
+        # kwargs: arguments for creating documents e.g 'attrs'.
+        if node_key not in NODE_KEYS:
+            err_msg = "node_key should be one of {} not '{}'"
+            raise ValueError(err_msg.format(NODE_KEYS, node_key))
+        self._node_key = node_key
+        self._any_of = any_of
+        # Raw documents are faster, links are made absolute by documents
+        # so that they are classified as absolute.
+        kwargs.setdefault("raw", True)
+        kwargs.setdefault("make_absolute", True)
+        self._document_kwargs = kwargs
+        self._ids = {}
+        self._urls = []
+        # Adjacency of pages merged into arrays.
+        self._offsets = array.array("Q", [0])
+        self._targets = array.array("I")
+        self._labels = array.array("H")
+        # Degrees of all nodes including edges not yet merged.
+        self._out_degrees = array.array("I")
+        self._in_degrees = array.array("I")
+        # Targets and labels of pages not yet merged into arrays.
+        self._pending = {}
+        self._pending_edges = 0
+        # Adjacency of reversed edges(created when first needed).
+        self._reverse = None
+
+    def _get_node_url(self, link, base_url=None):
+        # Gets url of link as node making it absolute with base url.
+        if base_url != None:
+            link = url.make_url_absolute(base_url, link)
+        if self._node_key == "canonical":
+            return url.canonicalize_url(link)
+        return link
+
+    def _intern(self, node_url):
+        # Gets id of url adding it as node if not exists.
+        node_id = self._ids.get(node_url)
+        if node_id == None:
+            node_id = self._ids[node_url] = len(self._urls)
+            self._urls.append(node_url)
+            self._out_degrees.append(0)
+            self._in_degrees.append(0)
+        return node_id
+
+    def _get_id(self, page_url):
+        # Gets id of url of page(raises KeyError if not node of graph).
+        node_url = self._get_node_url(page_url)
+        if node_url not in self._ids:
+            err_msg = "'{}' is not node of graph"
+            raise KeyError(err_msg.format(page_url))
+        return self._ids[node_url]
+
+    def _get_row(self, node_id):
+        # Gets targets and labels of node(edges may not be merged).
+        if node_id in self._pending:
+            return self._pending[node_id]
+        if node_id + 1 >= len(self._offsets):
+            return self._targets[:0], self._labels[:0]
+        start = self._offsets[node_id]
+        end = self._offsets[node_id + 1]
+        return self._targets[start:end], self._labels[start:end]
+
+    def _get_labeled_links(self, links):
+        # Gets raw links with their categories flags.
+        masks = links.get_categories_masks()
+        raw_links = links.get_raw_links()
+        if not self._any_of:
+            return zip(raw_links, masks)
+        return ((link, mask) for link, mask in zip(raw_links, masks)
+            if mask & self._any_of)
+
+    def add_links(self, page_url, links, base_url=None):
+        # Adds links of page as its edges replacing edges added before.
+        # links: Links or Document with links of page.
+        # base_url: url relative links are based on(defaults to page_url).
+        source = self._intern(self._get_node_url(page_url))
+        if base_url == None:
+            base_url = page_url
+        # Same target linked many times is one edge with labels combined.
+        edges = {}
+        for link, mask in self._get_labeled_links(links):
+            target = self._intern(self._get_node_url(link, base_url))
+            edges[target] = edges.get(target, 0) | mask
+        self._remove_edges(source)
+        targets = array.array("I", edges.keys())
+        labels = array.array("H", edges.values())
+        for target in targets:
+            self._in_degrees[target] += 1
+        self._out_degrees[source] = len(targets)
+        self._pending[source] = (targets, labels)
+        self._pending_edges += len(targets)
+        self._reverse = None
+        if self._pending_edges > MAX_PENDING_EDGES:
+            self.compact()
+        return source
+
+    def _remove_edges(self, source):
+        # Removes edges of source from degrees of its targets.
+        targets, _ = self._get_row(source)
+        for target in targets:
+            self._in_degrees[target] -= 1
+        if source in self._pending:
+            self._pending_edges -= len(targets)
+        self._out_degrees[source] = 0
+
+    def add_page(self, page_url, markup, **kwargs):
+        # Extracts links of markup adding them as edges of page.
+        # kwargs: arguments for creating document(overides those of graph).
+        # Links are based on base tag of page or page url if it has none.
+        kwargs = dict(self._document_kwargs, **kwargs)
+        kwargs.setdefault("page_url", page_url)
+        doc_object = document.Document(markup, **kwargs)
+        return self.add_links(page_url, doc_object,
+            doc_object.get_base_link().get_link())
+
+    def add_pages(self, pages, **kwargs):
+        # Adds pages from iterable of tuples of page url and markup.
+        for page_url, markup in pages:
+            self.add_page(page_url, markup, **kwargs)
+
+    def compact(self):
+        # Merges pending edges into adjacency arrays.
+        if not self._pending:
+            return
+        old_offsets = self._offsets
+        old_nodes = len(old_offsets) - 1
+        targets = array.array("I")
+        labels = array.array("H")
+        # Rows between pending pages are copied as slices.
+        start = 0
+        for source in sorted(self._pending):
+            if start < old_nodes:
+                end = min(source, old_nodes)
+                targets += self._targets[old_offsets[start]:old_offsets[end]]
+                labels += self._labels[old_offsets[start]:old_offsets[end]]
+            row_targets, row_labels = self._pending[source]
+            targets += row_targets
+            labels += row_labels
+            start = source + 1
+        if start < old_nodes:
+            targets += self._targets[old_offsets[start]:]
+            labels += self._labels[old_offsets[start]:]
+        self._offsets = array.array("Q", itertools.chain((0,),
+            itertools.accumulate(self._out_degrees)))
+        self._targets = targets
+        self._labels = labels
+        self._pending = {}
+        self._pending_edges = 0
+
+    def _get_reverse(self):
+        # Gets offsets, sources and labels of reversed edges.
+        if self._reverse == None:
+            self.compact()
+            offsets = array.array("Q", itertools.chain((0,),
+                itertools.accumulate(self._in_degrees)))
+            positions = offsets[:-1]
+            sources = array.array("I", bytes(4 * len(self._targets)))
+            labels = array.array("H", bytes(2 * len(self._targets)))
+            for source in range(len(self._offsets) - 1):
+                for index in range(self._offsets[source],
+                self._offsets[source + 1]):
+                    target = self._targets[index]
+                    position = positions[target]
+                    sources[position] = source
+                    labels[position] = self._labels[index]
+                    positions[target] = position + 1
+            self._reverse = (offsets, sources, labels)
+        return self._reverse
+
+    def get_id(self, page_url):
+        # Gets id of url(raises KeyError if url is not node).
+        return self._get_id(page_url)
+
+    def get_url(self, node_id):
+        # Gets url of node id.
+        return self._urls[node_id]
+
+    def get_urls(self):
+        # Gets urls of nodes in order of their ids.
+        return self._urls
+
+    def get_out_degree(self, page_url):
+        return self._out_degrees[self._get_id(page_url)]
+
+    def get_in_degree(self, page_url):
+        return self._in_degrees[self._get_id(page_url)]
+
+    def get_edges(self, page_url, any_of=0):
+        # Gets tuples of urls linked by page and their categories flags.
+        targets, labels = self._get_row(self._get_id(page_url))
+        return [(self._urls[target], label) for target, label in
+            zip(targets, labels) if not any_of or label & any_of]
+
+    def get_successors(self, page_url, any_of=0):
+        # Gets urls linked by page(any_of filters by categories flags).
+        return [target for target, _ in self.get_edges(page_url, any_of)]
+
+    def get_predecessors(self, page_url, any_of=0):
+        # Gets urls of pages linking to url.
+        # Reversed edges are created on first call after graph changed.
+        node_id = self._get_id(page_url)
+        offsets, sources, labels = self._get_reverse()
+        start, end = offsets[node_id], offsets[node_id + 1]
+        return [self._urls[source] for source, label in zip(
+            sources[start:end], labels[start:end])
+            if not any_of or label & any_of]
+
+    def get_csr(self):
+        # Gets offsets, targets and labels arrays of merged edges.
+        # Targets of node are targets[offsets[id]:offsets[id + 1]].
+        self.compact()
+        return self._offsets, self._targets, self._labels
+
+    def get_edges_count(self):
+        return sum(self._out_degrees)
+
+    def __contains__(self, page_url):
+        return self._get_node_url(page_url) in self._ids
+
+    def __len__(self):
+        return len(self._urls)
+
+
+if __name__ == "__main__":
+    pass
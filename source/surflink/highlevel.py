@@ -1,5 +1,6 @@
 from surflink import document
-from resid import urlmod
+from surflink import url as urlmodule
+from surflink import table
 
 
 __all__ = [
@@ -7,6 +8,8 @@ __all__ = [
     "filter_valid_urls",
     "filter_urls_by_scheme",
     "filter_urls_by_hostname",
+    "filter_urls",
+    "create_url_table",
 
     "make_url_absoulute",
     "make_urls_absoulute",
@@ -16,6 +19,7 @@ __all__ = [
     "get_urls_from_links",
 
     "extract_urls",
+    "extract_urls_from_file",
     "extract_script_urls",
     "extract_resource_urls",
     "extract_hyperlink_urls",
@@ -29,7 +33,9 @@ __all__ = [
 
     "extract_stylesheet_urls",
     "extract_javascript_urls",
-    "extract_html_urls"
+    "extract_html_urls",
+
+    "extract_categorized_urls"
 ]
 
 
@@ -54,28 +60,41 @@ def filter_valid_urls(urls):
 
 def filter_urls_by_scheme(urls, scheme):
     '''Filters urls by their schemes'''
-    def func(url):
-        return urlmod.extract_scheme(url) == scheme
-    return list(filter(func, urls))
+    return filter_urls(urls, schemes=[scheme])
 
 def filter_urls_by_hostname(urls, hostname):
     '''Filters urls by their hostnames'''
-    def func(url):
-        return urlmod.extract_hostname(url) == hostname
-    return list(filter(func, urls))
+    # Urls without hostname have empty hostname within url table.
+    if hostname == None:
+        hostname = ""
+    return filter_urls(urls, hostnames=[hostname])
+
+def filter_urls(urls, **kwargs):
+    '''Filters urls by multiple parts at once e.g schemes, hostnames,
+    host_suffixes, ports, path_prefixes and extensions. Urls are parsed only
+    once no matter number of filters.'''
+    return create_url_table(urls).filter(**kwargs).get_urls()
+
+def create_url_table(urls):
+    '''Creates table of urls split into columns for filtering many urls'''
+    return table.URLTable(urls)
 
 
 def make_url_absoulute(base_url, url):
     '''Makes url absoulute by joing with its base url'''
-    return urlmod.make_url_absolute(base_url, url)
+    return urlmodule.make_url_absolute(base_url, url)
 
 def make_urls_absoulute(base_url, urls):
     '''Makes urls absoulute by joing them with their base url'''
-    return [make_url_absoulute(base_url, url) for url in urls]
+    # Base url is parsed once for all urls.
+    return urlmodule.BaseResolver(base_url).resolve_many(urls)
 
 
-def create_document(html_markup, **kwargs):
-    '''Creates document containing links from html'''
+def create_document(html_markup, cache=None, **kwargs):
+    '''Creates document containing links from html. Links of repeated 
+    markup are loaded from cache(see cache.DocumentCache) if provided.'''
+    if cache != None:
+        return cache.create_document(html_markup, **kwargs)
     return document.Document(html_markup, **kwargs)
 
 def create_link(url, tag_name, tag_attr, **kwargs):
@@ -87,9 +106,22 @@ def create_links(links):
     return document.Links(links)
 
 
-def extract_urls(html_markup, **kwargs):
-    '''Extracts all urls within markup'''
+def extract_urls(html_markup, with_tag_names=False, **kwargs):
+    '''Extracts all urls within markup. Tuples of urls and their tag names
+    are returned if with_tag_names is True. raw=True extracts urls without
+    creating and classifying Link objects which is faster.'''
     doc_object = create_document(html_markup, **kwargs)
+    if with_tag_names:
+        links = doc_object.get_links()
+        if isinstance(links, document.ColumnarLinks):
+            return links.get_raw_links_with_tag_names()
+        return [(link.get_link(), link.get_tag_name()) for link in links]
+    return doc_object.get_raw_links()
+
+def extract_urls_from_file(path, **kwargs):
+    '''Extracts all urls within markup of file at path. File is parsed in
+    chunks from memory map without reading it into memory.'''
+    doc_object = document.Document.from_file(path, **kwargs)
     return doc_object.get_raw_links()
 
 def extract_script_urls(html_markup, **kwargs):
@@ -107,7 +139,7 @@ def extract_resource_urls(html_markup, **kwargs):
 def extract_hyperlink_urls(html_markup, **kwargs):
     '''Extracts urls that references other webpages('a' tag urls)'''
     doc_object = create_document(html_markup, **kwargs)
-    links = doc_object.get_scripts()
+    links = doc_object.get_hyperlinks()
     return get_urls_from_links(links)
 
 def extract_weblink_urls(html_markup, **kwargs):
@@ -139,7 +171,7 @@ def extract_image_urls(html_markup, **kwargs):
 def extract_audio_urls(html_markup, **kwargs):
     '''Extracts urls for audios.'''
     doc_object = create_document(html_markup, **kwargs)
-    links = doc_object.get_images()
+    links = doc_object.get_audios()
     return get_urls_from_links(links)
 
 def extract_stylesheet_urls(html_markup, **kwargs):
@@ -161,6 +193,16 @@ def extract_html_urls(html_markup, **kwargs):
     return get_urls_from_links(links)
 
 
+def extract_categorized_urls(html_markup, categories=None, **kwargs):
+    '''Extracts urls for multiple categories(e.g 'images', 'scripts') 
+    while parsing markup once. Returns dict mapping category to its urls, 
+    all categories are used if categories not provided.'''
+    doc_object = create_document(html_markup, **kwargs)
+    categorized = doc_object.get_categorized_links(categories)
+    return {category: get_urls_from_links(links) 
+        for category, links in categorized.items()}
+
+
 def extract_base_url(html_markup, **kwargs):
     '''Extracts base url from html'''
     doc_object = create_document(html_markup, **kwargs)
@@ -0,0 +1,197 @@
+from surflink import encoding
+from surflink import stream
+
+import html
+import mmap
+import re
+import string
+
+
+# Patterns are those of html.parser for bytes, so that elements found
+# are same as of 'stream' engine.
+START_TAG_PATTERN = re.compile(rb"""
+  <([a-zA-Z][^\t\n\r\f />\x00]*)    # tag name
+  ((?:[\s/]*                        # whitespace before attribute name
+    (?:(?<=['"\s/])[^\s/>][^\s/=>]* # attribute name
+      (?:\s*=+\s*                   # value indicator
+        (?:'[^']*'                  # single quoted value
+          |"[^"]*"                  # double quoted value
+          |(?!['"])[^>\s]*          # bare value
+         )
+        \s*
+       )?(?:\s|/(?!>))*
+     )*
+   )?
+  \s*)
+""", re.VERBOSE)
+ATTR_PATTERN = re.compile(rb"""((?<=['"\s/])[^\s/>][^\s/=>]*)""" +
+    rb"""(\s*=+\s*('[^']*'|"[^"]*"|(?!['"])[^>\s]*))?(?:\s|/(?!>))*""")
+# Whitespace before first attribute of start tag.
+ATTRS_START_PATTERN = re.compile(rb"(?:\s|/(?!>))*")
+END_TAG_PATTERN = re.compile(rb"</\s*([a-zA-Z][-.a-zA-Z0-9:_]*)\s*>")
+TAG_NAME_PATTERN = re.compile(rb"([a-zA-Z][^\t\n\r\f />\x00]*)")
+COMMENT_CLOSE_PATTERN = re.compile(rb"--\s*>")
+# Bytes after start tag that mean tag is not complete.
+INCOMPLETE_TAG_BYTES = string.ascii_letters.encode("ascii") + b"=/"
+# Elements whose content is text(tags within them are not parsed).
+CDATA_CONTENT_ELEMENTS = ("script", "style")
+
+
+def _create_attrs_pattern(attrs):
+    # Creates pattern finding any of attributes names within start tag.
+    return re.compile(b"|".join(re.escape(attr.encode("ascii"))
+        for attr in attrs), re.IGNORECASE)
+
+def _decode_value(value, encoding_name=None):
+    # Decodes value of attribute replacing character references.
+    # Value of unknown encoding is decoded like encoding.decode_markup().
+    if encoding_name != None:
+        value = str(value, encoding_name, "replace")
+    else:
+        try:
+            value = str(value, encoding.DEFAULT_ENCODING)
+        except UnicodeDecodeError:
+            value = str(value, encoding.FALLBACK_ENCODING, "replace")
+    if "&" in value:
+        return html.unescape(value)
+    return value
+
+def get_attrs(data, start, end, encoding_name):
+    # Gets attributes of start tag within data[start:end] and index where
+    # attributes end. Only names and values of attributes are decoded.
+    # end: index after '>' of start tag.
+    attrs = []
+    start = ATTRS_START_PATTERN.match(data, start, end).end()
+    while start < end:
+        match = ATTR_PATTERN.match(data, start, end)
+        if not match:
+            break
+        name, rest, value = match.group(1, 2, 3)
+        if not rest:
+            value = None
+        else:
+            if value[:1] in (b"'", b'"') and value[:1] == value[-1:]:
+                value = value[1:-1]
+            value = _decode_value(value, encoding_name)
+        attrs.append((str(name, "latin-1").lower(), value))
+        start = match.end()
+    return attrs, start
+
+def _scan_start_tag(data, index, parser, attrs_pattern, encoding_name):
+    # Passes start tag at index to parser returning index after it.
+    match = START_TAG_PATTERN.match(data, index)
+    end = match.end()
+    next_byte = data[end:end + 1]
+    if next_byte == b">":
+        tag_end = end + 1
+    elif data[end:end + 2] == b"/>":
+        tag_end = end + 2
+    elif not next_byte or next_byte in INCOMPLETE_TAG_BYTES:
+        # Incomplete start tag(e.g unclosed quoted value) is text until
+        # next '>' like html.parser does at end of markup.
+        tag_end = data.find(b">", index + 1)
+        return tag_end + 1 if tag_end != -1 else index + 1
+    else:
+        # Start tag not ending with '>' is text(like html.parser).
+        return end
+    tag = str(match.group(1), "latin-1").lower()
+    attrs_start = match.start(2)
+    # Attributes are only parsed if start tag contains name of attributes
+    # with links or if end of start tag matters(base element, elements 
+    # with text content and open elements for start tag).
+    if tag == "base" or tag in CDATA_CONTENT_ELEMENTS or \
+    parser.start_tag != None or \
+    attrs_pattern.search(data, attrs_start, end):
+        # Bytes after attributes(e.g '>') are needed for lookaheads.
+        attrs, attrs_end = get_attrs(data, attrs_start, tag_end,
+            encoding_name)
+        tag_close = data[attrs_end:tag_end].strip()
+        if tag_close not in (b">", b"/>"):
+            # Start tag with unexpected end is text(like html.parser).
+            return tag_end
+    else:
+        attrs, tag_close = [], b">"
+    if tag_close == b"/>":
+        parser.handle_startendtag(tag, attrs)
+        return tag_end
+    parser.handle_starttag(tag, attrs)
+    if tag in CDATA_CONTENT_ELEMENTS:
+        # Content of element is skipped until its end tag.
+        end_pattern = re.compile(rb"</\s*" + tag.encode("ascii") +
+            rb"\s*>", re.IGNORECASE)
+        end_match = end_pattern.search(data, tag_end)
+        if end_match == None:
+            return len(data)
+        parser.handle_endtag(tag)
+        return end_match.end()
+    return tag_end
+
+def _scan_end_tag(data, index, parser):
+    # Passes end tag at index to parser returning index after it.
+    tag_end = data.find(b">", index + 2)
+    if tag_end == -1:
+        return index + 1
+    match = END_TAG_PATTERN.match(data, index, tag_end + 1)
+    if match == None:
+        match = TAG_NAME_PATTERN.match(data, index + 2, tag_end)
+    if match != None:
+        parser.handle_endtag(str(match.group(1), "latin-1").lower())
+    return tag_end + 1
+
+def scan_markup(data, parser, encoding_name):
+    # Scans start and end tags of markup bytes passing them to parser.
+    # Only attributes of start tags with links are decoded.
+    # data: bytes, bytearray or mmap in ascii compatible encoding.
+    # encoding_name: encoding of data(None if not known).
+    attrs_pattern = _create_attrs_pattern(parser.attrs)
+    # End tags only matter to parser for scope of start tag.
+    skip_end_tags = parser.start_tag == None
+    index = data.find(b"<")
+    while index != -1:
+        next_byte = data[index + 1:index + 2]
+        if next_byte.isalpha():
+            index = _scan_start_tag(data, index, parser, attrs_pattern,
+                encoding_name)
+        elif next_byte == b"/" and skip_end_tags:
+            tag_end = data.find(b">", index + 2)
+            index = tag_end + 1 if tag_end != -1 else index + 1
+        elif next_byte == b"/":
+            index = _scan_end_tag(data, index, parser)
+        elif data[index:index + 4] == b"<!--":
+            match = COMMENT_CLOSE_PATTERN.search(data, index + 4)
+            if match:
+                index = match.end()
+            else:
+                # Unclosed comment is text until next '>'.
+                tag_end = data.find(b">", index + 4)
+                index = tag_end + 1 if tag_end != -1 else index + 1
+        elif next_byte in (b"!", b"?"):
+            tag_end = data.find(b">", index + 2)
+            index = tag_end + 1 if tag_end != -1 else index + 1
+        else:
+            index += 1
+        index = data.find(b"<", index)
+    return parser
+
+def parse(markup, attrs=None, start_tag=None, tag_names=None,
+encoding_name=None, content_type=None):
+    # Parses markup bytes without decoding it returning parser with
+    # collected elements(same as stream.parse()).
+    # Markup in string or encoding that is not ascii compatible(e.g utf-16)
+    # is parsed by stream.parse().
+    # Memory map is scanned without reading it(only file-like objects that
+    # are not buffers are read).
+    if hasattr(markup, "read") and not isinstance(markup, mmap.mmap):
+        markup = markup.read()
+    if isinstance(markup, str):
+        return stream.parse(markup, attrs, start_tag, tag_names)
+    name = encoding.get_markup_encoding(markup[:encoding.SNIFF_SIZE],
+        encoding_name, content_type)
+    if name != None and not encoding.is_ascii_compatible(name):
+        return stream.parse(markup, attrs, start_tag, tag_names, name)
+    parser = stream.LinkParser(attrs, start_tag, tag_names)
+    return scan_markup(markup, parser, name)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,242 @@
+from surflink import document
+
+import array
+import struct
+import sys
+
+
+# Header of serialized links(magic, version, links count, strings count
+# and size of strings data).
+HEADER = struct.Struct("<4sIQQQ")
+MAGIC = b"SLNK"
+FORMAT_VERSION = 1
+# Columns of strings in order they are serialized.
+STRING_COLUMNS = ("_links_column", "_raw_links", "_tag_names", "_tag_attrs",
+    "_base_links", "_types", "_rel_attrs")
+# Names of columns of arrow table for columns of strings.
+ARROW_COLUMNS = ("link", "raw_link", "tag_name", "tag_attr", "base_link",
+    "type", "rel_attr")
+# Arrow columns with repeating strings(dictionary encoded).
+DICTIONARY_COLUMNS = ("tag_name", "tag_attr", "base_link", "type",
+    "rel_attr")
+# Sections are aligned so that they can be cast without copying.
+ALIGNMENT = 8
+
+
+def _pad(size):
+    # Gets number of bytes to align size.
+    return -size % ALIGNMENT
+
+def _to_little_endian(array_object):
+    # Converts array to little endian(arrays are native endian).
+    if sys.byteorder != "little":
+        array_object = array.array(array_object.typecode, array_object)
+        array_object.byteswap()
+    return array_object
+
+def _get_columnar_links(links):
+    # Gets links as ColumnarLinks(Link objects are converted).
+    if isinstance(links, document.ColumnarLinks):
+        return links
+    links_objects = links.get_links() if isinstance(links,
+        document.Links) else links
+    if isinstance(links_objects, document.ColumnarLinks):
+        return links_objects
+    return document.ColumnarLinks(links_objects)
+
+def _get_categories_masks(links):
+    # Gets categories flags of links classifying them if needed.
+    if not isinstance(links, document.Links):
+        links = document.Links(list(links))
+    return links.get_categories_masks()
+
+
+def dumps_links(links):
+    # Converts links into bytes that can be loaded without copying.
+    # Strings are stored once in strings table and columns store indexes
+    # to strings(-1 for None).
+    masks = _get_categories_masks(links)
+    columnar_links = _get_columnar_links(links)
+    strings_indexes = {}
+    strings = []
+    columns = []
+    for name in STRING_COLUMNS:
+        column = array.array("i")
+        for value in getattr(columnar_links, name):
+            if value == None:
+                column.append(-1)
+                continue
+            index = strings_indexes.get(value)
+            if index == None:
+                index = strings_indexes[value] = len(strings)
+                strings.append(value.encode("utf-8", "surrogatepass"))
+            column.append(index)
+        columns.append(column)
+    offsets = array.array("Q", [0])
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+    strings_data = b"".join(strings)
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(columnar_links),
+        len(strings), len(strings_data))]
+    parts.append(b"\0" * _pad(HEADER.size))
+    parts.append(_to_little_endian(offsets).tobytes())
+    parts.append(strings_data + b"\0" * _pad(len(strings_data)))
+    for column in columns:
+        data = _to_little_endian(column).tobytes()
+        parts.append(data + b"\0" * _pad(len(data)))
+    data = _to_little_endian(array.array("H", masks)).tobytes()
+    parts.append(data + b"\0" * _pad(len(data)))
+    parts.append(columnar_links._flags.tobytes())
+    return b"".join(parts)
+
+def loads_links(data):
+    # Creates links from bytes returned by dumps_links().
+    # data: bytes, bytearray, mmap or other buffer kept by links.
+    view = memoryview(data).cast("B")
+    if len(view) < HEADER.size or view[:len(MAGIC)] != MAGIC:
+        raise ValueError("data is not serialized links")
+    _, version, count, strings_count, strings_size = HEADER.unpack_from(
+        view)
+    if version != FORMAT_VERSION:
+        err_msg = "Version of serialized links should be {} not {}"
+        raise ValueError(err_msg.format(FORMAT_VERSION, version))
+    position = HEADER.size + _pad(HEADER.size)
+    def take(size, typecode):
+        nonlocal position
+        item_size = struct.calcsize(typecode)
+        section = view[position:position + size * item_size]
+        if len(section) != size * item_size:
+            raise ValueError("Serialized links are truncated")
+        position += size * item_size + _pad(size * item_size)
+        if sys.byteorder != "little" and item_size > 1:
+            # Big endian machines need copy of swapped values.
+            section = array.array(typecode, section.tobytes())
+            section.byteswap()
+            return section
+        return section.cast(typecode)
+    offsets = take(strings_count + 1, "Q")
+    strings_data = take(strings_size, "B")
+    table = StringsTable(offsets, strings_data)
+    columns = [StringColumn(take(count, "i"), table)
+        for _ in STRING_COLUMNS]
+    masks = take(count, "H")
+    flags = take(count, "B")
+    return BufferLinks(columns, masks, flags, data)
+
+def links_to_arrow(links):
+    # Creates pyarrow table with columns of links.
+    # Repeating strings(e.g tag names) are dictionary encoded.
+    try:
+        import pyarrow
+    except ImportError:
+        err_msg = "pyarrow is required for converting links to arrow " + \
+            "(pip install pyarrow)"
+        raise ImportError(err_msg) from None
+    masks = _get_categories_masks(links)
+    columnar_links = _get_columnar_links(links)
+    flags = columnar_links._flags
+    arrays = {}
+    for name, column_name in zip(ARROW_COLUMNS, STRING_COLUMNS):
+        column = pyarrow.array(list(getattr(columnar_links, column_name)),
+            pyarrow.string())
+        if name in DICTIONARY_COLUMNS:
+            column = column.dictionary_encode()
+        arrays[name] = column
+    arrays["make_absolute"] = pyarrow.array([bool(flag & 1)
+        for flag in flags], pyarrow.bool_())
+    arrays["strict"] = pyarrow.array([bool(flag & 2) for flag in flags],
+        pyarrow.bool_())
+    arrays["categories"] = pyarrow.array(list(masks), pyarrow.uint16())
+    return pyarrow.table(arrays)
+
+def write_parquet(links, path, **kwargs):
+    # Writes links to parquet file at path.
+    # kwargs: arguments for pyarrow.parquet.write_table().
+    table = links_to_arrow(links)
+    import pyarrow.parquet
+    pyarrow.parquet.write_table(table, path, **kwargs)
+
+
+class StringsTable():
+    '''Strings stored within buffer decoded when accessed'''
+    def __init__(self, offsets, data):
+        # offsets: offsets of strings into data(one more than strings).
+        self._offsets = offsets
+        self._data = data
+        # Strings already decoded(strings like tag names repeat).
+        self._strings = {}
+
+    def __getitem__(self, index):
+        string = self._strings.get(index)
+        if string == None:
+            string = str(self._data[self._offsets[index]:
+                self._offsets[index + 1]], "utf-8", "surrogatepass")
+            self._strings[index] = string
+        return string
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+class StringColumn():
+    '''Column of strings stored as indexes to strings table'''
+    def __init__(self, indexes, table):
+        self._indexes = indexes
+        self._table = table
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        string_index = self._indexes[index]
+        if string_index == -1:
+            return None
+        return self._table[string_index]
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+class BufferLinks(document.ColumnarLinks):
+    '''Links read from serialized buffer without copying its columns'''
+    # Strings are decoded only when accessed and categories flags are read
+    # from buffer instead of classifying links again. Links cannot be
+    # appended.
+    def __init__(self, columns, masks, flags, data):
+        # columns: StringColumn for each of STRING_COLUMNS.
+        # masks: categories flags of links.
+        # data: buffer columns are read from.
+        super().__init__()
+        self._data = data
+        for name, column in zip(STRING_COLUMNS, columns):
+            setattr(self, name, column)
+        self._masks = masks
+        self._flags = flags
+        self._content_types_codes = array.array("h", [-1]) * len(masks)
+
+    def _create_categories_index(self):
+        # Indexes categories flags read from buffer.
+        self._categories_masks = self._masks
+        self._categories_indexes = {flag: [index for index, mask in
+            enumerate(self._masks) if mask & flag] for flag in
+            document.CATEGORIES_FLAGS.values()}
+
+    def dumps(self):
+        # Buffer already contains serialized links.
+        return bytes(self._data)
+
+    def append(self, link):
+        raise TypeError("Links read from buffer cannot be appended")
+
+    def append_raw(self, *args, **kwargs):
+        raise TypeError("Links read from buffer cannot be appended")
+
+    def __reduce__(self):
+        # Links are pickled as their serialized bytes(e.g sent to process).
+        return (loads_links, (self.dumps(),))
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,121 @@
+import collections
+import time
+
+
+def _get_hit_rate(counts, name):
+    # Gets rate of cache hits within counts(None if cache was not used).
+    hits = counts.get(name + "_hits", 0)
+    total = hits + counts.get(name + "_misses", 0)
+    if total:
+        return hits / total
+
+def _create_dict(timings, counts):
+    # Creates flat dict of timings and counts with hit rates of caches.
+    output = {}
+    for stage, seconds in timings.items():
+        output[stage + "_seconds"] = seconds
+    output.update(counts)
+    cache_names = {name.rpartition("_")[0] for name in counts
+        if name.endswith(("_hits", "_misses"))}
+    for cache_name in cache_names:
+        output.setdefault(cache_name + "_hits", 0)
+        output.setdefault(cache_name + "_misses", 0)
+        output[cache_name + "_hit_rate"] = _get_hit_rate(counts, cache_name)
+    return output
+
+
+class Timer():
+    '''Context manager adding time taken within it to stage of stats'''
+    __slots__ = ("_stats", "_stage", "_start")
+
+    def __init__(self, stats, stage):
+        self._stats = stats
+        self._stage = stage
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._stats.add_time(self._stage, time.perf_counter() - self._start)
+
+
+class Stats():
+    '''Records timings and counts of stages of extracting links'''
+    # Stages are 'parse'(building tree or tokenizing), 'select'(finding
+    # elements with links), 'links'(creating Link objects including making
+    # them absolute) and 'classify'(guessing content types and categories).
+    # Same Stats can be passed to many documents to aggregate them.
+    # Its not thread safe, use Stats for each thread.
+    def __init__(self, callback=None):
+        # callback: called with dict of stats recorded since previous
+        # report when report() is called(after links of document are
+        # extracted and after classifying them). Summing dicts received
+        # gives totals of as_dict().
+        self._callback = callback
+        self._timings = collections.defaultdict(float)
+        self._counts = collections.Counter()
+        # Totals when stats were last reported.
+        self._reported_timings = {}
+        self._reported_counts = collections.Counter()
+
+    def timer(self, stage):
+        # Creates context manager timing stage.
+        return Timer(self, stage)
+
+    def add_time(self, stage, seconds):
+        # Adds time taken by stage.
+        self._timings[stage] += seconds
+
+    def increment(self, name, value=1):
+        # Increments count e.g 'links' or 'bytes'.
+        self._counts[name] += value
+
+    def add_cache_info(self, name, before, after):
+        # Adds hits and misses of lru cache from its cache_info().
+        self._counts[name + "_hits"] += after.hits - before.hits
+        self._counts[name + "_misses"] += after.misses - before.misses
+
+    def get_time(self, stage):
+        return self._timings.get(stage, 0.0)
+
+    def get_count(self, name):
+        return self._counts.get(name, 0)
+
+    def get_hit_rate(self, name):
+        # Gets rate of cache hits(None if cache was not used).
+        return _get_hit_rate(self._counts, name)
+
+    def as_dict(self):
+        # Returns flat dict of stats for exporting(e.g to metrics).
+        return _create_dict(self._timings, self._counts)
+
+    def report(self):
+        # Calls callback with stats recorded since previous report.
+        # Nothing is reported if no stats were recorded since then.
+        if self._callback == None:
+            return
+        timings = {stage: seconds - self._reported_timings.get(stage, 0.0)
+            for stage, seconds in self._timings.items()
+            if seconds != self._reported_timings.get(stage, 0.0)}
+        counts = self._counts - self._reported_counts
+        if not timings and not counts:
+            return
+        self._reported_timings = dict(self._timings)
+        self._reported_counts = collections.Counter(self._counts)
+        self._callback(_create_dict(timings, counts))
+
+    def reset(self):
+        # Clears recorded timings and counts.
+        self._timings.clear()
+        self._counts.clear()
+        self._reported_timings = {}
+        self._reported_counts.clear()
+
+    def __repr__(self):
+        return "surflink.stats.Stats({})".format(self.as_dict())
+
+
+if __name__ == "__main__":
+    pass
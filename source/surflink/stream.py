@@ -0,0 +1,220 @@
+from html.parser import HTMLParser
+
+from surflink import encoding
+from surflink import extract
+
+import codecs
+import itertools
+
+
+# Tags that cannot contain other elements(no end tag expected).
+# Same as those treated as empty elements by bs4.
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer"
+}
+
+
+# Size of chunks for reading markup from files and memory maps.
+CHUNK_SIZE = 64 * 1024
+
+
+def is_markup_buffer(markup):
+    # Checks if markup is file-like object or buffer(e.g mmap).
+    return not isinstance(markup, (str, bytes))
+
+def iter_markup_chunks(markup, chunk_size=CHUNK_SIZE):
+    # Yields chunks of markup from file-like object or buffer.
+    if hasattr(markup, "read"):
+        while True:
+            chunk = markup.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        # Slicing buffer copies only the chunk(mmap pages are not read
+        # until accessed).
+        for start in range(0, len(markup), chunk_size):
+            yield markup[start:start + chunk_size]
+
+def read_markup(markup):
+    # Reads whole markup from file-like object or buffer.
+    if hasattr(markup, "read"):
+        return markup.read()
+    return markup[:]
+
+def iter_decoded_chunks(chunks, encoding_name=None, content_type=None):
+    # Yields decoded chunks using encoding sniffed from first chunk.
+    # encoding_name: encoding of chunks(overides sniffed encoding).
+    # content_type: http content type with charset of chunks.
+    chunks = iter(chunks)
+    first_chunk = next(chunks, "")
+    if isinstance(first_chunk, str):
+        yield first_chunk
+        yield from chunks
+        return
+    name = encoding.get_markup_encoding(first_chunk[:encoding.SNIFF_SIZE],
+        encoding_name, content_type)
+    if name == None:
+        # Undeclared encoding is guessed from first chunk like
+        # encoding.decode_markup() does from whole markup.
+        name = encoding.guess_encoding(first_chunk, final=False)
+    # Decoder keeps bytes of characters split across chunks.
+    decoder = codecs.getincrementaldecoder(name)("replace")
+    for chunk in itertools.chain((first_chunk,), chunks):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+def decode_markup(markup, encoding_name=None, content_type=None):
+    # Decodes bytes markup into string(see encoding.decode_markup()).
+    if isinstance(markup, bytes):
+        return encoding.decode_markup(markup, encoding_name, content_type)
+    return markup
+
+
+class LinkParser(HTMLParser):
+    '''Collects elements with links from start tags without building tree'''
+    def __init__(self, attrs=None, start_tag=None, tag_names=None):
+        # attrs: atributes of elements in markup to extract links.
+        # start_tag: tag name of element to extract links within.
+        # tag_names: tag names of elements to extract links from.
+        super().__init__(convert_charrefs=True)
+        if attrs == None:
+            attrs = extract.ATTRS
+        self._attrs = attrs
+        self._start_tag = start_tag
+        self._tag_names = tag_names
+        self._elements = []
+        self._base_element = None
+        # Names of open elements, only used when start_tag is provided.
+        self._open_tags = []
+        # Index of start tag element within open tags(-1 if not open).
+        self._start_index = -1
+        self._start_tag_found = False
+        # Whether head has ended(base tag is not expected after it).
+        self._head_ended = False
+
+    def _in_scope(self):
+        # Checks if current position is within start tag element.
+        if self._start_tag == None:
+            return True
+        return self._start_index != -1
+
+    def _push_tag(self, tag):
+        # Records element as open, starting scope if its start tag.
+        if self._start_tag == None:
+            return
+        if tag == self._start_tag and not self._start_tag_found:
+            self._start_tag_found = True
+            self._start_index = len(self._open_tags)
+        self._open_tags.append(tag)
+
+    def _pop_tag(self, tag):
+        # Closes element and any element opened after it.
+        # Closing tag without open element is ignored(like bs4).
+        if self._start_tag == None:
+            return
+        for index in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[index] == tag:
+                del self._open_tags[index:]
+                if index <= self._start_index:
+                    self._start_index = -1
+                break
+
+    def _is_wanted(self, tag):
+        # Checks if links of element with tag name are to be extracted.
+        if self._tag_names != None and tag not in self._tag_names:
+            return False
+        return self._in_scope()
+
+    def _handle_element(self, tag, attrs):
+        # Creates element from start tag and keeps it if it has links.
+        # Unwanted elements are skipped before looking at their attributes
+        # unless its base element(needed for base url).
+        is_base = tag == "base" and self._base_element == None
+        is_wanted = self._is_wanted(tag)
+        if not (is_wanted or is_base):
+            return
+        attrs_dict = {}
+        for key, value in attrs:
+            # bs4 uses empty string for attributes without values.
+            attrs_dict[key] = "" if value == None else value
+        element = extract.Element(tag, attrs_dict)
+        if is_base:
+            self._base_element = element
+        if is_wanted:
+            for attr in self._attrs:
+                if attr in attrs_dict:
+                    self._elements.append(element)
+                    break
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self._head_ended = True
+        self._handle_element(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._push_tag(tag)
+        elif tag == self._start_tag:
+            # Void element is found but cannot contain links.
+            self._start_tag_found = True
+
+    def handle_startendtag(self, tag, attrs):
+        self._handle_element(tag, attrs)
+        if tag == self._start_tag:
+            self._start_tag_found = True
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._head_ended = True
+        self._pop_tag(tag)
+
+    def pop_elements(self):
+        # Returns elements collected so far and forgets about them.
+        elements = self._elements
+        self._elements = []
+        return elements
+
+    @property
+    def elements(self):
+        return self._elements
+
+    @property
+    def attrs(self):
+        return self._attrs
+
+    @property
+    def start_tag(self):
+        return self._start_tag
+
+    @property
+    def base_element(self):
+        return self._base_element
+
+    @property
+    def start_tag_found(self):
+        return self._start_tag_found
+
+    @property
+    def head_ended(self):
+        return self._head_ended
+
+
+def parse(markup, attrs=None, start_tag=None, tag_names=None,
+encoding_name=None, content_type=None):
+    # Parses markup returning parser with collected elements.
+    # Markup from file-like object or buffer is parsed in chunks.
+    parser = LinkParser(attrs, start_tag, tag_names)
+    if is_markup_buffer(markup):
+        for chunk in iter_decoded_chunks(iter_markup_chunks(markup),
+        encoding_name, content_type):
+            parser.feed(chunk)
+    else:
+        parser.feed(decode_markup(markup, encoding_name, content_type))
+    parser.close()
+    return parser
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,175 @@
+from urllib import parse
+
+import array
+import sys
+
+
+# Columns of url table in order.
+COLUMNS = ("scheme", "hostname", "port", "path", "query")
+
+
+class URLTable():
+    '''Urls split once into columns(scheme, hostname, port, path, query)'''
+    # Urls are parsed once when added and filters work on columns without
+    # parsing urls again. Schemes and hostnames are interned and filters 
+    # check each distinct scheme or hostname only once.
+    def __init__(self, urls=None):
+        # urls: iterable of urls in string.
+        self._urls = []
+        self._schemes = []
+        self._hostnames = []
+        # Ports of urls(-1 if url lacks port or port is invalid).
+        self._ports = array.array("l")
+        self._paths = []
+        self._queries = []
+        # Hostnames and ports of netlocs seen(netlocs repeat in urls).
+        self._hosts = {}
+        if urls != None:
+            self.extend(urls)
+
+    def append(self, url):
+        # Splits url into columns adding it to table.
+        try:
+            parts = parse.urlsplit(url)
+        except ValueError:
+            # Invalid url(e.g bad ipv6 address) has no parts.
+            parts = parse.SplitResult("", "", "", "", "")
+        host = self._hosts.get(parts.netloc)
+        if host == None:
+            host = self._hosts[parts.netloc] = self._split_netloc(parts)
+        self._urls.append(url)
+        self._schemes.append(sys.intern(parts.scheme))
+        self._hostnames.append(host[0])
+        self._ports.append(host[1])
+        self._paths.append(parts.path)
+        self._queries.append(parts.query)
+
+    @staticmethod
+    def _split_netloc(parts):
+        # Gets hostname and port of url parts.
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        hostname = sys.intern(parts.hostname or "")
+        return hostname, -1 if port == None else port
+
+    def extend(self, urls):
+        for url in urls:
+            self.append(url)
+
+    def _get_column(self, name):
+        # Gets list of values of column.
+        if name not in COLUMNS:
+            err_msg = "Column should be one of {} not '{}'"
+            raise ValueError(err_msg.format(COLUMNS, name))
+        return {
+            "scheme": self._schemes,
+            "hostname": self._hostnames,
+            "port": self._ports,
+            "path": self._paths,
+            "query": self._queries
+        }[name]
+
+    def _take(self, indexes):
+        # Creates table with rows at indexes.
+        table = URLTable()
+        for index in indexes:
+            table._urls.append(self._urls[index])
+            table._schemes.append(self._schemes[index])
+            table._hostnames.append(self._hostnames[index])
+            table._ports.append(self._ports[index])
+            table._paths.append(self._paths[index])
+            table._queries.append(self._queries[index])
+        return table
+
+    @staticmethod
+    def _match_column(column, indexes, predicate):
+        # Gets indexes whose value in column matches predicate.
+        # Result of predicate is cached for each distinct value.
+        results = {}
+        matched = []
+        for index in indexes:
+            value = column[index]
+            result = results.get(value)
+            if result == None:
+                result = results[value] = bool(predicate(value))
+            if result:
+                matched.append(index)
+        return matched
+
+    def get_indexes(self, schemes=None, hostnames=None, host_suffixes=None,
+    ports=None, path_prefixes=None, extensions=None):
+        # Gets indexes of urls matching all provided filters.
+        # host_suffixes: domains whose subdomains match(e.g 'example.com'
+        # matches 'example.com' and 'www.example.com').
+        # extensions: extensions of paths without dot(e.g 'png').
+        indexes = range(len(self))
+        if schemes != None:
+            schemes = set(schemes)
+            indexes = self._match_column(self._schemes, indexes, 
+                schemes.__contains__)
+        if hostnames != None:
+            hostnames = set(hostnames)
+            indexes = self._match_column(self._hostnames, indexes, 
+                hostnames.__contains__)
+        if host_suffixes != None:
+            suffixes = set(host_suffixes)
+            dotted_suffixes = tuple("." + suffix for suffix in suffixes)
+            indexes = self._match_column(self._hostnames, indexes, 
+                lambda hostname: hostname in suffixes or 
+                hostname.endswith(dotted_suffixes))
+        if ports != None:
+            ports = set(ports)
+            indexes = [index for index in indexes 
+                if self._ports[index] in ports]
+        if path_prefixes != None:
+            prefixes = tuple(path_prefixes)
+            indexes = [index for index in indexes 
+                if self._paths[index].startswith(prefixes)]
+        if extensions != None:
+            extensions = tuple("." + extension.lower() 
+                for extension in extensions)
+            indexes = [index for index in indexes 
+                if self._paths[index].lower().endswith(extensions)]
+        return list(indexes)
+
+    def filter(self, **kwargs):
+        # Creates table with urls matching filters(see get_indexes()).
+        return self._take(self.get_indexes(**kwargs))
+
+    def unique(self, columns=COLUMNS):
+        # Creates table without urls having same values for columns.
+        # First url is kept for urls with same values.
+        columns_values = [self._get_column(column) for column in columns]
+        seen = set()
+        indexes = []
+        for index in range(len(self)):
+            key = tuple(values[index] for values in columns_values)
+            if key not in seen:
+                seen.add(key)
+                indexes.append(index)
+        return self._take(indexes)
+
+    def get_urls(self):
+        return list(self._urls)
+
+    def get_column(self, name):
+        # Gets copy of values of column(-1 for missing ports).
+        return list(self._get_column(name))
+
+    def __iter__(self):
+        return iter(self._urls)
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __getitem__(self, index):
+        return self._urls[index]
+
+    def __str__(self):
+        return str(self._urls)
+
+
+if __name__ == "__main__":
+    pass
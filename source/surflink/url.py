@@ -0,0 +1,132 @@
+from urllib import parse
+
+import functools
+import re
+
+
+# Default ports of schemes, they are removed when canonicalizing urls.
+DEFAULT_PORTS = {
+    "http": 80,
+    "https": 443,
+    "ftp": 21,
+    "ws": 80,
+    "wss": 443
+}
+
+# Maximum relative urls cached by each resolver.
+RESOLVER_CACHE_SIZE = 1024
+# Maximum resolvers cached by get_resolver().
+RESOLVERS_CACHE_SIZE = 64
+
+# Matches url starting with scheme followed by '//'(e.g 'https://').
+ABSOLUTE_URL_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+
+
+def canonicalize_url(url):
+    # Creates canonical version of url for comparing urls.
+    # Scheme and hostname are lowercased, default port and fragment are
+    # removed and empty path of url with hostname becomes '/'.
+    try:
+        parts = parse.urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Url with invalid port is left as it is.
+        return url
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if netloc:
+        hostname = parts.hostname or ""
+        if ":" in hostname:
+            # IPv6 address needs brackets within netloc.
+            hostname = "[" + hostname + "]"
+        userinfo = netloc.rpartition("@")[0]
+        netloc = userinfo + "@" + hostname if userinfo else hostname
+        if port != None and DEFAULT_PORTS.get(scheme) != port:
+            netloc += ":" + str(port)
+    path = parts.path
+    if not path and netloc:
+        path = "/"
+    return parse.urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class BaseResolver():
+    '''Makes urls absolute using base url that is parsed only once'''
+    def __init__(self, base_url, cache_size=RESOLVER_CACHE_SIZE):
+        # cache_size: maximum relative urls whose results are cached.
+        self._base_url = base_url
+        parts = parse.urlsplit(base_url)
+        self._scheme = parts.scheme
+        # Fast paths give same urls as urljoin() only for base urls of
+        # hierarchical schemes(e.g not 'mailto:').
+        self._fast = parts.scheme in parse.uses_relative
+        # Origin is None if it cannot be prefixed(e.g 'file:///path').
+        if parts.netloc:
+            self._origin = (parts.scheme + ":" if parts.scheme else "") + \
+                "//" + parts.netloc
+        elif not parts.scheme:
+            self._origin = ""
+        else:
+            self._origin = None
+        self._base_without_query = parse.urlunsplit((parts.scheme, 
+            parts.netloc, parts.path, "", ""))
+        self._base_without_fragment = parse.urlunsplit((parts.scheme, 
+            parts.netloc, parts.path, parts.query, ""))
+        self._resolve_cached = functools.lru_cache(cache_size)(
+            self._resolve)
+
+    def _resolve(self, url):
+        # Makes url absolute the long way(path relative to base url).
+        return parse.urljoin(self._base_url, url)
+
+    def resolve(self, url):
+        # Makes url absolute.
+        # Common cases are handled without parsing url.
+        if ABSOLUTE_URL_PATTERN.match(url):
+            return url
+        elif not self._fast or url.endswith(("?", "#")) or "?#" in url:
+            # Empty query or fragment is dropped when url is joined.
+            return self._resolve_cached(url)
+        elif url.startswith("//"):
+            # Url is missing only scheme.
+            if self._scheme:
+                return self._scheme + ":" + url
+            return url
+        elif url.startswith("/") and self._origin != None:
+            return self._origin + url
+        elif url.startswith("?"):
+            return self._base_without_query + url
+        elif url.startswith("#"):
+            return self._base_without_fragment + url
+        return self._resolve_cached(url)
+
+    def resolve_many(self, urls):
+        # Makes multiple urls absolute.
+        return [self.resolve(url) for url in urls]
+
+    def clear_cache(self):
+        self._resolve_cached.cache_clear()
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    @property
+    def base_url(self):
+        return self._base_url
+
+    def __repr__(self):
+        return "surflink.url.BaseResolver(base_url='{}')".format(
+            self._base_url)
+
+
+@functools.lru_cache(maxsize=RESOLVERS_CACHE_SIZE)
+def get_resolver(base_url):
+    # Gets resolver for base url shared with others using same base url.
+    return BaseResolver(base_url)
+
+def make_url_absolute(base_url, url):
+    # Makes url absolute using resolver for base url.
+    return get_resolver(base_url).resolve(url)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,150 @@
+'''Reading pages of sample archives and extracting their urls with cli.'''
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+import zlib
+
+from surflink import archive
+from surflink import cli
+from surflink import exception
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES_DIR = os.path.join(ROOT_DIR, "samples")
+CORPUS_DIR = os.path.join(ROOT_DIR, "benchmarks", "corpus")
+WARC_PATH = os.path.join(SAMPLES_DIR, "pages.warc.gz")
+JSONL_PATH = os.path.join(SAMPLES_DIR, "pages.jsonl.gz")
+BASE_URL = "https://example.com/"
+CORPUS_URLS = [BASE_URL + name for name in ("blog.html", "docs.html",
+    "news.html")]
+ENCODED_PAGE_URL = BASE_URL + "greek.html"
+
+
+def load_corpus():
+    # Loads markups of corpus pages by their urls within samples.
+    markups = {}
+    for file_name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, file_name), "rb") as file:
+            markups[BASE_URL + file_name] = file.read()
+    return markups
+
+def create_warc(http_response, warc_type="response"):
+    # Creates WARC record with http response.
+    headers = "WARC/1.0\r\nWARC-Type: {}\r\nWARC-Target-URI: {}\r\n" + \
+        "Content-Length: {}\r\n\r\n"
+    return headers.format(warc_type, BASE_URL, len(http_response)).encode(
+        ) + http_response + b"\r\n\r\n"
+
+def create_http_response(body, headers=()):
+    return b"\r\n".join([b"HTTP/1.1 200 OK",
+        b"Content-Type: text/html"] + list(headers)) + b"\r\n\r\n" + body
+
+def run_cli(*args):
+    # Runs cli returning its exit status and output.
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "output")
+        status = cli.main(list(args) + ["-o", path, "-q", "--executor",
+            "thread"])
+        with open(path, encoding="utf-8") as file:
+            return status, file.read()
+
+
+class TestArchiveRecords(unittest.TestCase):
+    def test_warc_records(self):
+        # Request, image and other non html records are skipped.
+        records = list(archive.iter_archive_records(WARC_PATH))
+        self.assertEqual([record.url for record in records],
+            CORPUS_URLS + [ENCODED_PAGE_URL])
+        corpus = load_corpus()
+        # Chunked responses(every second page) are decoded.
+        for record in records[:3]:
+            self.assertEqual(record.markup, corpus[record.url])
+            self.assertEqual(record.content_type, "text/html; charset=utf-8")
+
+    def test_warc_content_encoding(self):
+        record = list(archive.iter_archive_records(WARC_PATH))[-1]
+        self.assertEqual(record.content_type, "text/html; charset=iso-8859-7")
+        self.assertIn("αθήνα".encode("iso-8859-7"), record.markup)
+        body = b"<a href='x'>"
+        for header, data in ((b"gzip", gzip.compress(body)),
+        (b"deflate", zlib.compress(body)),
+        (b"deflate", zlib.compress(body)[2:-4])):
+            response = create_http_response(data,
+                [b"Content-Encoding: " + header])
+            records = list(archive.iter_warc_records(io.BytesIO(create_warc(
+                response))))
+            self.assertEqual(records[0].markup, body)
+
+    def test_warc_errors(self):
+        with self.assertRaises(exception.ArchiveError):
+            list(archive.iter_warc_records(io.BytesIO(b"<html>\r\n")))
+        response = create_http_response(b"not gzip",
+            [b"Content-Encoding: gzip"])
+        with self.assertRaises(exception.ArchiveError):
+            list(archive.iter_warc_records(io.BytesIO(create_warc(response))))
+
+    def test_jsonl_records(self):
+        records = list(archive.iter_archive_records(JSONL_PATH))
+        self.assertEqual([record.url for record in records], CORPUS_URLS)
+        corpus = load_corpus()
+        for record in records:
+            self.assertEqual(record.markup, corpus[record.url].decode())
+            self.assertEqual(record.content_type, None)
+
+    def test_archive_format(self):
+        self.assertEqual(archive.get_archive_format("a.warc.gz"), "warc")
+        self.assertEqual(archive.get_archive_format("a.JSONL"), "jsonl")
+        with self.assertRaises(ValueError):
+            archive.get_archive_format("a.arc")
+
+
+class TestCli(unittest.TestCase):
+    def test_jsonl_output(self):
+        status, output = run_cli(WARC_PATH, "--categories", "images",
+            "--make-absolute")
+        self.assertEqual(status, 0)
+        pages = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([page["url"] for page in pages],
+            CORPUS_URLS + [ENCODED_PAGE_URL])
+        images = {page["url"]: page["categories"]["images"] for page in pages}
+        # Base tag of page is used instead of url of its record.
+        self.assertIn("https://ledger.example.com/static/img/masthead.png",
+            images[BASE_URL + "news.html"])
+        self.assertIn("https://example.com/_images/search-order.svg",
+            images[BASE_URL + "docs.html"])
+        # Charset of content type decodes page without meta charset.
+        self.assertEqual(images[ENCODED_PAGE_URL], [BASE_URL +
+            "img/χάρτης.png"])
+
+    def test_tsv_output(self):
+        status, output = run_cli(JSONL_PATH, "--output-format", "tsv")
+        self.assertEqual(status, 0)
+        rows = [line.split("\t") for line in output.splitlines()]
+        self.assertEqual({row[0] for row in rows}, set(CORPUS_URLS))
+        self.assertIn([BASE_URL + "news.html", "", "static/css/site.css"],
+            rows)
+        status, output = run_cli(JSONL_PATH, "--output-format", "tsv",
+            "--categories", "stylesheets")
+        rows = [line.split("\t") for line in output.splitlines()]
+        self.assertIn([BASE_URL + "news.html", "stylesheets",
+            "static/css/site.css"], rows)
+
+    def test_same_urls_of_formats(self):
+        # Pages of json lines give same urls as those of WARC.
+        _, warc_output = run_cli(WARC_PATH)
+        _, jsonl_output = run_cli(JSONL_PATH)
+        self.assertEqual(warc_output.splitlines()[:3],
+            jsonl_output.splitlines())
+
+    def test_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pages.txt")
+            open(path, "w").close()
+            self.assertEqual(cli.main([path, "-q"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+'''Storing links of documents in cache and loading them back.'''
+import os
+import pickle
+import sqlite3
+import tempfile
+import unittest
+
+from surflink import cache
+from surflink import highlevel
+from surflink import stats
+
+
+MARKUP = '''<html><head><base href="https://example.com/pages/">
+<link rel="stylesheet" href="site.css"></head><body>
+<img src="a.png"><a href="/page">page</a><a href="/page">page</a>
+</body></html>'''
+
+
+def create_markup(number):
+    # Creates markup of distinct page.
+    return '<a href="/page{0}">{0}</a><img src="{0}.png">'.format(number)
+
+
+class TestDocumentCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite")
+
+    def create_cache(self, **kwargs):
+        cache_object = cache.DocumentCache(self.path, **kwargs)
+        self.addCleanup(cache_object.close)
+        return cache_object
+
+    def get_stored_size(self):
+        # Sums sizes of stored entries without total kept by cache.
+        with sqlite3.connect(self.path) as connection:
+            return connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+
+    def test_round_trip(self):
+        cache_object = self.create_cache()
+        for kwargs in ({}, {"make_absolute": True}, {"unique": True}):
+            expected = highlevel.extract_urls(MARKUP, with_tag_names=True,
+                **kwargs)
+            for _ in range(2):
+                self.assertEqual(highlevel.extract_urls(MARKUP,
+                    with_tag_names=True, cache=cache_object, **kwargs),
+                    expected)
+        self.assertEqual(cache_object.get_hit_rate(), 0.5)
+        doc_object = cache_object.create_document(MARKUP)
+        self.assertIsInstance(doc_object, cache.CachedDocument)
+        self.assertEqual(doc_object.get_base_link().get_link(),
+            "https://example.com/pages/")
+        self.assertEqual(doc_object.get_base_link().get_tag_name(), "base")
+        self.assertEqual(doc_object.get_duplicates_count(), 0)
+        self.assertEqual(highlevel.extract_categorized_urls(MARKUP,
+            ["images", "stylesheets"], cache=cache_object),
+            highlevel.extract_categorized_urls(MARKUP,
+            ["images", "stylesheets"]))
+
+    def test_invalidation(self):
+        cache_object = self.create_cache()
+        stats_object = stats.Stats()
+        cache_object.create_document(MARKUP, stats=stats_object)
+        # Changed markup or options are not found.
+        cache_object.create_document(MARKUP + " ", stats=stats_object)
+        cache_object.create_document(MARKUP, make_absolute=True,
+            stats=stats_object)
+        cache_object.create_document(MARKUP, attrs={"href", "src"},
+            stats=stats_object)
+        self.assertEqual(stats_object.get_count("cache_misses"), 4)
+        self.assertEqual(stats_object.get_count("cache_hits"), 0)
+        # Stats do not affect links and order of set does not matter.
+        cache_object.create_document(MARKUP)
+        cache_object.create_document(MARKUP, attrs={"src", "href"},
+            stats=stats_object)
+        self.assertEqual(stats_object.get_count("cache_hits"), 1)
+        self.assertEqual(len(cache_object), 4)
+        # Entries of other format versions are ignored.
+        self.assertEqual(cache.loads_document(b"not links"), None)
+
+    def test_eviction(self):
+        data_size = len(cache.dumps_document(highlevel.create_document(
+            create_markup(0))))
+        cache_object = self.create_cache(max_size=data_size * 3)
+        for number in range(3):
+            cache_object.create_document(create_markup(number))
+        # Page hit recently is kept while least recently used is evicted.
+        cache_object.create_document(create_markup(0))
+        cache_object.create_document(create_markup(3))
+        self.assertEqual(len(cache_object), 3)
+        keys = [cache.get_cache_key(create_markup(number), {}) for number in
+            range(4)]
+        self.assertEqual([cache_object.get(key) != None for key in keys],
+            [True, False, True, True])
+        self.assertLessEqual(cache_object.get_size(), data_size * 3)
+        self.assertEqual(cache_object.get_size(), self.get_stored_size())
+
+    def test_size(self):
+        cache_object = self.create_cache()
+        self.assertEqual(cache_object.get_size(), 0)
+        doc_object = highlevel.create_document(MARKUP)
+        key = cache.get_cache_key(MARKUP, {})
+        # Storing same key again replaces its size.
+        for _ in range(2):
+            cache_object.put(key, doc_object)
+        self.assertEqual(cache_object.get_size(),
+            len(cache.dumps_document(doc_object)))
+        cache_object.create_document(create_markup(0))
+        self.assertEqual(cache_object.get_size(), self.get_stored_size())
+        # Size is kept after reopening cache.
+        cache_object.close()
+        self.assertEqual(self.create_cache().get_size(),
+            self.get_stored_size())
+        cache_object.clear()
+        self.assertEqual(cache_object.get_size(), 0)
+        self.assertEqual(len(cache_object), 0)
+
+    def test_access_times(self):
+        cache_object = self.create_cache()
+        cache_object.create_document(MARKUP)
+        key = cache.get_cache_key(MARKUP, {})
+        with sqlite3.connect(self.path) as connection:
+            query = "SELECT accessed FROM documents WHERE key = ?"
+            stored_time = connection.execute(query, (key,)).fetchone()[0]
+            # Hits are written on closing(not on each lookup).
+            cache_object.get(key)
+            self.assertEqual(connection.execute(query, (key,)).fetchone()[0],
+                stored_time)
+            cache_object.close()
+            self.assertGreater(connection.execute(query,
+                (key,)).fetchone()[0], stored_time)
+
+    def test_pickle(self):
+        cache_object = self.create_cache(max_size=1000)
+        cache_object.create_document(MARKUP)
+        copy = pickle.loads(pickle.dumps(cache_object))
+        self.addCleanup(copy.close)
+        self.assertEqual(copy.get(cache.get_cache_key(MARKUP, {})).get_links(
+            ).get_columns(), cache_object.create_document(MARKUP).get_links(
+            ).get_columns())
+        self.assertEqual(copy._max_size, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+'''Parity of engines and parsers with default engine(bs4 and html.parser).
+
+Links of 'stream' and 'scan' engines should be same as those of tree built
+by bs4 with 'html.parser' on any markup as they follow same rules. Other
+parsers build trees differently on malformed markup, so they are compared
+on pages of benchmarks corpus only.'''
+import os
+import random
+import tempfile
+import unittest
+
+from surflink import extract
+from surflink import highlevel
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "benchmarks", "corpus")
+# Arguments limiting elements being extracted(start tag scope and tag
+# names are applied while parsing).
+SCOPE_KWARGS = ({}, {"start_tag": "head"}, {"start_tag": "body"},
+    {"tag_names": ("a", "link")}, {"start_tag": "body", "tag_names": ("img",)})
+# Malformed markups where engines could disagree.
+MALFORMED_MARKUPS = (
+    '<div><p><a href="1"></div><a href="2"></p>',
+    '<ul><li><a href=1><li><a href=2></ul><a href=3>',
+    '<table><tr><td><a href=1><td><a href=2></tr><a href=3>',
+    '<a href=\'un<a href="t" href="t2">',
+    "<a href='un<b>x<a href=z>",
+    '<!--<a href="1">><a href="2">',
+    '<p><a href="1"></b></p><a href="2">',
+    '<p><a href=1><p><a href=2></p></p><a href=3>',
+    '<script><a href="1"></script><a href="2">',
+    '<style></styl><a href="1"></style><a href="2">',
+    '<a href = "1" ><a\nhref=2><a href=3/><a href="4&amp;5">',
+    '<base href="https://example.com/"><a href="1"><base href="2">',
+    '<a href="1"<a href="2">',
+    '<a href=1 =<a href=2>',
+)
+# Pieces joined randomly to create more malformed markups.
+MARKUP_PIECES = ('<a href="x1">', "<a href='x2'>", '<a href=x3>',
+    '<img src="i">', "'", '"', '<', '>', '</a>', '</p>', '<p>', '<div>',
+    '</div>', '=', ' ', 'href', "<a href='un", '<base href="http://b/">',
+    '<script>', '</script>', '<!--', '-->',
+    '<link href=l rel=stylesheet>', '/', '<li>', '<ul>', '</ul>', 'text',
+    '&amp;', '<style>', '</style>', '<!doctype html>', '<br/>',
+    '<a\nhref=n>', '<a href = "s" >')
+RANDOM_MARKUPS_COUNT = 300
+# Markups without declared encoding(utf-8 or windows-1252 is guessed).
+UNDECLARED_ENCODING_MARKUPS = (b'<a href="/caf\xe9">',
+    '<a href="/café">'.encode("utf-8"),
+    '<meta charset="iso-8859-7"><a href="/\u03b1">'.encode("iso-8859-7"))
+
+
+def load_corpus():
+    # Loads markups of pages in benchmarks corpus.
+    markups = {}
+    for file_name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, file_name), "rb") as file:
+            markups[file_name] = file.read()
+    return markups
+
+def create_random_markups(count, seed=0):
+    # Creates malformed markups from pieces(same for same seed).
+    random_object = random.Random(seed)
+    return [''.join(random_object.choice(MARKUP_PIECES) for _ in
+        range(random_object.randint(1, 25))) for _ in range(count)]
+
+def extract_urls(markup, **kwargs):
+    # Extracts urls with tag names or name of exception raised.
+    try:
+        return highlevel.extract_urls(markup, with_tag_names=True, **kwargs)
+    except Exception as error:
+        return type(error).__name__
+
+
+class TestEngines(unittest.TestCase):
+    def assert_same_urls(self, markup, engine_kwargs, **kwargs):
+        expected = extract_urls(markup, **kwargs)
+        with self.subTest(markup=markup, **engine_kwargs, **kwargs):
+            self.assertEqual(extract_urls(markup, **engine_kwargs, **kwargs),
+                expected)
+
+    def assert_engines_parity(self, markups):
+        # Compares stream and scan engines with default engine.
+        for markup in markups:
+            # Scanner works on bytes(strings are parsed by stream engine).
+            if isinstance(markup, str):
+                markup = markup.encode("utf-8")
+            for kwargs in SCOPE_KWARGS:
+                self.assert_same_urls(markup, {"engine": "stream"}, **kwargs)
+                self.assert_same_urls(markup, {"engine": "scan"}, **kwargs)
+
+    def test_corpus(self):
+        self.assert_engines_parity(load_corpus().values())
+
+    def test_malformed(self):
+        self.assert_engines_parity(MALFORMED_MARKUPS)
+
+    def test_random_malformed(self):
+        markups = create_random_markups(RANDOM_MARKUPS_COUNT)
+        self.assert_engines_parity(markups)
+
+    def test_malformed_start_tag(self):
+        # Partial tree of start tag should not change its scope.
+        markup = '<div><p><a href="1"></div><a href="2"></p>'
+        self.assertEqual(highlevel.extract_urls(markup, start_tag="p"),
+            ["1"])
+        markup = '<ul><li><a href=1><li><a href=2></ul><a href=3>'
+        self.assertEqual(highlevel.extract_urls(markup, start_tag="li"),
+            ["1", "2"])
+
+    def test_from_file(self):
+        # Markup in file is decoded in chunks same as whole markup.
+        markups = list(load_corpus().values())
+        markups.extend(UNDECLARED_ENCODING_MARKUPS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "page.html")
+            for markup in markups:
+                with open(path, "wb") as file:
+                    file.write(markup)
+                expected = highlevel.extract_urls(markup)
+                for engine in ("soup", "stream", "scan"):
+                    with self.subTest(markup=markup[:40], engine=engine):
+                        self.assertEqual(highlevel.extract_urls_from_file(
+                            path, engine=engine), expected)
+
+    def test_parsers_corpus(self):
+        # Parsers build same tree for well formed pages.
+        for parser in extract.get_available_parsers():
+            for markup in load_corpus().values():
+                for kwargs in SCOPE_KWARGS:
+                    self.assert_same_urls(markup, {"parser": parser},
+                        **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
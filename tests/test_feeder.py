@@ -0,0 +1,107 @@
+'''Extracting links from markup fed in chunks.'''
+import unittest
+
+from surflink import feeder
+from surflink import highlevel
+
+
+PAGE_URL = "https://example.com/pages/index.html"
+MARKUP = '''<html><head><title>café</title>
+<link rel="stylesheet" href="site.css"><script src="/app.js"></script>
+</head><body><a href="about">about</a><img src="../logo.png">
+<a href="https://other.example.org/">other</a></body></html>'''
+BASE_MARKUP = MARKUP.replace("<title>",
+    '<base href="/static/"><title>')
+
+
+def split_markup(markup, size):
+    return [markup[index:index + size] for index in range(0,
+        len(markup), size)]
+
+def get_urls(links):
+    return [link.get_link() for link in links]
+
+
+class TestLinkFeeder(unittest.TestCase):
+    def feed(self, chunks, **kwargs):
+        # Feeds chunks returning links returned by each call.
+        feeder_object = feeder.LinkFeeder(**kwargs)
+        results = [get_urls(feeder_object.feed(chunk)) for chunk in chunks]
+        results.append(get_urls(feeder_object.close()))
+        return results
+
+    def test_whole_markup(self):
+        # Links of fed chunks are same as those of whole markup.
+        for markup in (MARKUP, BASE_MARKUP, MARKUP.encode("utf-8")):
+            for kwargs in ({}, {"make_absolute": True, "page_url": PAGE_URL},
+            {"make_absolute": True, "base_url": "https://example.org/"},
+            {"unique": True, "start_tag": "body"}):
+                expected = highlevel.extract_urls(markup, **kwargs)
+                for size in (1, 7, len(markup)):
+                    with self.subTest(markup=markup[:20], size=size,
+                    **kwargs):
+                        results = self.feed(split_markup(markup, size),
+                            **kwargs)
+                        self.assertEqual(sum(results, []), expected)
+
+    def test_head_end(self):
+        # Links made absolute are returned once head ends.
+        chunks = [MARKUP[:MARKUP.index("</head>")],
+            MARKUP[MARKUP.index("</head>"):MARKUP.index("<a")], '<a href="x">',
+            MARKUP[MARKUP.index("<img"):]]
+        results = self.feed(chunks, make_absolute=True, page_url=PAGE_URL)
+        self.assertEqual(results, [[], ["https://example.com/pages/site.css",
+            "https://example.com/app.js"], ["https://example.com/pages/x"],
+            ["https://example.com/logo.png", "https://other.example.org/"],
+            []])
+        # Body started without head closed.
+        results = self.feed(['<link href="a.css"><body>', '<a href="b">'],
+            make_absolute=True, page_url=PAGE_URL)
+        self.assertEqual(results, [["https://example.com/pages/a.css"],
+            ["https://example.com/pages/b"], []])
+
+    def test_base_tag(self):
+        chunks = ['<link href="a.css">', '<base href="/static/">',
+            '<a href="b">']
+        # Base tag is resolved against page url(and is link itself).
+        results = self.feed(chunks, make_absolute=True, page_url=PAGE_URL)
+        self.assertEqual(results, [[], ["https://example.com/static/a.css",
+            "https://example.com/static/"], ["https://example.com/static/b"],
+            []])
+        # Links without base url wait for end of markup.
+        results = self.feed(['<link href="a.css">', '<a href="b">'],
+            make_absolute=True, page_url=PAGE_URL)
+        self.assertEqual(results, [[], [], [
+            "https://example.com/pages/a.css", "https://example.com/pages/b"]])
+        # Base tag after head does not change links already returned.
+        feeder_object = feeder.LinkFeeder(make_absolute=True,
+            page_url=PAGE_URL)
+        self.assertEqual(get_urls(feeder_object.feed(
+            '</head><a href="b">')), ["https://example.com/pages/b"])
+        self.assertEqual(get_urls(feeder_object.feed(
+            '<base href="/static/"><a href="c">')), [
+            "https://example.com/static/", "https://example.com/pages/c"])
+        self.assertEqual(feeder_object.get_base_link().get_link(), PAGE_URL)
+
+    def test_base_url(self):
+        # Base url argument needs no waiting.
+        results = self.feed(['<link href="a.css">', '<base href="/static/">'],
+            make_absolute=True, base_url="https://example.org/")
+        self.assertEqual(results, [["https://example.org/a.css"],
+            ["https://example.org/static/"], []])
+        # Links not made absolute are returned without waiting.
+        results = self.feed(['<link href="a.css">', '<a href="b">'])
+        self.assertEqual(results, [["a.css"], ["b"], []])
+
+    def test_closed(self):
+        feeder_object = feeder.LinkFeeder()
+        feeder_object.close()
+        self.assertEqual(feeder_object.close(), [])
+        with self.assertRaises(ValueError):
+            feeder_object.feed("<a href='x'>")
+        self.assertEqual(get_urls(feeder.iter_links(split_markup(MARKUP, 5),
+            tag_names=("img",))), ["../logo.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
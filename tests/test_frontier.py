@@ -0,0 +1,182 @@
+'''Queueing urls to crawl by hosts and remembering urls seen.'''
+import os
+import tempfile
+import unittest
+
+from surflink import frontier
+from surflink import highlevel
+
+
+URLS = ["https://a.example.com/1", "https://a.example.com/2",
+    "https://b.example.com/1", "http://a.example.com/3",
+    "https://c.example.org/1", "https://a.example.com/4",
+    "https://b.example.com:8443/2.png", "ftp://b.example.com/3",
+    "https://b.example.com/docs/4.html", "mailto:a@example.com",
+    "https://[::1]/5", "https://b.example.com/2"]
+# Scopes applied same as filters of filter_urls().
+SCOPES = ({}, {"schemes": ["https"]}, {"host_suffixes": ["example.com"]},
+    {"hostnames": ["b.example.com"], "ports": [8443]},
+    {"path_prefixes": ["/docs"]}, {"extensions": ["png", "html"]},
+    {"schemes": ["https", "http"], "host_suffixes": ["a.example.com"]})
+
+
+def pop_all(frontier_object):
+    return [frontier_object.pop() for _ in range(len(frontier_object))]
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_add(self):
+        bloom_filter = frontier.BloomFilter(capacity=1000)
+        self.assertTrue(bloom_filter.add("https://example.com/"))
+        self.assertFalse(bloom_filter.add("https://example.com/"))
+        self.assertIn("https://example.com/", bloom_filter)
+        self.assertNotIn("https://example.com/other", bloom_filter)
+        self.assertEqual(len(bloom_filter), 1)
+
+    def test_error_rate(self):
+        bloom_filter = frontier.BloomFilter(capacity=2000, error_rate=0.01)
+        for number in range(2000):
+            bloom_filter.add("https://example.com/{}".format(number))
+        false_positives = sum("https://example.org/{}".format(number) in
+            bloom_filter for number in range(2000))
+        # Some margin over error rate as hashes are random.
+        self.assertLess(false_positives, 2000 * 0.01 * 2)
+
+    def test_invalid(self):
+        for kwargs in ({"capacity": 0}, {"error_rate": 0},
+        {"error_rate": 1}):
+            with self.assertRaises(ValueError):
+                frontier.BloomFilter(**kwargs)
+
+    def test_default_size(self):
+        # Default filter stays within few megabytes.
+        self.assertLess(frontier.BloomFilter().get_size(), 2 * 2**20)
+
+    def test_save_load(self):
+        bloom_filter = frontier.BloomFilter(capacity=100)
+        for url_string in URLS:
+            bloom_filter.add(url_string)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "seen.bloom")
+            bloom_filter.save(path)
+            loaded = frontier.BloomFilter.load(path)
+            self.assertEqual(len(loaded), len(bloom_filter))
+            self.assertEqual(loaded.get_size(), bloom_filter.get_size())
+            for url_string in URLS:
+                self.assertIn(url_string, loaded)
+            self.assertFalse(loaded.add(URLS[0]))
+            # Truncated file or file of other format is not loaded.
+            with open(path, "rb") as file:
+                data = file.read()
+            for invalid_data, message in ((data[:-1], "truncated"),
+            (data[:frontier.BLOOM_HEADER.size - 1], "not file"),
+            (b"ABCD" + data[4:], "not file")):
+                with open(path, "wb") as file:
+                    file.write(invalid_data)
+                with self.assertRaisesRegex(ValueError, message):
+                    frontier.BloomFilter.load(path)
+
+
+class TestFrontier(unittest.TestCase):
+    def create_frontier(self, **kwargs):
+        return frontier.Frontier(frontier.BloomFilter(capacity=1000),
+            **kwargs)
+
+    def test_round_robin(self):
+        frontier_object = self.create_frontier()
+        urls = [url_string for url_string in URLS if
+            url_string.startswith("https://") and "[" not in url_string]
+        self.assertEqual(frontier_object.add_urls(urls), len(urls))
+        self.assertEqual(frontier_object.get_hosts(), ["a.example.com",
+            "b.example.com", "c.example.org"])
+        self.assertEqual(frontier_object.get_host_size("a.example.com"), 3)
+        # Hosts take turns in order they were first queued.
+        self.assertEqual(pop_all(frontier_object), [
+            "https://a.example.com/1", "https://b.example.com/1",
+            "https://c.example.org/1", "https://a.example.com/2",
+            "https://b.example.com:8443/2.png", "https://a.example.com/4",
+            "https://b.example.com/docs/4.html", "https://b.example.com/2"])
+        self.assertFalse(frontier_object)
+        # Host queued again after its urls were popped goes last.
+        frontier_object = self.create_frontier()
+        frontier_object.add_urls(URLS[:3])
+        self.assertEqual(frontier_object.pop(), URLS[0])
+        frontier_object.add_urls(["https://c.example.org/2"])
+        self.assertEqual(pop_all(frontier_object), [URLS[2], URLS[1],
+            "https://c.example.org/2"])
+
+    def test_scope(self):
+        for scope in SCOPES:
+            with self.subTest(**scope):
+                frontier_object = self.create_frontier(**scope)
+                frontier_object.add_urls(URLS)
+                self.assertEqual(sorted(pop_all(frontier_object)),
+                    sorted(highlevel.filter_urls(URLS, **scope)))
+        with self.assertRaises(ValueError):
+            frontier.Frontier(hosts=["example.com"])
+
+    def test_seen(self):
+        frontier_object = self.create_frontier()
+        self.assertEqual(frontier_object.add_urls(URLS[:2]), 2)
+        self.assertEqual(frontier_object.add_urls(URLS[:3]), 1)
+        # Popped urls stay seen.
+        pop_all(frontier_object)
+        self.assertEqual(frontier_object.add_urls(URLS[:3]), 0)
+        self.assertFalse(frontier_object.mark_seen(URLS[0]))
+        self.assertTrue(frontier_object.mark_seen("https://d.example.com/"))
+        self.assertTrue(frontier_object.is_seen("https://d.example.com/"))
+        self.assertEqual(frontier_object.add_urls(["https://d.example.com/"]),
+            0)
+
+    def test_canonical(self):
+        urls = ["https://Example.com", "HTTPS://example.com:443/",
+            "https://example.com/#top", "https://example.com/a",
+            "https://example.com/a#b"]
+        frontier_object = self.create_frontier()
+        self.assertEqual(frontier_object.add_urls(urls), 2)
+        # First seen form of url is queued.
+        self.assertEqual(pop_all(frontier_object), ["https://Example.com",
+            "https://example.com/a"])
+        frontier_object = self.create_frontier(canonical=False)
+        self.assertEqual(frontier_object.add_urls(urls), len(urls))
+
+    def test_pop(self):
+        frontier_object = self.create_frontier()
+        with self.assertRaisesRegex(IndexError, "empty"):
+            frontier_object.pop()
+        frontier_object.add_urls(URLS[:3])
+        self.assertEqual(frontier_object.pop("b.example.com"), URLS[2])
+        # Host without queued urls(or never queued) raises error.
+        for hostname in ("b.example.com", "d.example.com"):
+            with self.assertRaisesRegex(IndexError, hostname):
+                frontier_object.pop(hostname)
+        self.assertEqual(frontier_object.get_hosts(), ["a.example.com"])
+        self.assertEqual(len(frontier_object), 2)
+
+    def test_add_page(self):
+        markup = '''<html><head><link rel="stylesheet" href="site.css">
+        </head><body><a href="/about">about</a><a href="#top">top</a>
+        <a href="https://other.example.org/">other</a>
+        <a href="mailto:a@example.com">mail</a></body></html>'''
+        frontier_object = self.create_frontier(
+            host_suffixes=["example.com"])
+        frontier_object.mark_seen("https://example.com/pages/")
+        frontier_object.add_page("https://example.com/pages/", markup)
+        # Links are resolved against page url and page itself is seen.
+        self.assertEqual(pop_all(frontier_object), [
+            "https://example.com/pages/site.css",
+            "https://example.com/about"])
+
+    def test_save_seen(self):
+        frontier_object = self.create_frontier()
+        frontier_object.add_urls(URLS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "seen.bloom")
+            frontier_object.save_seen(path)
+            resumed = frontier.Frontier(frontier.BloomFilter.load(path))
+        self.assertEqual(resumed.add_urls(URLS + ["https://d.example.com/"]),
+            1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+'''Graph of links between pages stored as compressed sparse rows.'''
+import unittest
+from unittest import mock
+
+from surflink import document
+from surflink import graph
+from surflink import highlevel
+
+
+HOME_URL = "https://example.com/"
+HOME_MARKUP = '''<html><head><link rel="stylesheet" href="site.css">
+</head><body><a href="/about">about</a><a href="about">about</a>
+<img src="logo.png"><a href="https://other.example.org/">other</a>
+</body></html>'''
+ABOUT_URL = "https://example.com/about"
+ABOUT_MARKUP = '''<html><head><base href="https://example.com/pages/">
+</head><body><a href="/">home</a><img src="../logo.png">
+<a href="team">team</a></body></html>'''
+
+
+def get_rows(graph_object):
+    # Gets urls linked by each node from CSR arrays.
+    offsets, targets, _ = graph_object.get_csr()
+    return {graph_object.get_url(node_id): [graph_object.get_url(target)
+        for target in targets[offsets[node_id]:offsets[node_id + 1]]]
+        for node_id in range(len(graph_object))}
+
+
+class TestLinkGraph(unittest.TestCase):
+    def create_graph(self, **kwargs):
+        graph_object = graph.LinkGraph(**kwargs)
+        graph_object.add_pages([(HOME_URL, HOME_MARKUP),
+            (ABOUT_URL, ABOUT_MARKUP)])
+        return graph_object
+
+    def test_add(self):
+        graph_object = self.create_graph()
+        # Same target linked twice is one edge.
+        self.assertEqual(graph_object.get_successors(HOME_URL), [
+            "https://example.com/site.css", ABOUT_URL,
+            "https://example.com/logo.png", "https://other.example.org/"])
+        # Links of page with base tag are based on it(base is link too).
+        self.assertEqual(graph_object.get_successors(ABOUT_URL), [
+            "https://example.com/pages/", HOME_URL,
+            "https://example.com/logo.png", "https://example.com/pages/team"])
+        self.assertEqual(graph_object.get_successors(ABOUT_URL,
+            any_of=document.IMAGE), ["https://example.com/logo.png"])
+        self.assertEqual(dict(graph_object.get_edges(HOME_URL))[ABOUT_URL],
+            highlevel.create_document(HOME_MARKUP, page_url=HOME_URL,
+            make_absolute=True).get_hyperlinks()[0].get_categories())
+        self.assertEqual(graph_object.get_edges_count(), 8)
+        self.assertEqual(len(graph_object), 7)
+        self.assertIn("https://example.com/pages/team", graph_object)
+        with self.assertRaises(KeyError):
+            graph_object.get_successors("https://example.com/missing")
+
+    def test_degrees(self):
+        graph_object = self.create_graph()
+        self.assertEqual(graph_object.get_out_degree(HOME_URL), 4)
+        self.assertEqual(graph_object.get_in_degree(HOME_URL), 1)
+        self.assertEqual(graph_object.get_in_degree(
+            "https://example.com/logo.png"), 2)
+        self.assertEqual(graph_object.get_predecessors(
+            "https://example.com/logo.png"), [HOME_URL, ABOUT_URL])
+        self.assertEqual(graph_object.get_predecessors(ABOUT_URL), [HOME_URL])
+        self.assertEqual(graph_object.get_predecessors(
+            "https://example.com/logo.png", any_of=document.HYPERLINK), [])
+
+    def test_add_again(self):
+        graph_object = self.create_graph()
+        graph_object.compact()
+        # Page added again replaces its edges(merged or pending).
+        for _ in range(2):
+            graph_object.add_page(HOME_URL, '<a href="/about">about</a>')
+            self.assertEqual(graph_object.get_successors(HOME_URL),
+                [ABOUT_URL])
+            self.assertEqual(graph_object.get_in_degree(
+                "https://example.com/logo.png"), 1)
+            self.assertEqual(graph_object.get_predecessors(
+                "https://example.com/logo.png"), [ABOUT_URL])
+            self.assertEqual(graph_object.get_edges_count(), 5)
+        # Nodes are kept even without edges.
+        self.assertEqual(graph_object.get_in_degree(
+            "https://other.example.org/"), 0)
+
+    def test_compact(self):
+        graph_object = self.create_graph()
+        expected = get_rows(graph_object)
+        offsets, targets, labels = graph_object.get_csr()
+        self.assertEqual(len(offsets), len(graph_object) + 1)
+        self.assertEqual(offsets[-1], len(targets))
+        self.assertEqual(len(labels), len(targets))
+        self.assertEqual(list(offsets), [0, 4, 4, 8, 8, 8, 8, 8])
+        # Pages added between merged rows keep other rows.
+        graph_object.add_page("https://example.com/pages/team",
+            '<a href="/">home</a>')
+        graph_object.add_page(ABOUT_URL, '<a href="team">team</a>')
+        expected["https://example.com/pages/team"] = [HOME_URL]
+        expected[ABOUT_URL] = ["https://example.com/team"]
+        expected["https://example.com/team"] = []
+        self.assertEqual(get_rows(graph_object), expected)
+        offsets, targets, _ = graph_object.get_csr()
+        self.assertEqual(list(offsets), [0, 4, 4, 5, 5, 5, 5, 6, 6])
+
+    def test_pending_limit(self):
+        # Pending edges are merged once they exceed limit.
+        with mock.patch.object(graph, "MAX_PENDING_EDGES", 5):
+            graph_object = self.create_graph()
+            self.assertEqual(graph_object._pending, {})
+            self.assertEqual(graph_object.get_successors(ABOUT_URL)[1],
+                HOME_URL)
+
+    def test_node_keys(self):
+        graph_object = graph.LinkGraph(node_key="canonical")
+        graph_object.add_page("HTTPS://Example.com", '<a href="/#top">x</a>'
+            '<a href="https://example.com:443/about#team">y</a>')
+        self.assertEqual(graph_object.get_successors(HOME_URL), [HOME_URL,
+            ABOUT_URL])
+        graph_object = graph.LinkGraph(any_of=document.IMAGE)
+        graph_object.add_page(HOME_URL, HOME_MARKUP)
+        self.assertEqual(graph_object.get_successors(HOME_URL),
+            ["https://example.com/logo.png"])
+        with self.assertRaises(ValueError):
+            graph.LinkGraph(node_key="raw")
+
+
+class TestCategoriesMasks(unittest.TestCase):
+    def test_masks(self):
+        doc_object = highlevel.create_document(HOME_MARKUP)
+        self.assertEqual(list(doc_object.get_categories_masks()),
+            [link.get_categories() for link in doc_object.get_links()])
+        links = document.ColumnarLinks(doc_object.get_links())
+        self.assertEqual(list(links.get_categories_masks()),
+            list(doc_object.get_categories_masks()))
+
+
+if __name__ == "__main__":
+    unittest.main()
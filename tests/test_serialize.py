@@ -0,0 +1,130 @@
+'''Serializing links into bytes and converting them to arrow tables.'''
+import os
+import pickle
+import tempfile
+import unittest
+
+from surflink import document
+from surflink import highlevel
+from surflink import serialize
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+MARKUP = '''<html><head><base href="https://example.com/pages/">
+<link rel="stylesheet alternate" href="site.css" type="text/css">
+<script src="/app.js"></script></head><body>
+<img src="a.png" srcset="b.png 2x"><a href="/page">page</a>
+<a href="https://other.example.com/café">café</a>
+<video src="clip.mp4"></video><a href="mailto:a@example.com">mail</a>
+</body></html>'''
+
+
+def get_columns(links):
+    # Gets columns of links and categories of each link.
+    columns = tuple(list(column) for column in links.get_columns()[:7])
+    return columns, [link.get_categories() for link in links]
+
+def get_urls(links):
+    return [link.get_link() for link in links]
+
+
+class TestSerialize(unittest.TestCase):
+    def create_links(self, **kwargs):
+        return document.ColumnarLinks(highlevel.create_document(MARKUP,
+            **kwargs).get_links())
+
+    def assert_same_links(self, links, expected):
+        self.assertEqual(len(links), len(expected))
+        self.assertEqual(get_columns(links), get_columns(expected))
+        self.assertEqual(links.get_columns()[7], expected.get_columns()[7])
+        for category, flag in document.CATEGORIES_FLAGS.items():
+            self.assertEqual(get_urls(links.get_links_by_categories(flag)),
+                get_urls(expected.get_links_by_categories(flag)), category)
+
+    def test_round_trip(self):
+        for kwargs in ({}, {"make_absolute": True}, {"strict": True}):
+            links = self.create_links(**kwargs)
+            with self.subTest(**kwargs):
+                loaded = serialize.loads_links(serialize.dumps_links(links))
+                self.assertIsInstance(loaded, serialize.BufferLinks)
+                self.assert_same_links(loaded, links)
+                # Loaded links are serialized to same bytes.
+                self.assertEqual(loaded.dumps(), serialize.dumps_links(links))
+        doc_object = highlevel.create_document(MARKUP)
+        loaded = document.Links.loads(doc_object.dumps())
+        self.assertEqual(get_urls(loaded.get_images()),
+            get_urls(doc_object.get_images()))
+        empty = serialize.loads_links(serialize.dumps_links([]))
+        self.assertEqual(len(empty), 0)
+
+    def test_buffer(self):
+        # Links are read from bytearray or memoryview of file contents.
+        links = self.create_links()
+        data = serialize.dumps_links(links)
+        for buffer in (bytearray(data), memoryview(data)):
+            self.assert_same_links(serialize.loads_links(buffer), links)
+        loaded = serialize.loads_links(data)
+        with self.assertRaises(TypeError):
+            loaded.append(links[0])
+
+    def test_pickle(self):
+        links = self.create_links(make_absolute=True)
+        loaded = serialize.loads_links(serialize.dumps_links(links))
+        copy = pickle.loads(pickle.dumps(loaded))
+        self.assertIsInstance(copy, serialize.BufferLinks)
+        self.assert_same_links(copy, links)
+
+    def test_invalid(self):
+        data = serialize.dumps_links(self.create_links())
+        for invalid_data in (b"", b"SLNK", b"ABCD" + data[4:]):
+            with self.assertRaisesRegex(ValueError, "not serialized"):
+                serialize.loads_links(invalid_data)
+        for size in (serialize.HEADER.size, len(data) // 2, len(data) - 1):
+            with self.assertRaisesRegex(ValueError, "truncated"):
+                serialize.loads_links(data[:size])
+        version_data = serialize.HEADER.pack(serialize.MAGIC, 2, 0, 0, 0)
+        with self.assertRaisesRegex(ValueError, "Version"):
+            serialize.loads_links(version_data)
+
+
+@unittest.skipUnless(pyarrow, "pyarrow is not installed")
+class TestArrow(unittest.TestCase):
+    def setUp(self):
+        self.links = document.ColumnarLinks(highlevel.create_document(MARKUP,
+            make_absolute=True).get_links())
+
+    def assert_same_table(self, table):
+        columns, categories = get_columns(self.links)
+        self.assertEqual(table.num_rows, len(self.links))
+        self.assertEqual(table.column_names, list(serialize.ARROW_COLUMNS) +
+            ["make_absolute", "strict", "categories"])
+        for name, column in zip(serialize.ARROW_COLUMNS, columns):
+            self.assertEqual(table.column(name).to_pylist(), column)
+            self.assertEqual(pyarrow.types.is_dictionary(
+                table.schema.field(name).type),
+                name in serialize.DICTIONARY_COLUMNS)
+        self.assertEqual(table.column("categories").to_pylist(), categories)
+        self.assertEqual(table.column("make_absolute").to_pylist(),
+            [True] * len(self.links))
+        self.assertEqual(table.column("strict").to_pylist(),
+            [False] * len(self.links))
+
+    def test_arrow(self):
+        self.assert_same_table(serialize.links_to_arrow(self.links))
+        loaded = serialize.loads_links(serialize.dumps_links(self.links))
+        self.assert_same_table(serialize.links_to_arrow(loaded))
+
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "links.parquet")
+            serialize.write_parquet(self.links, path)
+            self.assert_same_table(pyarrow.parquet.read_table(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+'''Stats recorded while extracting links and reported to callback.'''
+import collections
+import unittest
+
+from surflink import highlevel
+from surflink import stats
+
+
+MARKUP = '''<html><head><base href="https://example.com/">
+<link rel="stylesheet" href="site.css"></head><body>
+<img src="a.png"><a href="/page">page</a><a href="/page">page</a>
+</body></html>'''
+
+
+def sum_payloads(payloads):
+    # Sums counts and timings of reported dicts(hit rates are skipped).
+    totals = collections.Counter()
+    for payload in payloads:
+        for name, value in payload.items():
+            if not name.endswith("_hit_rate"):
+                totals[name] += value
+    return totals
+
+
+class TestStats(unittest.TestCase):
+    def test_shared_stats_payloads(self):
+        payloads = []
+        stats_object = stats.Stats(callback=payloads.append)
+        for _ in range(2):
+            highlevel.extract_image_urls(MARKUP, stats=stats_object)
+        # Each document reports after extraction and after classifying.
+        self.assertEqual(len(payloads), 4)
+        for payload in payloads[::2]:
+            self.assertEqual(payload["documents"], 1)
+            self.assertEqual(payload["bytes"], len(MARKUP))
+            self.assertEqual(payload["links"], 5)
+            self.assertNotIn("classify_seconds", payload)
+        for payload in payloads[1::2]:
+            self.assertNotIn("documents", payload)
+            self.assertIn("classify_seconds", payload)
+            self.assertGreater(payload["url_cache_hits"] +
+                payload["url_cache_misses"], 0)
+            self.assertIn("url_cache_hit_rate", payload)
+        # Summing payloads gives totals without counting twice.
+        totals = sum_payloads(payloads)
+        expected = stats_object.as_dict()
+        for name in ("documents", "bytes", "links", "url_cache_hits",
+        "url_cache_misses"):
+            self.assertEqual(totals[name], expected[name])
+        self.assertEqual(expected["documents"], 2)
+        self.assertAlmostEqual(totals["parse_seconds"],
+            expected["parse_seconds"])
+
+    def test_report_without_changes(self):
+        payloads = []
+        stats_object = stats.Stats(callback=payloads.append)
+        stats_object.increment("links", 3)
+        stats_object.report()
+        stats_object.report()
+        self.assertEqual(payloads, [{"links": 3}])
+        stats_object.reset()
+        stats_object.increment("links")
+        stats_object.report()
+        self.assertEqual(payloads[-1], {"links": 1})
+
+    def test_hit_rate(self):
+        stats_object = stats.Stats()
+        self.assertEqual(stats_object.get_hit_rate("url_cache"), None)
+        stats_object.increment("url_cache_hits", 3)
+        stats_object.increment("url_cache_misses", 1)
+        self.assertEqual(stats_object.get_hit_rate("url_cache"), 0.75)
+        self.assertEqual(stats_object.as_dict()["url_cache_hit_rate"], 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+'''Filtering urls split into columns of url table.'''
+from urllib import parse
+import unittest
+
+from surflink import highlevel
+from surflink import table
+
+
+URLS = ["https://Example.com/a", "http://example.com:80/b",
+    "https://example.com:8443/c.PNG", "https://[::1]:8443/x",
+    "https://[::1]/y.png", "http://[2001:db8::1]/",
+    "https://user:pw@Example.com/", "file:///home/u/a.html",
+    "mailto:a@example.com", "/relative/path", "//cdn.example.com/x.js",
+    "https://example.com:bad/", "HTTPS://EXAMPLE.COM/docs/",
+    "ftp://example.com/f.txt", "", "#frag", "https://example.com./dot",
+    "https://www.example.com/docs/b.html#top", "javascript:void(0)",
+    "https://:80/empty", "http:///nohost", "https://notexample.com/"]
+SCHEMES = ("https", "http", "file", "mailto", "ftp", "", "HTTPS")
+HOSTNAMES = ("example.com", "::1", "2001:db8::1", "cdn.example.com",
+    "Example.com", "example.com.", "www.example.com")
+
+
+def filter_by_scheme(urls, scheme):
+    # Filters urls by scheme as before url table.
+    return [url for url in urls if parse.urlparse(url).scheme == scheme]
+
+def filter_by_hostname(urls, hostname):
+    # Filters urls by hostname as before url table.
+    return [url for url in urls if parse.urlparse(url).hostname == hostname]
+
+
+class TestURLTable(unittest.TestCase):
+    def test_parity(self):
+        for scheme in SCHEMES:
+            with self.subTest(scheme=scheme):
+                self.assertEqual(highlevel.filter_urls_by_scheme(URLS,
+                    scheme), filter_by_scheme(URLS, scheme))
+        for hostname in HOSTNAMES + (None,):
+            with self.subTest(hostname=hostname):
+                self.assertEqual(highlevel.filter_urls_by_hostname(URLS,
+                    hostname), filter_by_hostname(URLS, hostname))
+
+    def test_columns(self):
+        url_table = table.URLTable(URLS)
+        rows = dict(zip(URLS, zip(*[url_table.get_column(name) for name in
+            table.COLUMNS])))
+        self.assertEqual(rows["https://[::1]:8443/x"],
+            ("https", "::1", 8443, "/x", ""))
+        self.assertEqual(rows["HTTPS://EXAMPLE.COM/docs/"],
+            ("https", "example.com", -1, "/docs/", ""))
+        # Urls without hostname have empty hostname.
+        self.assertEqual(rows["https://:80/empty"],
+            ("https", "", 80, "/empty", ""))
+        self.assertEqual(rows["#frag"], ("", "", -1, "", ""))
+        # Invalid port is missing port.
+        self.assertEqual(rows["https://example.com:bad/"][2], -1)
+        with self.assertRaises(ValueError):
+            url_table.get_column("fragment")
+
+    def test_invalid_url(self):
+        # Invalid ipv6 address does not fail whole table.
+        url_table = table.URLTable(["https://[::1/x", "https://example.com/"])
+        self.assertEqual(url_table.get_column("hostname"), ["",
+            "example.com"])
+        self.assertEqual(url_table.filter(schemes=["https"]).get_urls(),
+            ["https://example.com/"])
+
+    def test_filters(self):
+        filter_urls = highlevel.filter_urls
+        self.assertEqual(filter_urls(URLS, ports=[80]),
+            ["http://example.com:80/b", "https://:80/empty"])
+        self.assertEqual(filter_urls(URLS, hostnames=["::1"], ports=[8443]),
+            ["https://[::1]:8443/x"])
+        # Suffix matches domain and its subdomains only.
+        self.assertEqual(filter_urls(URLS, host_suffixes=["example.com"],
+            schemes=["https"]), ["https://Example.com/a",
+            "https://example.com:8443/c.PNG", "https://user:pw@Example.com/",
+            "https://example.com:bad/", "HTTPS://EXAMPLE.COM/docs/",
+            "https://www.example.com/docs/b.html#top"])
+        self.assertEqual(filter_urls(URLS, path_prefixes=["/docs"]),
+            ["HTTPS://EXAMPLE.COM/docs/",
+            "https://www.example.com/docs/b.html#top"])
+        # Extensions ignore case, query and fragment.
+        self.assertEqual(filter_urls(URLS, extensions=["png", "html"]),
+            ["https://example.com:8443/c.PNG", "https://[::1]/y.png",
+            "file:///home/u/a.html",
+            "https://www.example.com/docs/b.html#top"])
+        self.assertEqual(filter_urls(URLS, schemes=[]), [])
+        self.assertEqual(filter_urls(URLS), URLS)
+
+    def test_unique(self):
+        url_table = table.URLTable(["https://example.com/a",
+            "https://Example.com/a", "https://example.com/a?x",
+            "http://example.com/a", "https://example.com:443/a"])
+        self.assertEqual(url_table.unique().get_urls(), [
+            "https://example.com/a", "https://example.com/a?x",
+            "http://example.com/a", "https://example.com:443/a"])
+        self.assertEqual(url_table.unique(("hostname", "path")).get_urls(),
+            ["https://example.com/a"])
+        filtered = url_table.filter(schemes=["http"])
+        self.assertEqual(filtered.get_column("scheme"), ["http"])
+        self.assertEqual(len(filtered), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+'''Resolving urls against base urls and canonicalizing them.'''
+import contextlib
+import io
+from urllib import parse
+import unittest
+
+from resid import urlmod
+
+from surflink import highlevel
+from surflink import url
+
+
+# Base urls of hierarchical schemes(resolved same as before resolvers).
+BASE_URLS = ("https://example.com/a/b/c.html?q=1#f", "https://example.com",
+    "http://Example.COM:8080/dir/", "https://[::1]:8443/x/y",
+    "https://user:pw@example.com/a/", "ftp://example.com/pub/",
+    "//example.com/x/y", "page.html", "/rel/dir/")
+RELATIVE_URLS = ("d", "../d", "../../../d", "./d", "d/./e/../f", "..", ".",
+    "/d", "/", "/d/../e", "//cdn.example.org/x", "//cdn.example.org",
+    "//[::2]:90/p", "?z=2", "#top", "", "?", "#", "?#", "d?", "d#",
+    "/a?", "/a#", "/a?#f", "/a?q#", "?q#", "//h/a?", "a;p", "/a;p?q",
+    "d?x=1#y", "https://other.org/p", "HTTP://UP.org/X", "mailto:a@b.c",
+    "data:image/png;base64,AA", "javascript:void(0)", "g:h")
+# Urls and their canonical urls.
+CANONICAL_URLS = (
+    ("HTTPS://Example.COM:443", "https://example.com/"),
+    ("http://example.com:80/a#f", "http://example.com/a"),
+    ("ws://h:80", "ws://h/"),
+    ("https://example.com:8443", "https://example.com:8443/"),
+    ("https://[::1]:443/x", "https://[::1]/x"),
+    ("https://[::1]:8443", "https://[::1]:8443/"),
+    ("http://[2001:DB8::1]/", "http://[2001:db8::1]/"),
+    ("https://user:pw@Example.com:8080/p?q=1#x",
+        "https://user:pw@example.com:8080/p?q=1"),
+    ("https://example.com?q", "https://example.com/?q"),
+    # Paths are compared as they are(dot segments are not removed).
+    ("https://example.com/a/../b", "https://example.com/a/../b"),
+    ("https://:80/p", "https://:80/p"),
+    ("file:///home/a.html#x", "file:///home/a.html"),
+    ("/rel#x", "/rel"),
+    ("mailto:a@b.c", "mailto:a@b.c"),
+    ("", ""),
+    # Invalid port or ipv6 address is left as it is.
+    ("https://example.com:bad/#x", "https://example.com:bad/#x"),
+    ("https://[::1/x", "https://[::1/x"),
+)
+
+
+def make_url_absolute(base_url, url_string):
+    # Makes url absolute as before resolvers(resid prints some urls).
+    with contextlib.redirect_stdout(io.StringIO()):
+        return urlmod.make_url_absolute(base_url, url_string)
+
+
+class TestResolver(unittest.TestCase):
+    def test_parity(self):
+        for base_url in BASE_URLS:
+            resolver = url.BaseResolver(base_url)
+            for url_string in RELATIVE_URLS:
+                expected = make_url_absolute(base_url, url_string)
+                with self.subTest(base_url=base_url, url=url_string):
+                    self.assertEqual(url.make_url_absolute(base_url,
+                        url_string), expected)
+                    self.assertEqual(resolver.resolve(url_string), expected)
+        self.assertEqual(highlevel.make_urls_absoulute(BASE_URLS[0],
+            RELATIVE_URLS), [make_url_absolute(BASE_URLS[0], url_string)
+            for url_string in RELATIVE_URLS])
+
+    def test_empty_parts(self):
+        # Empty query or fragment is dropped like urljoin().
+        base_url = BASE_URLS[0]
+        self.assertEqual(url.make_url_absolute(base_url, "#"),
+            "https://example.com/a/b/c.html?q=1")
+        self.assertEqual(url.make_url_absolute(base_url, "/a?"),
+            "https://example.com/a")
+
+    def test_other_schemes(self):
+        # Base urls without origin or of other schemes use urljoin().
+        for base_url in ("file:///home/u/page.html", "mailto:a@b.c"):
+            for url_string in RELATIVE_URLS:
+                if url_string.startswith("/") and ".." in url_string:
+                    continue
+                with self.subTest(base_url=base_url, url=url_string):
+                    self.assertEqual(url.make_url_absolute(base_url,
+                        url_string), parse.urljoin(base_url, url_string))
+
+    def test_cache(self):
+        url.get_resolver.cache_clear()
+        resolver = url.get_resolver("https://example.com/a/")
+        self.assertIs(url.get_resolver("https://example.com/a/"), resolver)
+        resolver.clear_cache()
+        for _ in range(3):
+            self.assertEqual(resolver.resolve("b/c"),
+                "https://example.com/a/b/c")
+        # Fast paths are not cached.
+        resolver.resolve("/d")
+        cache_info = resolver.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (2, 1))
+        # Least recently used resolvers are dropped.
+        for number in range(url.RESOLVERS_CACHE_SIZE):
+            url.get_resolver("https://example.com/{}/".format(number))
+        self.assertIsNot(url.get_resolver("https://example.com/a/"),
+            resolver)
+        self.assertEqual(url.get_resolver.cache_info().currsize,
+            url.RESOLVERS_CACHE_SIZE)
+
+
+class TestCanonicalize(unittest.TestCase):
+    def test_canonicalize(self):
+        for url_string, expected in CANONICAL_URLS:
+            with self.subTest(url=url_string):
+                self.assertEqual(url.canonicalize_url(url_string), expected)
+                # Canonical url is canonical already.
+                self.assertEqual(url.canonicalize_url(expected), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()